@@ -2,10 +2,12 @@
 
 from .api import API
 from .open_api import OpenAPI
+from .sharding import ShardedWebsocket
 from .websocket import Websocket
 
 __all__ = [
     "API",
     "OpenAPI",
+    "ShardedWebsocket",
     "Websocket",
 ]
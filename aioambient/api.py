@@ -2,20 +2,40 @@
 
 from __future__ import annotations
 
-from datetime import date
+import asyncio
+from collections.abc import AsyncIterator, Collection, Iterable
+from datetime import UTC, date, datetime
 import logging
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
 from aiohttp import ClientSession
 
-from .api_request_handler import ApiRequestHandler
+from .api_request_handler import (
+    DEFAULT_CONNECTOR_LIMIT,
+    DEFAULT_JSON_LOADS,
+    ApiRequestHandler,
+    JsonLoadsT,
+)
+from .cache import ResponseCache
+from .columnar import ColumnarBatch
 from .const import DEFAULT_API_VERSION, LOGGER
+from .errors import RequestError
+from .rate_limiter import DEFAULT_RATE_LIMIT, DEFAULT_RATE_LIMIT_BURST, get_rate_limiter
 
 REST_API_BASE = "https://rt.ambientweather.net"
 
+DEFAULT_BULK_CONCURRENCY = 5
 DEFAULT_LIMIT = 288
 
 
+class DeviceDetailsResult(NamedTuple):
+    """Define the result of retrieving a single device's details in bulk."""
+
+    mac_address: str
+    details: list[dict[str, Any]] | None
+    error: RequestError | None
+
+
 class API(ApiRequestHandler):
     """Define the API object."""
 
@@ -25,22 +45,47 @@ class API(ApiRequestHandler):
         api_key: str | None,
         *,
         api_version: int = DEFAULT_API_VERSION,
+        cache: ResponseCache | None = None,
+        connector_limit: int = DEFAULT_CONNECTOR_LIMIT,
+        json_loads: JsonLoadsT = DEFAULT_JSON_LOADS,
         logger: logging.Logger = LOGGER,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_limit_burst: int = DEFAULT_RATE_LIMIT_BURST,
         session: ClientSession | None = None,
     ) -> None:
         """Initialize.
 
+        Every API object that uses the same API key shares a single rate limiter; the
+        first one created determines its rate and burst. The per-application-key rate
+        limit isn't enforced, so callers that use many API keys at once must stay
+        within it themselves.
+
         Args:
         ----
             application_key: An Ambient Weather application key.
             api_key: An Ambient Weather API key.
             api_version: The version of the API to query.
+            cache: An optional cache of API responses.
+            connector_limit: The maximum number of simultaneous connections to open
+                when no session is provided.
+            json_loads: The function to decode response bodies with (e.g.,
+                `orjson.loads` or `msgspec.json.decode`).
             logger: The logger to use.
+            rate_limit: The number of requests allowed per second.
+            rate_limit_burst: The number of requests that may be made back-to-back.
             session: An optional aiohttp ClientSession.
 
         """
         super().__init__(
-            f"{REST_API_BASE}/v{api_version}", logger=logger, session=session
+            f"{REST_API_BASE}/v{api_version}",
+            cache=cache,
+            connector_limit=connector_limit,
+            json_loads=json_loads,
+            logger=logger,
+            rate_limiter=get_rate_limiter(
+                f"{REST_API_BASE}:{api_key}", rate=rate_limit, burst=rate_limit_burst
+            ),
+            session=session,
         )
         self._api_key = api_key
         self._application_key = application_key
@@ -96,3 +141,260 @@ class API(ApiRequestHandler):
             list[dict[str, Any]],
             await self._request("get", f"devices/{mac_address}", params=params),
         )
+
+    async def stream_device_details(
+        self,
+        mac_address: str,
+        *,
+        end_date: date | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream details of a device by MAC address.
+
+        This is the streaming equivalent of `get_device_details`: each record is
+        yielded as soon as it has been received, rather than once the entire response
+        has been.
+
+        Args:
+        ----
+            mac_address: The MAC address of an Ambient Weather station.
+            end_date: An optional end date to limit data.
+            limit: An optional limit.
+
+        Yields:
+        ------
+            Device data dicts.
+
+        """
+        params: dict[str, Any] = {
+            "apiKey": self._api_key,
+            "applicationKey": self._application_key,
+            "limit": limit,
+        }
+        if end_date:
+            params["endDate"] = end_date.isoformat()
+
+        async for record in self._stream_request(
+            "get", f"devices/{mac_address}", params=params
+        ):
+            yield record
+
+    async def get_device_details_columnar(
+        self,
+        mac_address: str,
+        *,
+        end_date: date | None = None,
+        fields: Collection[str] | None = None,
+        limit: int = DEFAULT_LIMIT,
+        use_numpy: bool = False,
+    ) -> ColumnarBatch:
+        """Get details of a device by MAC address as a columnar batch.
+
+        Args:
+        ----
+            mac_address: The MAC address of an Ambient Weather station.
+            end_date: An optional end date to limit data.
+            fields: The fields to include (defaults to every numeric field).
+            limit: An optional limit.
+            use_numpy: Whether to expose columns as NumPy arrays.
+
+        Returns:
+        -------
+            A ColumnarBatch.
+
+        """
+        return ColumnarBatch.from_records(
+            await self.get_device_details(mac_address, end_date=end_date, limit=limit),
+            fields=fields,
+            use_numpy=use_numpy,
+        )
+
+    async def get_all_device_details(
+        self,
+        mac_addresses: Iterable[str] | None = None,
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        end_date: date | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> AsyncIterator[DeviceDetailsResult]:
+        """Get details of many devices, yielding each result as it completes.
+
+        Requests are made concurrently (up to `concurrency` at a time) and still obey
+        the rate limiter. A failure for one device is reported in its result rather
+        than aborting the rest.
+
+        Args:
+        ----
+            mac_addresses: The MAC addresses to query (defaults to every device
+                associated with the API key).
+            concurrency: The maximum number of simultaneous requests.
+            end_date: An optional end date to limit data.
+            limit: An optional limit.
+
+        Yields:
+        ------
+            A DeviceDetailsResult for each device.
+
+        """
+        if mac_addresses is None:
+            mac_addresses = [
+                device["macAddress"] for device in await self.get_devices()
+            ]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _get_device_details(mac_address: str) -> DeviceDetailsResult:
+            """Get details of a single device.
+
+            Args:
+            ----
+                mac_address: The MAC address of an Ambient Weather station.
+
+            Returns:
+            -------
+                A DeviceDetailsResult.
+
+            """
+            async with semaphore:
+                try:
+                    details = await self.get_device_details(
+                        mac_address, end_date=end_date, limit=limit
+                    )
+                except RequestError as err:
+                    return DeviceDetailsResult(mac_address, None, err)
+            return DeviceDetailsResult(mac_address, details, None)
+
+        tasks = [
+            asyncio.create_task(_get_device_details(mac_address))
+            for mac_address in dict.fromkeys(mac_addresses)
+        ]
+
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # If the caller stops iterating early, don't leave requests running:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_device_history(
+        self,
+        mac_address: str,
+        start: datetime,
+        end: datetime | None = None,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        resume_from: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over a device's history, newest to oldest, one page at a time.
+
+        Each page is requested with an end date just before the oldest record seen so
+        far (any records repeated across page boundaries are skipped, by `dateutc`),
+        and only a single page is held in memory at a time.
+
+        To resume an interrupted backfill, pass the `dateutc` of the last record that
+        was received as `resume_from`; iteration continues with the next-oldest record.
+
+        Args:
+        ----
+            mac_address: The MAC address of an Ambient Weather station.
+            start: The oldest datetime to retrieve data for.
+            end: The newest datetime to retrieve data for (defaults to now).
+            limit: The number of records to request per page.
+            resume_from: The `dateutc` (in epoch milliseconds) of the last record
+                received by a prior iteration.
+
+        Yields:
+        ------
+            Device data dicts.
+
+        """
+        start_ms = int(start.timestamp() * 1000)
+
+        if resume_from is not None:
+            cursor: int | None = resume_from
+            upper_bound = resume_from - 1
+        elif end is not None:
+            cursor = upper_bound = int(end.timestamp() * 1000)
+        else:
+            cursor = None
+            upper_bound = None
+
+        while True:
+            end_date = None
+            if cursor is not None:
+                end_date = datetime.fromtimestamp(cursor / 1000, UTC)
+
+            page = await self.get_device_details(
+                mac_address, end_date=end_date, limit=limit
+            )
+
+            new_records = sorted(
+                (
+                    record
+                    for record in page
+                    if upper_bound is None or record["dateutc"] <= upper_bound
+                ),
+                key=lambda record: cast(int, record["dateutc"]),
+                reverse=True,
+            )
+            if not new_records:
+                return
+
+            for record in new_records:
+                if record["dateutc"] < start_ms:
+                    return
+                yield record
+
+            # (Ambient's end date is inclusive, so ask for the page before this one's
+            # oldest record; otherwise, a page of one would only ever repeat it.)
+            cursor = upper_bound = new_records[-1]["dateutc"] - 1
+
+    async def iter_device_history_batches(
+        self,
+        mac_address: str,
+        start: datetime,
+        end: datetime | None = None,
+        *,
+        fields: Collection[str] | None = None,
+        limit: int = DEFAULT_LIMIT,
+        resume_from: int | None = None,
+        use_numpy: bool = False,
+    ) -> AsyncIterator[ColumnarBatch]:
+        """Iterate over a device's history as columnar batches of up to `limit` rows.
+
+        This works just like `iter_device_history()`; batches can be combined with
+        `ColumnarBatch.concat()`.
+
+        Args:
+        ----
+            mac_address: The MAC address of an Ambient Weather station.
+            start: The oldest datetime to retrieve data for.
+            end: The newest datetime to retrieve data for (defaults to now).
+            fields: The fields to include (defaults to every numeric field).
+            limit: The number of records to request per page.
+            resume_from: The `dateutc` (in epoch milliseconds) of the last record
+                received by a prior iteration.
+            use_numpy: Whether to expose columns as NumPy arrays.
+
+        Yields:
+        ------
+            ColumnarBatches.
+
+        """
+        records: list[dict[str, Any]] = []
+
+        async for record in self.iter_device_history(
+            mac_address, start, end, limit=limit, resume_from=resume_from
+        ):
+            records.append(record)
+            if len(records) == limit:
+                yield ColumnarBatch.from_records(
+                    records, fields=fields, use_numpy=use_numpy
+                )
+                records = []
+
+        if records:
+            yield ColumnarBatch.from_records(
+                records, fields=fields, use_numpy=use_numpy
+            )
@@ -3,33 +3,88 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator, Callable, Hashable, Mapping
+from copy import deepcopy
+from functools import partial
+from hashlib import sha256
+import json
 import logging
-from typing import Any
+from types import TracebackType
+from typing import Any, Self, TypedDict, Unpack, cast
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from aiohttp.client_exceptions import ClientError
 
+from .cache import ResponseCache
 from .const import LOGGER
 from .errors import RequestError
+from .json_stream import JsonArrayStreamParser
+from .rate_limiter import RateLimiter
 
+DEFAULT_CONNECTOR_LIMIT = 10
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_KEEPALIVE_TIMEOUT = 30
 DEFAULT_TIMEOUT = 10
 
+# Query parameters that hold credentials (which are only hashed into request keys):
+SECRET_PARAMS = frozenset({"apiKey", "applicationKey"})
+
 
 RequestResponseT = list[dict[str, Any]] | dict[str, Any]
 
+# A function that decodes a raw JSON response body:
+JsonLoadsT = Callable[[bytes], Any]
+
+
+class RequestKwargsT(TypedDict, total=False):
+    """Define the additional kwargs that can be sent with a request."""
+
+    params: dict[str, Any]
+
 
-class ApiRequestHandler:  # pylint: disable=too-few-public-methods
+try:
+    import orjson
+except ImportError:
+    DEFAULT_JSON_LOADS: JsonLoadsT = json.loads
+else:
+    DEFAULT_JSON_LOADS = orjson.loads
+
+
+class ApiRequestHandler:
     """Handle API requests.
 
     Base class for both the API and OpenAPI classes. Handles all requests to Ambient
     services.
+
+    Response bodies are read once and decoded with `json_loads` (by default,
+    `orjson.loads` if orjson is installed and `json.loads` otherwise); the decoder must
+    accept bytes, and any exception it raises is converted to a RequestError.
+
+    If no session is provided, one is created (with connection pooling, keep-alive,
+    and DNS caching) upon the first request and reused until `close()` is called;
+    alternatively, the object can be used as an async context manager.
+
+    Large array responses can also be streamed, with each item decoded (using the
+    standard library's decoder) as soon as it has arrived; streamed requests bypass
+    the cache and request coalescing.
+
+    Concurrent identical GET requests are coalesced into a single HTTP request; the
+    caller that started it receives the decoded response and every other caller
+    receives its own copy (so callers can safely modify what they receive). If a
+    response cache is provided, GET responses are served from it when possible; since
+    requests are keyed by base URL and (a hash of) their credentials, a cache can be
+    shared between objects.
     """
 
     def __init__(
         self,
         base_url: str,
         *,
+        cache: ResponseCache | None = None,
+        connector_limit: int = DEFAULT_CONNECTOR_LIMIT,
+        json_loads: JsonLoadsT = DEFAULT_JSON_LOADS,
         logger: logging.Logger = LOGGER,
+        rate_limiter: RateLimiter | None = None,
         session: ClientSession | None = None,
     ) -> None:
         """Initialize.
@@ -37,23 +92,291 @@ class ApiRequestHandler:  # pylint: disable=too-few-public-methods
         Args:
         ----
             base_url: Base URL for each request
+            cache: An optional cache of API responses.
+            connector_limit: The maximum number of simultaneous connections to open
+                when the session is created by this object.
+            json_loads: The function to decode response bodies with.
             logger: The logger to use.
+            rate_limiter: An optional rate limiter to pace requests with.
             session: An optional aiohttp ClientSession.
 
         """
+        self._base_url = base_url
+        self._cache = cache
+        self._connector_limit = connector_limit
+        self._in_flight: dict[Hashable, asyncio.Task[RequestResponseT]] = {}
+        self._json_loads = json_loads
         self._logger = logger
+        self._owns_session = False
+        self._rate_limiter = rate_limiter
         self._session: ClientSession | None = session
-        self._base_url = base_url
+
+    async def __aenter__(self) -> Self:
+        """Enter the async context manager.
+
+        Returns
+        -------
+            This object.
+
+        """
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the async context manager.
+
+        Args:
+        ----
+            exc_type: The type of the exception raised (if any).
+            exc_value: The exception raised (if any).
+            traceback: The traceback of the exception raised (if any).
+
+        """
+        await self.close()
+
+    def _get_session(self) -> ClientSession:
+        """Get the session to make requests with, creating one if necessary.
+
+        Returns
+        -------
+            An aiohttp ClientSession.
+
+        """
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                    limit=self._connector_limit,
+                    ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+                ),
+                timeout=ClientTimeout(total=DEFAULT_TIMEOUT),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session (if it was created by this object)."""
+        if not self._owns_session:
+            return
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+        self._owns_session = False
+        self._session = None
+
+    def _get_request_key(
+        self, method: str, endpoint: str, params: Mapping[str, Any] | None
+    ) -> Hashable:
+        """Get a key that identifies a request (without any plain-text credentials).
+
+        Args:
+        ----
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            params: The query parameters of the request.
+
+        Returns:
+        -------
+            A hashable key.
+
+        """
+        params = params or {}
+        credentials = sha256(
+            repr(
+                sorted(
+                    (key, str(value))
+                    for key, value in params.items()
+                    if key in SECRET_PARAMS
+                )
+            ).encode()
+        ).hexdigest()
+
+        return (
+            self._base_url,
+            credentials,
+            method.lower(),
+            endpoint,
+            tuple(
+                sorted(
+                    (key, str(value))
+                    for key, value in params.items()
+                    if key not in SECRET_PARAMS
+                )
+            ),
+        )
+
+    def _get_in_flight_request(
+        self,
+        key: Hashable,
+        method: str,
+        endpoint: str,
+        **kwargs: Unpack[RequestKwargsT],
+    ) -> tuple[asyncio.Task[RequestResponseT], bool]:
+        """Get the in-flight task for a request, starting one if there isn't one.
+
+        Concurrent identical requests share a single task (and thus a single HTTP
+        request and rate limit token), and all receive its result or error.
+
+        Args:
+        ----
+            key: The request key.
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+        -------
+            An (asyncio Task, whether it was just started) tuple.
+
+        """
+        if (task := self._in_flight.get(key)) is not None:
+            return task, False
+
+        task = asyncio.create_task(
+            self._send_shared_request(key, method, endpoint, **kwargs)
+        )
+        self._in_flight[key] = task
+        task.add_done_callback(partial(self._on_in_flight_request_done, key))
+        return task, True
+
+    @staticmethod
+    def _get_in_flight_result_copy(
+        task: asyncio.Task[RequestResponseT],
+    ) -> asyncio.Future[RequestResponseT]:
+        """Get a future for a copy of an in-flight request's result.
+
+        The copy is made as soon as the request completes (before any caller resumes
+        and can modify the original). Cancelling the future doesn't cancel the
+        request.
+
+        Args:
+        ----
+            task: The in-flight task.
+
+        Returns:
+        -------
+            An asyncio Future.
+
+        """
+        future: asyncio.Future[RequestResponseT] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+        def copy_result(task: asyncio.Task[RequestResponseT]) -> None:
+            """Resolve the future with a copy of the task's result (or its error).
+
+            Args:
+            ----
+                task: The completed task.
+
+            """
+            if future.cancelled():
+                return
+            if task.cancelled():
+                future.cancel()
+            elif (err := task.exception()) is not None:
+                future.set_exception(err)
+            else:
+                future.set_result(deepcopy(task.result()))
+
+        task.add_done_callback(copy_result)
+        return future
+
+    def _on_in_flight_request_done(
+        self, key: Hashable, task: asyncio.Task[RequestResponseT]
+    ) -> None:
+        """Stop tracking an in-flight request once it completes.
+
+        Args:
+        ----
+            key: The request key.
+            task: The completed task.
+
+        """
+        self._in_flight.pop(key, None)
+
+        # Every caller may have been cancelled (or, in the case of a background
+        # revalidation, there may not have been a caller), so retrieve the exception
+        # to keep asyncio from complaining about it:
+        if not task.cancelled() and (err := task.exception()):
+            self._logger.debug("Request to %s failed: %s", key, err)
 
     async def _request(
-        self, method: str, endpoint: str, **kwargs: dict[str, Any]
+        self, method: str, endpoint: str, **kwargs: Unpack[RequestKwargsT]
     ) -> RequestResponseT:
         """Make a request against the API.
 
-        In order to deal with Ambient's fairly aggressive rate limiting, we
-        pause for a second before continuing:
+        In order to deal with Ambient's fairly aggressive rate limiting, we wait for
+        the rate limiter (if any) to allow the request before continuing:
         https://ambientweather.docs.apiary.io/#introduction/rate-limiting
 
+        Args:
+        ----
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+        -------
+            An API response payload.
+
+        """
+        if method.lower() != "get":
+            return await self._send_request(method, endpoint, **kwargs)
+
+        key = self._get_request_key(method, endpoint, kwargs.get("params"))
+
+        if self._cache is not None and (cached := self._cache.get(key, endpoint)):
+            data, is_stale = cached
+            if is_stale:
+                # Refresh the entry in the background:
+                self._get_in_flight_request(key, method, endpoint, **kwargs)
+            return cast(RequestResponseT, data)
+
+        task, started = self._get_in_flight_request(key, method, endpoint, **kwargs)
+        if not started:
+            return await self._get_in_flight_result_copy(task)
+
+        # Shield the shared task so that this caller being cancelled doesn't cancel
+        # the request for everyone else:
+        return await asyncio.shield(task)
+
+    async def _send_shared_request(
+        self,
+        key: Hashable,
+        method: str,
+        endpoint: str,
+        **kwargs: Unpack[RequestKwargsT],
+    ) -> RequestResponseT:
+        """Send a request on behalf of every caller waiting on it.
+
+        Args:
+        ----
+            key: The request key.
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+        -------
+            An API response payload.
+
+        """
+        data = await self._send_request(method, endpoint, **kwargs)
+        if self._cache is not None:
+            self._cache.set(key, endpoint, data)
+        return data
+
+    async def _send_request(
+        self, method: str, endpoint: str, **kwargs: Unpack[RequestKwargsT]
+    ) -> RequestResponseT:
+        """Send a request to the API.
+
         Args:
         ----
             method: An HTTP method.
@@ -66,30 +389,86 @@ class ApiRequestHandler:  # pylint: disable=too-few-public-methods
 
         Raises:
         ------
-            RequestError: Raised upon an underlying HTTP error.
+            RequestError: Raised upon an underlying HTTP error or invalid JSON.
 
         """
-        await asyncio.sleep(1)
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
 
         url = f"{self._base_url}/{endpoint}"
-
-        if use_running_session := self._session and not self._session.closed:
-            session = self._session
-        else:
-            session = ClientSession(timeout=ClientTimeout(total=DEFAULT_TIMEOUT))
+        session = self._get_session()
 
         try:
             async with session.request(method, url, **kwargs) as resp:
                 resp.raise_for_status()
-                data: RequestResponseT = await resp.json()
+                body = await resp.read()
         except ClientError as err:
             msg = f"Error requesting data from {url}: {err}"
             raise RequestError(msg) from err
-        finally:
-            if not use_running_session:
-                await session.close()
 
-        self._logger.debug("Received data for %s: %s", endpoint, data)
+        try:
+            data: RequestResponseT = self._json_loads(body)
+        # Decoders raise their own exceptions (e.g., msgspec's DecodeError isn't a
+        # ValueError):
+        except Exception as err:
+            msg = f"Invalid JSON received from {url}: {err}"
+            raise RequestError(msg) from err
+
+        # Large payloads are expensive to format, so don't bother unless they'll be
+        # logged:
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Received data for %s: %s", endpoint, data)
 
         # Returns either a list of dicts or a dict itself.
         return data
+
+    async def _stream_request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        array_key: str | None = None,
+        **kwargs: Unpack[RequestKwargsT],
+    ) -> AsyncIterator[Any]:
+        """Stream the items of an array response from the API.
+
+        Only the item currently being received is held in memory, rather than the
+        entire response body.
+
+        Args:
+        ----
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            array_key: The key of the top-level object that holds the array (if the
+                response isn't the array itself).
+            **kwargs: Additional kwargs to send with the request.
+
+        Yields:
+        ------
+            Items of the array, as they arrive.
+
+        Raises:
+        ------
+            RequestError: Raised upon an underlying HTTP error or invalid JSON.
+
+        """
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
+
+        url = f"{self._base_url}/{endpoint}"
+        session = self._get_session()
+        parser = JsonArrayStreamParser(array_key)
+
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.content.iter_any():
+                    for item in parser.feed(chunk):
+                        yield item
+                parser.close()
+        except ClientError as err:
+            msg = f"Error requesting data from {url}: {err}"
+            raise RequestError(msg) from err
+        except ValueError as err:
+            msg = f"Invalid JSON received from {url}: {err}"
+            raise RequestError(msg) from err
@@ -0,0 +1,140 @@
+"""Define an object to group websocket data into batches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+from .const import LOGGER
+
+DEFAULT_BATCH_MAX_LATENCY = 0.25
+DEFAULT_BATCH_MAX_SIZE = 500
+
+
+class DataBatcher:
+    """Define an object that delivers websocket data in batches.
+
+    A batch is delivered once it holds `max_size` messages or once its first message
+    has waited `max_latency` seconds, whichever comes first. Batches are delivered
+    one at a time and in order.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[list[dict[str, Any]]], Awaitable[None]],
+        *,
+        logger: logging.Logger = LOGGER,
+        max_latency: float = DEFAULT_BATCH_MAX_LATENCY,
+        max_size: int = DEFAULT_BATCH_MAX_SIZE,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            target: The coroutine function to deliver each batch to.
+            logger: The logger to use.
+            max_latency: The maximum number of seconds a message waits in a batch.
+            max_size: The maximum number of messages in a batch.
+
+        """
+        self._batch: list[dict[str, Any]] = []
+        self._deliver_lock = asyncio.Lock()
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        self._logger = logger
+        self._max_latency = max_latency
+        self._max_size = max_size
+        self._target = target
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        """Return the number of messages waiting in the current batch.
+
+        Returns
+        -------
+            The number of messages.
+
+        """
+        return len(self._batch)
+
+    async def add(self, data: dict[str, Any]) -> None:
+        """Add a message to the current batch.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        self._batch.append(data)
+
+        if len(self._batch) >= self._max_size:
+            await self.flush()
+        else:
+            self._start_timer()
+
+    def cancel(self) -> list[dict[str, Any]]:
+        """Drop the current batch without delivering it.
+
+        Returns
+        -------
+            The messages that were dropped.
+
+        """
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        return batch
+
+    def prepend(self, messages: list[dict[str, Any]]) -> None:
+        """Add messages to the start of the current batch.
+
+        Args:
+        ----
+            messages: The websocket data to add (e.g., another batcher's cancelled
+                batch).
+
+        """
+        if messages:
+            self._batch[:0] = messages
+            self._start_timer()
+
+    async def flush(self) -> None:
+        """Deliver the current batch (if there is one) immediately."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+        async with self._deliver_lock:
+            await self._target(batch)
+
+    def _on_flush_task_done(self, task: asyncio.Task[None]) -> None:
+        """Log any error raised while delivering a batch in the background.
+
+        Args:
+        ----
+            task: The completed task.
+
+        """
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and (err := task.exception()):
+            self._logger.error("Error while handling a batch of data: %s", err)
+
+    def _start_timer(self) -> None:
+        """Start the timer to deliver the current batch (if it isn't running)."""
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._max_latency, self._on_timer
+            )
+
+    def _on_timer(self) -> None:
+        """Deliver the current batch once it has waited long enough."""
+        self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flush_task_done)
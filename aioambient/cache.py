@@ -0,0 +1,156 @@
+"""Define a response cache for REST API requests."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from fnmatch import fnmatchcase
+import time
+from typing import NamedTuple
+
+DEFAULT_CACHE_MAX_SIZE = 128
+DEFAULT_CACHE_TTL = 60.0
+
+
+class CacheEntry(NamedTuple):
+    """Define a cached response."""
+
+    fresh_until: float
+    stale_until: float
+    value: object
+
+
+class ResponseCache:
+    """Define a TTL/LRU cache of API responses.
+
+    Entries are fresh for their endpoint's TTL; after that, they may still be served
+    for `stale_ttl` seconds while a fresh copy is fetched in the background
+    (stale-while-revalidate). The least recently used entry is evicted once the cache
+    holds `max_size` entries.
+
+    Per-endpoint TTLs are keyed by glob patterns that are matched against the
+    relative endpoint (e.g., `{"devices": 30, "devices/*": 300}`); the first match
+    wins and `default_ttl` applies otherwise. A TTL of 0 disables caching for an
+    endpoint.
+
+    Cached payloads are shared by every caller that receives them, so they should
+    be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        stale_ttl: float = 0.0,
+        ttls: Mapping[str, float] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            default_ttl: The number of seconds a response is fresh for.
+            max_size: The maximum number of responses to hold.
+            stale_ttl: The number of seconds past its TTL that a response may be
+                served while it is revalidated.
+            ttls: An optional mapping of endpoint patterns to TTLs.
+
+        """
+        self._default_ttl = default_ttl
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._max_size = max_size
+        self._stale_ttl = stale_ttl
+        self._ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses.
+
+        Returns
+        -------
+            The number of cached responses.
+
+        """
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        self._entries.clear()
+
+    def get(self, key: Hashable, endpoint: str) -> tuple[object, bool] | None:
+        """Get a cached response.
+
+        Lookups for endpoints whose responses are never cached (i.e., that have a TTL
+        of 0) aren't counted as misses.
+
+        Args:
+        ----
+            key: The cache key.
+            endpoint: The relative endpoint that the response comes from.
+
+        Returns:
+        -------
+            A (response, is_stale) tuple, or None if nothing usable is cached.
+
+        """
+        if self.ttl_for(endpoint) <= 0:
+            return None
+
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        if (now := time.monotonic()) >= entry.stale_until:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+
+        if now >= entry.fresh_until:
+            self.stale_hits += 1
+            return entry.value, True
+
+        self.hits += 1
+        return entry.value, False
+
+    def set(self, key: Hashable, endpoint: str, value: object) -> None:
+        """Cache a response.
+
+        Args:
+        ----
+            key: The cache key.
+            endpoint: The relative endpoint that the response came from.
+            value: The response.
+
+        """
+        if (ttl := self.ttl_for(endpoint)) <= 0:
+            return
+
+        fresh_until = time.monotonic() + ttl
+        self._entries[key] = CacheEntry(
+            fresh_until, fresh_until + self._stale_ttl, value
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Get the TTL for an endpoint.
+
+        Args:
+        ----
+            endpoint: A relative API endpoint.
+
+        Returns:
+        -------
+            The TTL (in seconds).
+
+        """
+        for pattern, ttl in self._ttls.items():
+            if fnmatchcase(endpoint, pattern):
+                return ttl
+        return self._default_ttl
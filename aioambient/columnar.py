@@ -0,0 +1,245 @@
+"""Define columnar batches of device history."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Collection, Iterable, Iterator, Mapping
+import math
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
+TIMESTAMP_FIELD = "dateutc"
+
+
+def _require_numpy() -> None:
+    """Ensure that NumPy is installed.
+
+    Raises
+    ------
+        ImportError: Raised when NumPy isn't installed.
+
+    """
+    if not HAS_NUMPY:  # pragma: no cover
+        msg = "NumPy must be installed to use NumPy-backed columns"
+        raise ImportError(msg)
+
+
+class ColumnarBatch(Mapping[str, Any]):
+    """Define a batch of device history records stored as columns.
+
+    The batch maps each numeric field to a column of floats (an `array("d")`, or a
+    NumPy float64 array if `use_numpy` is set). Every column has one entry per record;
+    records that lack a field hold NaN in that column and are marked invalid in the
+    field's validity mask. Record timestamps (`dateutc`, in epoch milliseconds) are
+    held separately in `timestamps`.
+
+    Non-numeric fields (e.g., `date` or `tz`) are not included.
+    """
+
+    def __init__(
+        self,
+        timestamps: array[int],
+        columns: dict[str, array[float]],
+        masks: dict[str, bytearray],
+        *,
+        use_numpy: bool = False,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            timestamps: The timestamp of each record.
+            columns: A mapping of field names to columns.
+            masks: A mapping of field names to validity masks.
+            use_numpy: Whether to expose columns as NumPy arrays.
+
+        """
+        if use_numpy:
+            _require_numpy()
+
+        self._columns = columns
+        self._masks = masks
+        self._timestamps = timestamps
+        self._use_numpy = use_numpy
+
+    def __getitem__(self, field: str) -> Any:  # noqa: ANN401
+        """Get the column for a field.
+
+        Args:
+        ----
+            field: The field name.
+
+        Returns:
+        -------
+            An `array("d")` or a NumPy float64 array.
+
+        """
+        column = self._columns[field]
+        if self._use_numpy:
+            # This is a view onto the same buffer, not a copy:
+            return np.frombuffer(column, dtype=np.float64)
+        return column
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the field names.
+
+        Returns
+        -------
+            An iterator of field names.
+
+        """
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        """Return the number of columns.
+
+        Returns
+        -------
+            The number of columns.
+
+        """
+        return len(self._columns)
+
+    @classmethod
+    def concat(cls, batches: Iterable[ColumnarBatch]) -> ColumnarBatch:
+        """Concatenate batches (e.g., the pages of a device's history) into one.
+
+        Args:
+        ----
+            batches: The batches to concatenate.
+
+        Returns:
+        -------
+            A ColumnarBatch.
+
+        """
+        batches = list(batches)
+        fields = list(dict.fromkeys(field for batch in batches for field in batch))
+
+        timestamps: array[int] = array("q")
+        columns = {field: array("d") for field in fields}
+        masks = {field: bytearray() for field in fields}
+
+        for batch in batches:
+            num_rows = batch.num_rows
+            timestamps.extend(batch._timestamps)  # noqa: SLF001
+            for field in fields:
+                if (column := batch._columns.get(field)) is None:  # noqa: SLF001
+                    columns[field].extend([math.nan] * num_rows)
+                    masks[field].extend(bytes(num_rows))
+                else:
+                    columns[field].extend(column)
+                    masks[field].extend(batch._masks[field])  # noqa: SLF001
+
+        return cls(
+            timestamps,
+            columns,
+            masks,
+            use_numpy=bool(batches) and batches[0]._use_numpy,  # noqa: SLF001
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[dict[str, Any]],
+        *,
+        fields: Collection[str] | None = None,
+        use_numpy: bool = False,
+    ) -> ColumnarBatch:
+        """Build a batch from device history records in a single pass.
+
+        Args:
+        ----
+            records: Device history records.
+            fields: The fields to include (defaults to every numeric field).
+            use_numpy: Whether to expose columns as NumPy arrays.
+
+        Returns:
+        -------
+            A ColumnarBatch.
+
+        """
+        timestamps: array[int] = array("q")
+        columns: dict[str, array[float]] = {}
+        masks: dict[str, bytearray] = {}
+        nan = math.nan
+
+        for row, record in enumerate(records):
+            timestamps.append(record[TIMESTAMP_FIELD])
+
+            for field, value in record.items():
+                if (
+                    field == TIMESTAMP_FIELD
+                    or (fields is not None and field not in fields)
+                    or not isinstance(value, int | float)
+                    or isinstance(value, bool)
+                ):
+                    continue
+
+                if (column := columns.get(field)) is None:
+                    column = columns[field] = array("d")
+                    masks[field] = bytearray()
+
+                # Backfill any records that lacked this field:
+                if (missing := row - len(column)) > 0:
+                    column.extend([nan] * missing)
+                    masks[field].extend(bytes(missing))
+
+                column.append(value)
+                masks[field].append(1)
+
+        num_rows = len(timestamps)
+        for field, column in columns.items():
+            if (missing := num_rows - len(column)) > 0:
+                column.extend([nan] * missing)
+                masks[field].extend(bytes(missing))
+
+        return cls(timestamps, columns, masks, use_numpy=use_numpy)
+
+    @property
+    def num_rows(self) -> int:
+        """Return the number of records in the batch.
+
+        Returns
+        -------
+            The number of records.
+
+        """
+        return len(self._timestamps)
+
+    @property
+    def timestamps(self) -> Any:  # noqa: ANN401
+        """Return the timestamp (in epoch milliseconds) of each record.
+
+        Returns
+        -------
+            An `array("q")` or a NumPy int64 array.
+
+        """
+        if self._use_numpy:
+            return np.frombuffer(self._timestamps, dtype=np.int64)
+        return self._timestamps
+
+    def valid(self, field: str) -> Any:  # noqa: ANN401
+        """Get the validity mask for a field.
+
+        Args:
+        ----
+            field: The field name.
+
+        Returns:
+        -------
+            A bytearray (1 for records that have the field, 0 for those that don't)
+            or a NumPy bool array.
+
+        """
+        mask = self._masks[field]
+        if self._use_numpy:
+            return np.frombuffer(mask, dtype=np.bool_)
+        return mask
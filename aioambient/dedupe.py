@@ -0,0 +1,70 @@
+"""Define an object to drop replayed websocket data."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class Deduplicator:
+    """Define a filter that drops replayed and out-of-order data.
+
+    The filter keeps a watermark (the latest `dateutc` seen) for each device; data
+    that isn't newer than its device's watermark is suppressed. Data without a MAC
+    address or `dateutc` is always let through.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._watermarks: dict[str, int] = {}
+        self.suppressed = 0
+
+    @property
+    def watermarks(self) -> dict[str, int]:
+        """Return the latest `dateutc` seen from each device.
+
+        Returns
+        -------
+            A dict of timestamps (in milliseconds) by MAC address.
+
+        """
+        return dict(self._watermarks)
+
+    def accept(self, data: dict[str, Any]) -> bool:
+        """Get whether data is new (advancing its device's watermark if so).
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        Returns:
+        -------
+            Whether the data should be handled.
+
+        """
+        mac_address = data.get("macAddress")
+        date_utc = data.get("dateutc")
+        if not isinstance(mac_address, str) or not isinstance(date_utc, int):
+            return True
+
+        if (watermark := self._watermarks.get(mac_address)) is not None and (
+            date_utc <= watermark
+        ):
+            self.suppressed += 1
+            return False
+
+        self._watermarks[mac_address] = date_utc
+        return True
+
+    def get_watermark(self, mac_address: str) -> int | None:
+        """Get the latest `dateutc` seen from a device.
+
+        Args:
+        ----
+            mac_address: The MAC address of the device.
+
+        Returns:
+        -------
+            A timestamp (in milliseconds), or None if nothing has been seen.
+
+        """
+        return self._watermarks.get(mac_address)
@@ -0,0 +1,117 @@
+"""Define an object to reduce websocket data to the fields that have changed."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Fields that are included in every delta (so that it can be attributed and ordered):
+DELTA_IDENTITY_FIELDS = ("macAddress", "dateutc")
+
+
+class DeltaTracker:
+    """Define an object that tracks each device's state and reports what changes.
+
+    A numeric field counts as changed once it differs from the value last reported
+    by more than its epsilon; since the comparison is against the last reported value
+    (rather than the last received one), slow drifts are reported once they add up.
+    Any other field counts as changed when it is no longer equal to the last reported
+    value (or is missing, in which case it is reported as None).
+    """
+
+    def __init__(
+        self,
+        *,
+        default_epsilon: float = 0.0,
+        epsilons: dict[str, float] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            default_epsilon: The epsilon for numeric fields without their own.
+            epsilons: An optional dict of epsilons by field name.
+
+        """
+        self._default_epsilon = default_epsilon
+        self._epsilons = epsilons or {}
+        self._states: dict[str, dict[str, Any]] = {}
+
+    def _has_changed(self, field: str, old: Any, new: Any) -> bool:  # noqa: ANN401
+        """Get whether a field has changed enough to report.
+
+        Args:
+        ----
+            field: The name of the field.
+            old: The value last reported.
+            new: The value received.
+
+        Returns:
+        -------
+            Whether the field has changed.
+
+        """
+        if (
+            isinstance(old, int | float)
+            and isinstance(new, int | float)
+            and not isinstance(old, bool)
+            and not isinstance(new, bool)
+        ):
+            return abs(new - old) > self._epsilons.get(field, self._default_epsilon)
+        return bool(old != new)
+
+    def diff(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Get the fields of data that have changed since they were last reported.
+
+        Data without a MAC address can't be tracked, so it is returned in full.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        Returns:
+        -------
+            A dict of the changed fields (plus the MAC address and `dateutc`), which
+            is empty if nothing has changed.
+
+        """
+        if not isinstance(mac_address := data.get("macAddress"), str):
+            return data
+
+        if (state := self._states.get(mac_address)) is None:
+            self._states[mac_address] = dict(data)
+            return data
+
+        delta = {
+            field: value
+            for field, value in data.items()
+            if field not in state or self._has_changed(field, state[field], value)
+        }
+        delta.update(
+            (field, None)
+            for field in state
+            if field not in data and state[field] is not None
+        )
+
+        if all(field in DELTA_IDENTITY_FIELDS for field in delta):
+            return {}
+
+        state.update(delta)
+        for field in DELTA_IDENTITY_FIELDS:
+            if field in data:
+                delta[field] = data[field]
+        return delta
+
+    def reset(self, mac_address: str | None = None) -> None:
+        """Forget the state of one device (or every device).
+
+        The next data from a forgotten device is reported in full.
+
+        Args:
+        ----
+            mac_address: The MAC address of the device (or None for every device).
+
+        """
+        if mac_address is None:
+            self._states.clear()
+        else:
+            self._states.pop(mac_address, None)
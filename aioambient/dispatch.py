@@ -0,0 +1,204 @@
+"""Define a bounded queue between the websocket and data handlers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from enum import StrEnum
+from itertools import count
+import logging
+from typing import Any, cast
+
+from .const import LOGGER
+
+DEFAULT_DISPATCH_QUEUE_SIZE = 1000
+DEFAULT_DISPATCH_WORKERS = 1
+
+
+class OverflowPolicy(StrEnum):
+    """Define what happens when data arrives and the queue is full."""
+
+    # Wait for room in the queue (which pauses the websocket's receive path):
+    BLOCK = "block"
+    # Drop the oldest message in the queue to make room:
+    DROP_OLDEST = "drop_oldest"
+    # Keep only the latest message from each device that is waiting in the queue
+    # (whether or not it is full); once the queue holds one message from each of
+    # `max_size` devices, wait for room:
+    LATEST_PER_MAC = "latest_per_mac"
+
+
+class DispatchQueue:
+    """Define a bounded queue of websocket data that is handled by worker tasks.
+
+    Data is put into the queue from the websocket's receive path and handled by
+    `workers` tasks, so a slow handler doesn't stall the connection. With more than
+    one worker, messages may be handled out of order.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: logging.Logger = LOGGER,
+        max_size: int = DEFAULT_DISPATCH_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        workers: int = DEFAULT_DISPATCH_WORKERS,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            logger: The logger to use.
+            max_size: The maximum number of messages waiting in the queue.
+            overflow: What to do when data arrives and the queue is full.
+            workers: The number of worker tasks that handle data.
+
+        """
+        self._changed = asyncio.Condition()
+        self._handler: Callable[[dict[str, Any]], Awaitable[None]] | None = None
+        self._in_progress = 0
+        self._logger = logger
+        self._max_size = max_size
+        self._overflow = overflow
+        # Messages are keyed by MAC address when keeping the latest per device (and
+        # by a unique number otherwise):
+        self._pending: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self._sequence = count()
+        self._worker_tasks: list[asyncio.Task[None]] = []
+        self._workers = workers
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of messages waiting in the queue.
+
+        Returns
+        -------
+            The number of messages.
+
+        """
+        return len(self._pending)
+
+    def _get_key(self, data: dict[str, Any]) -> Hashable:
+        """Get the key to queue a message under.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        Returns:
+        -------
+            A hashable key.
+
+        """
+        if self._overflow is OverflowPolicy.LATEST_PER_MAC and (
+            mac_address := data.get("macAddress")
+        ):
+            return cast(str, mac_address)
+        return next(self._sequence)
+
+    async def _work(self) -> None:
+        """Handle messages from the queue until cancelled (or stopped)."""
+        task = asyncio.current_task()
+
+        # A worker whose handler stopped the queue exits once the handler returns:
+        while task in self._worker_tasks:
+            async with self._changed:
+                await self._changed.wait_for(lambda: bool(self._pending))
+                _, data = self._pending.popitem(last=False)
+                self._in_progress += 1
+                self._changed.notify_all()
+
+            try:
+                if self._handler is not None:
+                    await self._handler(data)
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("Error while handling data")
+            finally:
+                async with self._changed:
+                    self._in_progress -= 1
+                    self._changed.notify_all()
+
+    async def join(self) -> None:
+        """Wait until every queued message has been handled."""
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: not self._pending and not self._in_progress
+            )
+
+    async def put(self, data: dict[str, Any]) -> None:
+        """Put a message into the queue.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        key = self._get_key(data)
+
+        async with self._changed:
+            if key in self._pending:
+                # Replace the device's waiting message (keeping its place in line):
+                self._pending[key] = data
+                self.dropped += 1
+                return
+
+            if len(self._pending) >= self._max_size:
+                if self._overflow is OverflowPolicy.DROP_OLDEST:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                else:
+                    await self._changed.wait_for(
+                        lambda: len(self._pending) < self._max_size
+                    )
+                    # The device may have sent another message in the meantime:
+                    if key in self._pending:
+                        self.dropped += 1
+
+            self._pending[key] = data
+            self._changed.notify_all()
+
+    def start(self, handler: Callable[[dict[str, Any]], Awaitable[None]]) -> None:
+        """Start the worker tasks (if they aren't already running).
+
+        Args:
+        ----
+            handler: The coroutine function to handle each message with.
+
+        """
+        self._handler = handler
+        if self._worker_tasks:
+            return
+        self._worker_tasks = [
+            asyncio.create_task(self._work()) for _ in range(self._workers)
+        ]
+
+    async def stop(self, *, drain: bool = True) -> None:
+        """Stop the worker tasks.
+
+        If this is called from a handler (e.g., one that disconnects the websocket),
+        queued messages are dropped rather than drained, since the calling worker
+        can't wait for itself.
+
+        Args:
+        ----
+            drain: Whether to handle every queued message first (rather than dropping
+                them).
+
+        """
+        current_task = asyncio.current_task()
+        from_worker = current_task in self._worker_tasks
+
+        if drain and self._worker_tasks and not from_worker:
+            await self.join()
+
+        other_tasks = [task for task in self._worker_tasks if task is not current_task]
+        for task in other_tasks:
+            task.cancel()
+        self._worker_tasks = []
+        await asyncio.gather(*other_tasks, return_exceptions=True)
+
+        if self._pending:
+            self.dropped += len(self._pending)
+            self._pending.clear()
@@ -0,0 +1,113 @@
+"""Define an object to fan events out to async iterator streams."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Generic, TypeVar
+
+DEFAULT_STREAM_BUFFER_SIZE = 1000
+
+EventT = TypeVar("EventT")
+
+
+class _EventBuffer(Generic[EventT]):
+    """Define the buffer of events waiting to be read from a stream."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            size: The maximum number of events to buffer.
+
+        """
+        self.closed = False
+        # None marks the end of the stream:
+        self.queue: asyncio.Queue[EventT | None] = asyncio.Queue(size)
+
+    def close(self) -> None:
+        """End the stream once the events already in the buffer have been read."""
+        self.closed = True
+        # If the buffer is full, the stream ends once it has been read instead:
+        if not self.queue.full():
+            self.queue.put_nowait(None)
+
+    async def put(self, event: EventT) -> None:
+        """Put an event into the buffer, waiting for room if it is full.
+
+        Args:
+        ----
+            event: The event.
+
+        """
+        if not self.closed:
+            await self.queue.put(event)
+
+
+class EventStreams(Generic[EventT]):
+    """Define a set of streams, each of which receives every event put.
+
+    Each stream has its own buffer, which holds events until they are read; once a
+    buffer is full, putting an event waits for the stream to catch up (so a slow
+    reader slows down whatever puts events rather than losing them).
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._buffers: list[_EventBuffer[EventT]] = []
+
+    def __len__(self) -> int:
+        """Return the number of open streams.
+
+        Returns
+        -------
+            The number of streams.
+
+        """
+        return len(self._buffers)
+
+    def close(self) -> None:
+        """End every open stream once the events in its buffer have been read."""
+        for buffer in self._buffers:
+            buffer.close()
+
+    async def put(self, event: EventT) -> None:
+        """Put an event into every open stream.
+
+        Args:
+        ----
+            event: The event.
+
+        """
+        for buffer in list(self._buffers):
+            await buffer.put(event)
+
+    async def stream(
+        self, *, buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE
+    ) -> AsyncIterator[EventT]:
+        """Open a stream of the events put from the time it is first iterated.
+
+        Args:
+        ----
+            buffer_size: The maximum number of events to buffer.
+
+        Yields:
+        ------
+            Events.
+
+        """
+        buffer: _EventBuffer[EventT] = _EventBuffer(buffer_size)
+        self._buffers.append(buffer)
+
+        try:
+            while not (buffer.closed and buffer.queue.empty()):
+                if (event := await buffer.queue.get()) is None:
+                    return
+                yield event
+        finally:
+            self._buffers.remove(buffer)
+            buffer.closed = True
+            # Unblock anything waiting for room in the buffer:
+            while not buffer.queue.empty():
+                buffer.queue.get_nowait()
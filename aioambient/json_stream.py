@@ -0,0 +1,343 @@
+"""Define an incremental parser for streamed JSON arrays."""
+
+from __future__ import annotations
+
+import codecs
+from enum import Enum, auto
+import json
+import re
+from typing import Any
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ParserState(Enum):
+    """Define the states of the parser."""
+
+    START = auto()
+    OBJECT_START = auto()
+    OBJECT_KEY = auto()
+    OBJECT_COLON = auto()
+    OBJECT_VALUE = auto()
+    OBJECT_AFTER_VALUE = auto()
+    ARRAY_START = auto()
+    ARRAY_ITEM = auto()
+    ARRAY_AFTER_ITEM = auto()
+    DONE = auto()
+
+
+class JsonArrayStreamParser:
+    """Define a parser that yields the items of a JSON array as bytes arrive.
+
+    The array is either the top-level value of the document or (if `key` is given)
+    the value of that key in a top-level object (e.g., `{"data": [...]}`); anything
+    after the array is ignored. Only the item currently being received (plus any
+    unconsumed part of the latest chunk) is buffered.
+    """
+
+    def __init__(self, key: str | None = None) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            key: The top-level object key that holds the array (if any).
+
+        """
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+        self._final = False
+        self._items: list[Any] = []
+        self._key = key
+        self._pending_key: str | None = None
+        self._state = ParserState.START
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def _decode_value(self, pos: int) -> tuple[Any, int] | None:
+        """Decode a complete JSON value from the buffer.
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            A (value, end position) tuple, or None if more data is needed.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            return None
+
+        # A number at the very end of the buffer (or followed by what may be the
+        # start of its fraction or exponent) may be cut off:
+        if not self._final and (
+            end == len(self._buffer)
+            or (isinstance(value, int | float) and self._buffer[end] in ".eE")
+        ):
+            return None
+
+        return value, end
+
+    def _parse(self, *, final: bool) -> list[Any]:
+        """Parse as much of the buffer as possible.
+
+        Args:
+        ----
+            final: Whether the entire document has been received.
+
+        Returns:
+        -------
+            The array items that were completed.
+
+        """
+        handlers = {
+            ParserState.START: self._parse_start,
+            ParserState.OBJECT_START: self._parse_object_key,
+            ParserState.OBJECT_KEY: self._parse_object_key,
+            ParserState.OBJECT_COLON: self._parse_object_colon,
+            ParserState.OBJECT_VALUE: self._parse_object_value,
+            ParserState.OBJECT_AFTER_VALUE: self._parse_object_after_value,
+            ParserState.ARRAY_START: self._parse_array_item,
+            ParserState.ARRAY_ITEM: self._parse_array_item,
+            ParserState.ARRAY_AFTER_ITEM: self._parse_array_after_item,
+        }
+        self._final = final
+        self._items = []
+        pos = 0
+
+        while self._state is not ParserState.DONE:
+            if match := WHITESPACE.match(self._buffer, pos):
+                pos = match.end()
+            if pos == len(self._buffer):
+                break
+            if (next_pos := handlers[self._state](pos)) is None:
+                # Wait for more data:
+                break
+            pos = next_pos
+
+        self._buffer = self._buffer[pos:]
+        items, self._items = self._items, []
+        return items
+
+    def _parse_array_after_item(self, pos: int) -> int | None:
+        """Parse the separator (or end) that follows an array item.
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        char = self._buffer[pos]
+        if char == ",":
+            self._state = ParserState.ARRAY_ITEM
+        elif char == "]":
+            self._state = ParserState.DONE
+        else:
+            msg = f"Expected ',' or ']' after array item, got {char!r}"
+            raise ValueError(msg)
+        return pos + 1
+
+    def _parse_array_item(self, pos: int) -> int | None:
+        """Parse an array item (or the end of an empty array).
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position, or None if more data is needed.
+
+        """
+        if self._state is ParserState.ARRAY_START and self._buffer[pos] == "]":
+            self._state = ParserState.DONE
+            return pos + 1
+        if (decoded := self._decode_value(pos)) is None:
+            return None
+        item, pos = decoded
+        self._items.append(item)
+        self._state = ParserState.ARRAY_AFTER_ITEM
+        return pos
+
+    def _parse_object_after_value(self, pos: int) -> int | None:
+        """Parse the separator (or end) that follows a value of the top-level object.
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        char = self._buffer[pos]
+        if char == ",":
+            self._state = ParserState.OBJECT_KEY
+        elif char == "}":
+            # The key doesn't exist, so there are no items:
+            self._state = ParserState.DONE
+        else:
+            msg = f"Expected ',' or '}}' after object value, got {char!r}"
+            raise ValueError(msg)
+        return pos + 1
+
+    def _parse_object_colon(self, pos: int) -> int | None:
+        """Parse the colon that follows an object key.
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        if self._buffer[pos] != ":":
+            msg = f"Expected ':' after object key {self._pending_key!r}"
+            raise ValueError(msg)
+        self._state = ParserState.OBJECT_VALUE
+        return pos + 1
+
+    def _parse_object_key(self, pos: int) -> int | None:
+        """Parse a key of the top-level object (or the end of an empty object).
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position, or None if more data is needed.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        if self._state is ParserState.OBJECT_START and self._buffer[pos] == "}":
+            # The key doesn't exist, so there are no items:
+            self._state = ParserState.DONE
+            return pos + 1
+        if self._buffer[pos] != '"':
+            msg = f"Expected an object key, got {self._buffer[pos]!r}"
+            raise ValueError(msg)
+        if (decoded := self._decode_value(pos)) is None:
+            return None
+        self._pending_key, pos = decoded
+        self._state = ParserState.OBJECT_COLON
+        return pos
+
+    def _parse_object_value(self, pos: int) -> int | None:
+        """Parse a value of the top-level object.
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position, or None if more data is needed.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        if self._pending_key == self._key:
+            if self._buffer[pos] != "[":
+                msg = f"Expected an array under {self._key!r}"
+                raise ValueError(msg)
+            self._state = ParserState.ARRAY_START
+            return pos + 1
+
+        # Skip the values of other keys:
+        if (decoded := self._decode_value(pos)) is None:
+            return None
+        _, pos = decoded
+        self._state = ParserState.OBJECT_AFTER_VALUE
+        return pos
+
+    def _parse_start(self, pos: int) -> int | None:
+        """Parse the start of the document.
+
+        Args:
+        ----
+            pos: The buffer position to start at.
+
+        Returns:
+        -------
+            The next buffer position.
+
+        Raises:
+        ------
+            ValueError: Raised when the document is invalid.
+
+        """
+        if self._key is None:
+            expected, self._state = "[", ParserState.ARRAY_START
+        else:
+            expected, self._state = "{", ParserState.OBJECT_START
+        if self._buffer[pos] != expected:
+            msg = f"Expected {expected!r} at the start of the document"
+            raise ValueError(msg)
+        return pos + 1
+
+    def close(self) -> None:
+        """Finish parsing once the entire document has been received.
+
+        Since the end of the array always follows its last item, every item has
+        already been returned by `feed()`; this only checks that the document is
+        complete.
+
+        Raises
+        ------
+            ValueError: Raised when the document is invalid or incomplete.
+
+        """
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._parse(final=True)
+        if self._state is not ParserState.DONE:
+            msg = "Unexpected end of JSON document"
+            raise ValueError(msg)
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Feed a chunk of the document to the parser.
+
+        Args:
+        ----
+            chunk: The next chunk of the (UTF-8 encoded) document.
+
+        Returns:
+        -------
+            The array items that were completed by this chunk.
+
+        """
+        if self._state is ParserState.DONE:
+            return []
+        self._buffer += self._utf8.decode(chunk)
+        return self._parse(final=False)
@@ -0,0 +1,385 @@
+"""Define compact, typed models of Ambient Weather payloads.
+
+These models are opt-in: every API method continues to return plain dicts, which can
+be converted with `Observation.from_dict()`/`Device.from_dict()` (and back again with
+`as_dict()`).
+
+Rather than holding its own dict, an observation holds a tuple of values and a
+reference to a schema (the tuple of field names) that is shared by every observation
+with the same fields. Since a station reports the same fields in every observation,
+hundreds of records end up sharing a single set of (interned) field names.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+import sys
+from typing import TYPE_CHECKING, Any
+
+# Fields that a station may or may not report (depending on its sensors); accessing
+# one that a particular observation lacks returns None:
+OPTIONAL_SENSOR_FIELDS = frozenset(
+    {
+        "baromabsin",
+        "baromrelin",
+        "dailyrainin",
+        "dewPoint",
+        "eventrainin",
+        "feelsLike",
+        "hourlyrainin",
+        "humidity",
+        "humidityin",
+        "maxdailygust",
+        "monthlyrainin",
+        "solarradiation",
+        "tempf",
+        "tempinf",
+        "totalrainin",
+        "uv",
+        "weeklyrainin",
+        "winddir",
+        "windgustmph",
+        "windspeedmph",
+        "yearlyrainin",
+    }
+)
+
+MAX_SCHEMAS = 1024
+
+
+class Schema:  # pylint: disable=too-few-public-methods
+    """Define an ordered set of field names shared by many observations."""
+
+    __slots__ = ("fields", "index")
+
+    def __init__(self, fields: tuple[str, ...]) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            fields: The field names.
+
+        """
+        self.fields = tuple(sys.intern(field) for field in fields)
+        self.index = {field: idx for idx, field in enumerate(self.fields)}
+
+
+_SCHEMAS: dict[tuple[str, ...], Schema] = {}
+
+
+def get_schema(fields: tuple[str, ...]) -> Schema:
+    """Get the shared schema for a tuple of field names.
+
+    Args:
+    ----
+        fields: The field names.
+
+    Returns:
+    -------
+        A Schema.
+
+    """
+    if (schema := _SCHEMAS.get(fields)) is None:
+        if len(_SCHEMAS) >= MAX_SCHEMAS:
+            # Something is producing an unbounded variety of payloads; start over
+            # rather than growing forever:
+            _SCHEMAS.clear()
+        schema = _SCHEMAS[fields] = Schema(fields)
+    return schema
+
+
+class Observation:
+    """Define a single observation from a weather station.
+
+    Any field in the payload can be read as an attribute (e.g., `observation.tempf`).
+    Optional sensor fields that the observation lacks read as None, and sensor values
+    are converted to floats when they are read.
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    if TYPE_CHECKING:
+        # Optional sensor fields (implemented as properties below):
+        baromabsin: float | None
+        baromrelin: float | None
+        dailyrainin: float | None
+        dewPoint: float | None  # noqa: N815
+        eventrainin: float | None
+        feelsLike: float | None  # noqa: N815
+        hourlyrainin: float | None
+        humidity: float | None
+        humidityin: float | None
+        maxdailygust: float | None
+        monthlyrainin: float | None
+        solarradiation: float | None
+        tempf: float | None
+        tempinf: float | None
+        totalrainin: float | None
+        uv: float | None
+        weeklyrainin: float | None
+        winddir: float | None
+        windgustmph: float | None
+        windspeedmph: float | None
+        yearlyrainin: float | None
+
+    def __init__(self, schema: Schema, values: tuple[Any, ...]) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            schema: The schema that describes the values.
+            values: The values (in schema order).
+
+        """
+        self._schema = schema
+        self._values = values
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Get the value of a field.
+
+        Args:
+        ----
+            name: The field name.
+
+        Returns:
+        -------
+            The field value.
+
+        Raises:
+        ------
+            AttributeError: Raised when the field doesn't exist.
+
+        """
+        # Private names are never fields (and may be looked up before the slots are
+        # set, e.g., when copying):
+        if name.startswith("_") or (idx := self._schema.index.get(name)) is None:
+            msg = f"{type(self).__name__!r} object has no attribute {name!r}"
+            raise AttributeError(msg)
+        return self._values[idx]
+
+    def __repr__(self) -> str:
+        """Return a representation of the observation.
+
+        Returns
+        -------
+            A string representation.
+
+        """
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Observation:
+        """Create an observation from an API payload.
+
+        Args:
+        ----
+            data: An observation dict.
+
+        Returns:
+        -------
+            An Observation.
+
+        """
+        return cls(get_schema(tuple(data)), tuple(data.values()))
+
+    @classmethod
+    def from_dicts(cls, data: Iterable[dict[str, Any]]) -> list[Observation]:
+        """Create observations from a list of API payloads.
+
+        Args:
+        ----
+            data: Observation dicts.
+
+        Returns:
+        -------
+            A list of Observations.
+
+        """
+        return [cls.from_dict(item) for item in data]
+
+    @property
+    def dateutc(self) -> datetime | None:
+        """Return the (UTC) datetime of the observation.
+
+        Returns
+        -------
+            A timezone-aware datetime.
+
+        """
+        if (idx := self._schema.index.get("dateutc")) is None:
+            return None
+        return datetime.fromtimestamp(self._values[idx] / 1000, UTC)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Return the names of the fields in the observation.
+
+        Returns
+        -------
+            A tuple of field names.
+
+        """
+        return self._schema.fields
+
+    def as_dict(self) -> dict[str, Any]:
+        """Convert the observation back to an API payload.
+
+        Returns
+        -------
+            An observation dict.
+
+        """
+        return dict(zip(self._schema.fields, self._values, strict=True))
+
+    def get(self, name: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Get the raw value of a field.
+
+        Args:
+        ----
+            name: The field name.
+            default: The value to return if the field doesn't exist.
+
+        Returns:
+        -------
+            The raw field value.
+
+        """
+        if (idx := self._schema.index.get(name)) is None:
+            return default
+        return self._values[idx]
+
+
+def _sensor_property(name: str) -> property:
+    """Create a property that reads an optional sensor field as a float.
+
+    Args:
+    ----
+        name: The field name.
+
+    Returns:
+    -------
+        A property.
+
+    """
+
+    def _get(self: Observation) -> float | None:
+        """Get the sensor value.
+
+        Args:
+        ----
+            self: The observation.
+
+        Returns:
+        -------
+            The sensor value (or None if the observation lacks it).
+
+        """
+        if (idx := self._schema.index.get(name)) is None or (
+            value := self._values[idx]
+        ) is None:
+            return None
+        return float(value)
+
+    return property(_get)
+
+
+# Sensor fields are properties (rather than going through __getattr__) so that they
+# are both typed and fast to read:
+for _field in OPTIONAL_SENSOR_FIELDS:
+    setattr(Observation, _field, _sensor_property(_field))
+
+
+class Device:
+    """Define a weather station and its latest observation."""
+
+    __slots__ = ("extra", "info", "last_data", "mac_address")
+
+    def __init__(
+        self,
+        mac_address: str,
+        *,
+        extra: dict[str, Any] | None = None,
+        info: dict[str, Any] | None = None,
+        last_data: Observation | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+            extra: Any other fields in the payload.
+            info: The station's info (name, location, etc.), if the payload has it.
+            last_data: The station's latest observation.
+
+        """
+        self.extra = extra or {}
+        self.info = info
+        self.last_data = last_data
+        self.mac_address = mac_address
+
+    def __repr__(self) -> str:
+        """Return a representation of the device.
+
+        Returns
+        -------
+            A string representation.
+
+        """
+        return f"{type(self).__name__}({self.mac_address!r})"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Device:
+        """Create a device from an API payload.
+
+        Args:
+        ----
+            data: A device dict.
+
+        Returns:
+        -------
+            A Device.
+
+        """
+        extra = {
+            key: value
+            for key, value in data.items()
+            if key not in ("info", "lastData", "macAddress")
+        }
+        last_data = data.get("lastData")
+        return cls(
+            data["macAddress"],
+            extra=extra,
+            info=data.get("info"),
+            last_data=None if last_data is None else Observation.from_dict(last_data),
+        )
+
+    @classmethod
+    def from_dicts(cls, data: Iterable[dict[str, Any]]) -> list[Device]:
+        """Create devices from a list of API payloads.
+
+        Args:
+        ----
+            data: Device dicts.
+
+        Returns:
+        -------
+            A list of Devices.
+
+        """
+        return [cls.from_dict(item) for item in data]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Convert the device back to an API payload.
+
+        Returns
+        -------
+            A device dict.
+
+        """
+        data: dict[str, Any] = {"macAddress": self.mac_address, **self.extra}
+        if self.info is not None:
+            data["info"] = self.info
+        if self.last_data is not None:
+            data["lastData"] = self.last_data.as_dict()
+        return data
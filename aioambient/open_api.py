@@ -2,19 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Iterable
 import logging
+import math
+from operator import itemgetter
 from typing import Any, cast
 
 from aiohttp import ClientSession
 
-from aioambient.api_request_handler import ApiRequestHandler
+from aioambient.api_request_handler import (
+    DEFAULT_CONNECTOR_LIMIT,
+    DEFAULT_JSON_LOADS,
+    ApiRequestHandler,
+    JsonLoadsT,
+)
+from aioambient.cache import ResponseCache
 from aioambient.util.climate_utils import ClimateUtils
-from aioambient.util.location_utils import LocationUtils
+from aioambient.util.location_utils import EARTH_RADIUS, BoundingBox, LocationUtils
 
 from .const import LOGGER
+from .errors import RequestError
+from .rate_limiter import DEFAULT_RATE_LIMIT, DEFAULT_RATE_LIMIT_BURST, get_rate_limiter
 
 REST_API_BASE = "https://lightning.ambientweather.net"
 
+DEFAULT_LOCATION_LIMIT = 100
+DEFAULT_SCAN_CONCURRENCY = 4
+
+# Tiles are no longer subdivided once they are this small (in miles):
+MIN_SCAN_TILE_SIZE = 0.1
+
+
+def _get_first_request_error(err: ExceptionGroup[Exception]) -> Exception:
+    """Get the first request error in a (possibly nested) exception group.
+
+    Args:
+    ----
+        err: An exception group.
+
+    Returns:
+    -------
+        The first RequestError (or the group itself, if it doesn't hold any).
+
+    """
+    if (request_errors := err.subgroup(RequestError)) is None:
+        return err
+
+    error: Exception = request_errors
+    while isinstance(error, ExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
 
 class OpenAPI(ApiRequestHandler):
     """Define the OpenAPI object."""
@@ -22,18 +61,93 @@ class OpenAPI(ApiRequestHandler):
     def __init__(
         self,
         *,
+        cache: ResponseCache | None = None,
+        connector_limit: int = DEFAULT_CONNECTOR_LIMIT,
+        json_loads: JsonLoadsT = DEFAULT_JSON_LOADS,
         logger: logging.Logger = LOGGER,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_limit_burst: int = DEFAULT_RATE_LIMIT_BURST,
         session: ClientSession | None = None,
     ) -> None:
         """Initialize.
 
+        Every OpenAPI object shares a single rate limiter; the first one created
+        determines its rate and burst.
+
         Args:
         ----
+            cache: An optional cache of API responses.
+            connector_limit: The maximum number of simultaneous connections to open
+                when no session is provided.
+            json_loads: The function to decode response bodies with (e.g.,
+                `orjson.loads` or `msgspec.json.decode`).
             logger: The logger to use.
+            rate_limit: The number of requests allowed per second.
+            rate_limit_burst: The number of requests that may be made back-to-back.
             session: An optional aiohttp ClientSession.
 
         """
-        super().__init__(REST_API_BASE, logger=logger, session=session)
+        super().__init__(
+            REST_API_BASE,
+            cache=cache,
+            connector_limit=connector_limit,
+            json_loads=json_loads,
+            logger=logger,
+            rate_limiter=get_rate_limiter(
+                REST_API_BASE, rate=rate_limit, burst=rate_limit_burst
+            ),
+            session=session,
+        )
+
+    @staticmethod
+    def _get_box_params(box: BoundingBox, limit: int) -> dict[str, Any]:
+        """Get the query parameters for a bounding box search.
+
+        Args:
+        ----
+            box: The bounding box.
+            limit: The maximum number of devices to return.
+
+        Returns:
+        -------
+            A dict of query parameters.
+
+        """
+        params: dict[str, Any] = {}
+        params["$publicBox[0][0]"] = box.west
+        params["$publicBox[0][1]"] = box.south
+        params["$publicBox[1][0]"] = box.east
+        params["$publicBox[1][1]"] = box.north
+        params["$limit"] = limit
+
+        return params
+
+    async def _get_devices_in_box(
+        self, box: BoundingBox, limit: int = DEFAULT_LOCATION_LIMIT
+    ) -> list[dict[str, Any]]:
+        """Get the devices registered within a bounding box.
+
+        Args:
+        ----
+            box: The bounding box.
+            limit: The maximum number of devices to return.
+
+        Returns:
+        -------
+            A list of device dicts.
+
+        """
+        params = self._get_box_params(box, limit)
+
+        # This endpoint returns a dict with a single "data" field that contains
+        # a list of device dicts.
+        response = cast(
+            dict[str, Any], await self._request("get", "devices", params=params)
+        )
+        response_data = cast(list[dict[str, Any]], response.get("data") or [])
+        for station_data in response_data:
+            OpenAPI.inject_virtual_values(station_data)
+        return response_data
 
     @staticmethod
     def inject_virtual_values(data: dict[str, Any]) -> None:
@@ -86,28 +200,154 @@ class OpenAPI(ApiRequestHandler):
             An API response payload.
 
         """
-        lat1, long1 = LocationUtils.shift_location(
-            latitude, longitude, -radius, -radius
-        )
-        lat2, long2 = LocationUtils.shift_location(
-            latitude, longitude, +radius, +radius
+        return await self._get_devices_in_box(
+            LocationUtils.get_bounding_box(latitude, longitude, radius)
         )
-        params = {}
-        params["$publicBox[0][0]"] = long1
-        params["$publicBox[0][1]"] = lat1
-        params["$publicBox[1][0]"] = long2
-        params["$publicBox[1][1]"] = lat2
-        params["$limit"] = 100
 
-        # This endpoint returns a dict with a single "data" field that contains
-        # a list of device dicts.
-        response = cast(
-            dict[str, Any], await self._request("get", "devices", params=params)
+    async def stream_devices_by_location(
+        self, latitude: float, longitude: float, radius: float = 1.0
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream all devices registered within a radius.
+
+        This is the streaming equivalent of `get_devices_by_location`: each device is
+        yielded as soon as it has been received, rather than once the entire response
+        has been.
+
+        Args:
+        ----
+            latitude: Latitude of center.
+            longitude: Longitude of center.
+            radius: Radius (in miles).
+
+        Yields:
+        ------
+            Device dicts.
+
+        """
+        params = self._get_box_params(
+            LocationUtils.get_bounding_box(latitude, longitude, radius),
+            DEFAULT_LOCATION_LIMIT,
         )
-        if (response_data := response.get("data")) is not None:
-            for station_data in response_data:
-                OpenAPI.inject_virtual_values(station_data)
-        return cast(list[dict[str, Any]], response_data)
+        async for station_data in self._stream_request(
+            "get", "devices", array_key="data", params=params
+        ):
+            OpenAPI.inject_virtual_values(station_data)
+            yield station_data
+
+    async def scan_region(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        *,
+        concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    ) -> list[dict[str, Any]]:
+        """Get all devices registered within a radius, however many there are.
+
+        Unlike `get_devices_by_location` (which makes a single request, and thus
+        returns at most 100 devices from a square box), this starts with the whole
+        region and splits any tile that returns the maximum number of devices into
+        quadrants (skipping those outside of the radius), which are fetched
+        concurrently (subject to the rate limit). The number of requests thus depends
+        on how many devices there are rather than on the size of the region. Devices
+        are deduplicated by MAC address and only those within `radius` miles of the
+        center are returned, ordered by distance.
+
+        Args:
+        ----
+            latitude: Latitude of center.
+            longitude: Longitude of center.
+            radius: Radius (in miles).
+            concurrency: The maximum number of tiles to fetch at once.
+
+        Returns:
+        -------
+            A list of device dicts.
+
+        Raises:
+        ------
+            RequestError: Raised upon an underlying HTTP error or invalid JSON.
+
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        devices: dict[str, dict[str, Any]] = {}
+
+        async def _scan_tile(tile: BoundingBox) -> None:
+            """Get the devices within a tile, subdividing it if it is full.
+
+            Args:
+            ----
+                tile: The tile.
+
+            """
+            async with semaphore:
+                tile_devices = await self._get_devices_in_box(tile)
+
+            for device in tile_devices:
+                devices.setdefault(device["macAddress"], device)
+
+            if len(tile_devices) < DEFAULT_LOCATION_LIMIT:
+                return
+
+            height = math.radians(tile.north - tile.south) * EARTH_RADIUS
+            if height / 2 < MIN_SCAN_TILE_SIZE:
+                self._logger.warning(
+                    "Tile %s is full but too small to subdivide; some devices may be "
+                    "missing",
+                    tile,
+                )
+                return
+
+            async with asyncio.TaskGroup() as task_group:
+                for quadrant in tile.quadrants():
+                    if (
+                        LocationUtils.distance_to_box(latitude, longitude, quadrant)
+                        <= radius
+                    ):
+                        task_group.create_task(_scan_tile(quadrant))
+
+        try:
+            await _scan_tile(
+                LocationUtils.get_bounding_box(latitude, longitude, radius)
+            )
+        except ExceptionGroup as err:
+            # Raise the first request error (like every other method does), rather
+            # than a group of them nested by tile:
+            raise _get_first_request_error(err) from None
+
+        return self._filter_by_distance(devices.values(), latitude, longitude, radius)
+
+    @staticmethod
+    def _filter_by_distance(
+        devices: Iterable[dict[str, Any]],
+        latitude: float,
+        longitude: float,
+        radius: float,
+    ) -> list[dict[str, Any]]:
+        """Get the devices within a radius, ordered by distance.
+
+        Args:
+        ----
+            devices: Device dicts.
+            latitude: Latitude of center.
+            longitude: Longitude of center.
+            radius: Radius (in miles).
+
+        Returns:
+        -------
+            A list of device dicts.
+
+        """
+        distances: list[tuple[float, dict[str, Any]]] = []
+        for device in devices:
+            if (location := LocationUtils.get_device_location(device)) is None:
+                continue
+            distance = LocationUtils.distance(latitude, longitude, *location)
+            if distance <= radius:
+                distances.append((distance, device))
+
+        distances.sort(key=itemgetter(0))
+        return [device for _, device in distances]
 
     async def get_device_details(self, mac_address: str) -> dict[str, Any]:
         """Get details of a device by MAC address.
@@ -0,0 +1,157 @@
+"""Define a token bucket rate limiter shared across API objects."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from weakref import WeakValueDictionary
+
+from .const import LOGGER
+
+# Ambient caps requests at one per second per API key:
+# https://ambientweather.docs.apiary.io/#introduction/rate-limiting
+DEFAULT_RATE_LIMIT = 1.0
+DEFAULT_RATE_LIMIT_BURST = 1
+
+# Limiters are dropped once nothing uses them:
+_RATE_LIMITERS: WeakValueDictionary[str, RateLimiter] = WeakValueDictionary()
+
+
+class RateLimiter:
+    """Define a token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second, up to `burst` tokens. A request
+    that finds a token available proceeds immediately; otherwise, it reserves the next
+    token and sleeps until that token has been refilled. Because reservations are made
+    in call order, concurrent waiters are released in FIFO order.
+
+    A cancelled waiter only hands its token back if nobody has reserved a token after
+    it (otherwise, later waiters are already scheduled around its reservation, and
+    handing it back would let two requests go out at once).
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            rate: The number of requests allowed per second.
+            burst: The maximum number of requests that may be made back-to-back.
+
+        Raises:
+        ------
+            ValueError: Raised when the rate or burst is invalid.
+
+        """
+        if rate <= 0:
+            msg = f"Rate must be greater than 0 (got {rate})"
+            raise ValueError(msg)
+        if burst < 1:
+            msg = f"Burst must be at least 1 (got {burst})"
+            raise ValueError(msg)
+
+        self._burst = burst
+        self._rate = rate
+        self._reservations = 0
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    @property
+    def burst(self) -> int:
+        """Return the maximum number of back-to-back requests.
+
+        Returns
+        -------
+            The burst size.
+
+        """
+        return self._burst
+
+    @property
+    def rate(self) -> float:
+        """Return the number of requests allowed per second.
+
+        Returns
+        -------
+            The refill rate.
+
+        """
+        return self._rate
+
+    def _refill(self) -> None:
+        """Add the tokens that have accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self._burst), self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made.
+
+        Raises
+        ------
+            CancelledError: Raised when the wait is cancelled.
+
+        """
+        self._refill()
+        self._tokens -= 1
+        self._reservations += 1
+
+        if self._tokens >= 0:
+            return
+
+        reservation = self._reservations
+        try:
+            await asyncio.sleep(-self._tokens / self._rate)
+        except asyncio.CancelledError:
+            # If this is the latest reservation, hand its token back so that later
+            # callers aren't penalized:
+            if reservation == self._reservations:
+                self._tokens += 1
+                self._reservations -= 1
+            raise
+
+
+def get_rate_limiter(
+    key: str,
+    *,
+    rate: float = DEFAULT_RATE_LIMIT,
+    burst: int = DEFAULT_RATE_LIMIT_BURST,
+) -> RateLimiter:
+    """Get the rate limiter shared by everything that uses a particular key.
+
+    The first caller for a key determines its rate and burst; subsequent callers
+    receive the existing limiter (and a warning is logged if they ask for a different
+    rate or burst). Once nothing uses a key's limiter, it is dropped.
+
+    Args:
+    ----
+        key: The key (e.g., an API key) that the rate limit applies to.
+        rate: The number of requests allowed per second.
+        burst: The maximum number of requests that may be made back-to-back.
+
+    Returns:
+    -------
+        A RateLimiter.
+
+    """
+    if (limiter := _RATE_LIMITERS.get(key)) is None:
+        limiter = _RATE_LIMITERS[key] = RateLimiter(rate=rate, burst=burst)
+    elif (limiter.rate, limiter.burst) != (rate, burst):
+        LOGGER.warning(
+            (
+                "A rate limiter already exists for this key (rate: %s, burst: %s); "
+                "ignoring the requested rate (%s) and burst (%s)"
+            ),
+            limiter.rate,
+            limiter.burst,
+            rate,
+            burst,
+        )
+    return limiter
@@ -0,0 +1,95 @@
+"""Define a policy for backing off between reconnect attempts."""
+
+from __future__ import annotations
+
+import random
+
+DEFAULT_RECONNECT_INITIAL_DELAY = 1.0
+DEFAULT_RECONNECT_MAX_DELAY = 300.0
+DEFAULT_RECONNECT_MULTIPLIER = 2.0
+
+
+class ReconnectPolicy:
+    """Define capped exponential backoff (with jitter) between reconnect attempts.
+
+    The delay before attempt `n` (counting from zero) is `initial_delay * multiplier**n`
+    seconds, capped at `max_delay`. With jitter, the actual delay is drawn uniformly
+    between zero and that value, so that many clients disconnected by the same outage
+    don't all reconnect at the same moment.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_delay: float = DEFAULT_RECONNECT_INITIAL_DELAY,
+        jitter: bool = True,
+        max_attempts: int | None = None,
+        max_delay: float = DEFAULT_RECONNECT_MAX_DELAY,
+        multiplier: float = DEFAULT_RECONNECT_MULTIPLIER,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            initial_delay: The number of seconds to wait before the first attempt.
+            jitter: Whether to randomize each delay.
+            max_attempts: The maximum number of attempts (or None to retry forever).
+            max_delay: The maximum number of seconds to wait between attempts.
+            multiplier: The factor by which the delay grows after each attempt.
+
+        Raises:
+        ------
+            ValueError: Raised when any of the values is invalid.
+
+        """
+        if initial_delay < 0 or max_delay < initial_delay:
+            msg = f"Invalid delays: {initial_delay} (initial), {max_delay} (max)"
+            raise ValueError(msg)
+        if max_attempts is not None and max_attempts < 1:
+            msg = f"Invalid maximum number of attempts: {max_attempts}"
+            raise ValueError(msg)
+        if multiplier < 1:
+            msg = f"Invalid multiplier: {multiplier}"
+            raise ValueError(msg)
+
+        self.initial_delay = initial_delay
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def get_delay(self, attempt: int) -> float:
+        """Get the number of seconds to wait before an attempt.
+
+        Args:
+        ----
+            attempt: The number of attempts already made.
+
+        Returns:
+        -------
+            The number of seconds.
+
+        """
+        try:
+            delay = min(self.max_delay, self.initial_delay * self.multiplier**attempt)
+        except OverflowError:
+            delay = self.max_delay
+
+        if self.jitter:
+            # This is for spreading out reconnects, not for anything cryptographic:
+            return random.uniform(0, delay)  # noqa: S311
+        return delay
+
+    def should_retry(self, attempt: int) -> bool:
+        """Get whether another attempt should be made.
+
+        Args:
+        ----
+            attempt: The number of attempts already made.
+
+        Returns:
+        -------
+            Whether to make another attempt.
+
+        """
+        return self.max_attempts is None or attempt < self.max_attempts
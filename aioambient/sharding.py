@@ -0,0 +1,379 @@
+"""Define an object to spread API keys across several websocket connections."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+import logging
+from typing import Any, NamedTuple
+
+from .const import DEFAULT_API_VERSION, LOGGER
+from .errors import WebsocketError
+from .event_stream import DEFAULT_STREAM_BUFFER_SIZE, EventStreams
+from .reconnect import ReconnectPolicy
+from .websocket import ConnectionState, DataEvent, SubscribedEvent, Websocket
+
+DEFAULT_SHARD_COUNT = 4
+DEFAULT_SHARD_RECONNECT_ATTEMPTS = 5
+
+
+class ShardHealth(NamedTuple):
+    """Define the health of a single websocket connection in a sharded websocket."""
+
+    shard: int
+    alive: bool
+    state: ConnectionState
+    api_keys: list[str]
+    messages: int
+    # None if the shard hasn't received any data yet:
+    seconds_since_data: float | None
+
+
+class ShardedWebsocket:
+    """Define a websocket manager that spreads API keys across several connections.
+
+    API keys are divided evenly between `shard_count` connections (each of which is
+    a `Websocket`). A shard that can't connect (or that gives up reconnecting after
+    its connection drops, per its reconnect policy) is considered dead, and its API
+    keys are moved to the live shards with the fewest API keys. Data and subscribed
+    events from every shard are merged into a single set of handlers (and a single
+    stream).
+    """
+
+    def __init__(
+        self,
+        application_key: str,
+        api_keys: list[str],
+        *,
+        api_version: int = DEFAULT_API_VERSION,
+        logger: logging.Logger = LOGGER,
+        reconnect_policy: ReconnectPolicy | None = None,
+        shard_count: int = DEFAULT_SHARD_COUNT,
+    ) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            application_key: An Ambient Weather application key.
+            api_keys: The Ambient Weather API keys to subscribe to.
+            api_version: The version of the API to query.
+            logger: The logger to use.
+            reconnect_policy: How each shard backs off between reconnect attempts
+                (by default, a shard gives up after 5 attempts).
+            shard_count: The number of websocket connections to open.
+
+        Raises:
+        ------
+            ValueError: Raised when the number of shards is invalid.
+
+        """
+        if shard_count < 1:
+            msg = f"Invalid number of shards: {shard_count}"
+            raise ValueError(msg)
+
+        api_keys = list(dict.fromkeys(api_keys))
+        shard_count = max(1, min(shard_count, len(api_keys)))
+
+        self._async_user_data_handler: (
+            Callable[[dict[str, Any]], Awaitable[None]] | None
+        ) = None
+        self._async_user_subscribed_handler: (
+            Callable[[dict[str, Any]], Awaitable[None]] | None
+        ) = None
+        self._dead_shards: set[int] = set()
+        self._event_streams: EventStreams[DataEvent | SubscribedEvent] = EventStreams()
+        self._last_data: list[float | None] = [None] * shard_count
+        self._logger = logger
+        self._messages = [0] * shard_count
+        self._rebalance_lock = asyncio.Lock()
+        self._user_data_handler: Callable[[dict[str, Any]], None] | None = None
+        self._user_subscribed_handler: Callable[[dict[str, Any]], None] | None = None
+
+        if reconnect_policy is None:
+            reconnect_policy = ReconnectPolicy(
+                max_attempts=DEFAULT_SHARD_RECONNECT_ATTEMPTS
+            )
+
+        self._shards: list[Websocket] = []
+        for index in range(shard_count):
+            shard = Websocket(
+                application_key,
+                api_keys[index::shard_count],
+                api_version=api_version,
+                logger=logger,
+                reconnect_policy=reconnect_policy,
+            )
+            shard.async_on_data(partial(self._on_shard_data, index))
+            shard.async_on_state_change(partial(self._on_shard_state_change, index))
+            shard.async_on_subscribed(self._on_shard_subscribed)
+            self._shards.append(shard)
+
+    @property
+    def health(self) -> list[ShardHealth]:
+        """Return the health of each shard.
+
+        Returns
+        -------
+            A list of ShardHealth objects.
+
+        """
+        now = asyncio.get_running_loop().time()
+        return [
+            ShardHealth(
+                index,
+                index not in self._dead_shards,
+                shard.state,
+                shard.subscriptions,
+                self._messages[index],
+                None if last_data is None else now - last_data,
+            )
+            for index, (shard, last_data) in enumerate(
+                zip(self._shards, self._last_data, strict=True)
+            )
+        ]
+
+    @property
+    def subscriptions(self) -> list[str]:
+        """Return the API keys that are subscribed to (across every shard).
+
+        Returns
+        -------
+            A list of API keys.
+
+        """
+        return [key for shard in self._shards for key in shard.subscriptions]
+
+    def _get_live_shards(self) -> list[Websocket]:
+        """Get the shards that haven't died.
+
+        Returns
+        -------
+            A list of Websocket objects.
+
+        """
+        return [
+            shard
+            for index, shard in enumerate(self._shards)
+            if index not in self._dead_shards
+        ]
+
+    async def _on_shard_data(self, index: int, data: dict[str, Any]) -> None:
+        """Act on data from a shard.
+
+        Args:
+        ----
+            index: The index of the shard.
+            data: The websocket data received.
+
+        """
+        self._messages[index] += 1
+        self._last_data[index] = asyncio.get_running_loop().time()
+
+        if self._async_user_data_handler:
+            await self._async_user_data_handler(data)
+        elif self._user_data_handler:
+            self._user_data_handler(data)
+
+        if self._event_streams:
+            await self._event_streams.put(DataEvent(data))
+
+    async def _on_shard_state_change(self, index: int, state: ConnectionState) -> None:
+        """Act on a shard's connection state changing.
+
+        Args:
+        ----
+            index: The index of the shard.
+            state: The new state.
+
+        """
+        self._logger.debug("Shard %s is %s", index, state)
+        if state is ConnectionState.FAILED:
+            await self._rebalance(index)
+
+    async def _on_shard_subscribed(self, data: dict[str, Any]) -> None:
+        """Act on a shard subscribing.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        if self._async_user_subscribed_handler:
+            await self._async_user_subscribed_handler(data)
+        elif self._user_subscribed_handler:
+            self._user_subscribed_handler(data)
+
+        if self._event_streams:
+            await self._event_streams.put(SubscribedEvent(data))
+
+    async def _rebalance(self, index: int) -> None:
+        """Move a dead shard's API keys to the live shards.
+
+        Args:
+        ----
+            index: The index of the shard that has died.
+
+        """
+        async with self._rebalance_lock:
+            self._dead_shards.add(index)
+            dead_shard = self._shards[index]
+            if not (api_keys := dead_shard.subscriptions):
+                return
+
+            await dead_shard.unsubscribe(api_keys)
+
+            if not (live_shards := self._get_live_shards()):
+                self._logger.error(
+                    "No live shards left to take over %s API keys", len(api_keys)
+                )
+                return
+
+            self._logger.warning(
+                "Moving %s API keys to %s live shards", len(api_keys), len(live_shards)
+            )
+            for api_key in api_keys:
+                await self._subscribe_one(api_key, live_shards)
+
+    async def _subscribe_one(self, api_key: str, shards: list[Websocket]) -> None:
+        """Subscribe to an API key on the shard with the fewest API keys.
+
+        Args:
+        ----
+            api_key: An Ambient Weather API key.
+            shards: The shards to choose from.
+
+        """
+        shard = min(shards, key=lambda shard: len(shard.subscriptions))
+        await shard.subscribe(api_key)
+
+    def async_on_data(
+        self, target: Callable[[dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """Define a coroutine to be called when receiving data from any shard.
+
+        Args:
+        ----
+            target: The coroutine function to call when receiving websocket data.
+
+        """
+        self._async_user_data_handler = target
+        self._user_data_handler = None
+
+    def on_data(self, target: Callable[[dict[str, Any]], None]) -> None:
+        """Define a method to be called when receiving data from any shard.
+
+        Args:
+        ----
+            target: The function to call when receiving websocket data.
+
+        """
+        self._async_user_data_handler = None
+        self._user_data_handler = target
+
+    def async_on_subscribed(
+        self, target: Callable[[dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """Define a coroutine to be called when any shard is subscribed.
+
+        Args:
+        ----
+            target: The coroutine function to call when receiving websocket data.
+
+        """
+        self._async_user_subscribed_handler = target
+        self._user_subscribed_handler = None
+
+    def on_subscribed(self, target: Callable[[dict[str, Any]], None]) -> None:
+        """Define a method to be called when any shard is subscribed.
+
+        Args:
+        ----
+            target: The function to call when receiving websocket data.
+
+        """
+        self._async_user_subscribed_handler = None
+        self._user_subscribed_handler = target
+
+    async def connect(self) -> None:
+        """Connect every shard.
+
+        Shards that can't connect are considered dead (and their API keys are moved
+        to the others). Dead shards aren't revived.
+
+        Raises
+        ------
+            WebsocketError: Raised when no shard can connect.
+
+        """
+        results = await asyncio.gather(
+            *(shard.connect() for shard in self._shards), return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(self._shards):
+            msg = f"No shard could connect: {errors[0]}"
+            raise WebsocketError(msg)
+
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                self._logger.warning("Shard %s failed to connect: %s", index, result)
+                await self._rebalance(index)
+
+    async def disconnect(self) -> None:
+        """Disconnect every shard (ending any streams)."""
+        await asyncio.gather(*(shard.disconnect() for shard in self._shards))
+        self._event_streams.close()
+
+    def stream(
+        self, *, buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE
+    ) -> AsyncIterator[DataEvent | SubscribedEvent]:
+        """Stream data and subscribed events from every shard.
+
+        As with `Websocket.stream()`, a full buffer makes the shards wait for the
+        stream to catch up; the stream ends once `disconnect()` is called.
+
+        Args:
+        ----
+            buffer_size: The maximum number of events to buffer.
+
+        Returns:
+        -------
+            An async iterator of websocket events.
+
+        """
+        return self._event_streams.stream(buffer_size=buffer_size)
+
+    async def subscribe(self, api_key: str | list[str]) -> None:
+        """Subscribe to one or more API keys (on the live shards with the fewest).
+
+        Args:
+        ----
+            api_key: One or more Ambient Weather API keys.
+
+        Raises:
+        ------
+            WebsocketError: Raised when there are no live shards.
+
+        """
+        if isinstance(api_key, str):
+            api_key = [api_key]
+
+        if not (live_shards := self._get_live_shards()):
+            msg = "There are no live shards to subscribe with"
+            raise WebsocketError(msg)
+
+        subscriptions = set(self.subscriptions)
+        for key in dict.fromkeys(api_key):
+            if key not in subscriptions:
+                await self._subscribe_one(key, live_shards)
+
+    async def unsubscribe(self, api_key: str | list[str]) -> None:
+        """Unsubscribe from one or more API keys.
+
+        Args:
+        ----
+            api_key: One or more Ambient Weather API keys.
+
+        """
+        await asyncio.gather(*(shard.unsubscribe(api_key) for shard in self._shards))
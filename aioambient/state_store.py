@@ -0,0 +1,237 @@
+"""Define an in-memory store of the latest state of each station."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+import logging
+from typing import Any
+
+from .api import API
+from .const import LOGGER
+from .util import get_public_device_id_cached
+
+
+class StationStateStore:
+    """Define an in-memory store of the latest data (and info) from each station.
+
+    The store is seeded from `API.get_devices()` and kept up to date by a `Websocket`,
+    so that reads never touch the network. Data that isn't newer than what is already
+    stored for a station (by `dateutc`) is ignored. The store keeps its own copies of
+    the dicts it is given, and reads return copies.
+    """
+
+    def __init__(self, *, logger: logging.Logger = LOGGER) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            logger: The logger to use.
+
+        """
+        self._info: dict[str, dict[str, Any]] = {}
+        self._last_data: dict[str, dict[str, Any]] = {}
+        self._listeners: list[Callable[[str, dict[str, Any]], None]] = []
+        self._logger = logger
+        self._mac_addresses: dict[str, str] = {}
+
+    def __contains__(self, mac_address: object) -> bool:
+        """Return whether the store holds data from a station.
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        Returns:
+        -------
+            Whether the station is in the store.
+
+        """
+        return mac_address in self._last_data
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the MAC addresses of the stations in the store.
+
+        Returns
+        -------
+            An iterator of MAC addresses.
+
+        """
+        return iter(self._last_data)
+
+    def __len__(self) -> int:
+        """Return the number of stations in the store.
+
+        Returns
+        -------
+            The number of stations.
+
+        """
+        return len(self._last_data)
+
+    def get(self, mac_address: str) -> dict[str, Any] | None:
+        """Get the latest data from a station.
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        Returns:
+        -------
+            A data dict, or None if the station isn't in the store.
+
+        """
+        if (data := self._last_data.get(mac_address)) is None:
+            return None
+        return dict(data)
+
+    def get_by_public_id(self, public_id: str) -> dict[str, Any] | None:
+        """Get the latest data from a station by its public device ID.
+
+        Args:
+        ----
+            public_id: The public device ID of the station.
+
+        Returns:
+        -------
+            A data dict, or None if the station isn't in the store.
+
+        """
+        if (mac_address := self._mac_addresses.get(public_id)) is None:
+            return None
+        return self.get(mac_address)
+
+    def get_info(self, mac_address: str) -> dict[str, Any] | None:
+        """Get the info of a station (as returned by `API.get_devices()`).
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        Returns:
+        -------
+            An info dict, or None if the station's info isn't known.
+
+        """
+        if (info := self._info.get(mac_address)) is None:
+            return None
+        return dict(info)
+
+    def get_info_by_public_id(self, public_id: str) -> dict[str, Any] | None:
+        """Get the info of a station by its public device ID.
+
+        Args:
+        ----
+            public_id: The public device ID of the station.
+
+        Returns:
+        -------
+            An info dict, or None if the station's info isn't known.
+
+        """
+        if (mac_address := self._mac_addresses.get(public_id)) is None:
+            return None
+        return self.get_info(mac_address)
+
+    def _index(self, mac_address: str) -> None:
+        """Index a station by its public device ID.
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        """
+        self._mac_addresses[get_public_device_id_cached(mac_address)] = mac_address
+
+    def seed(self, devices: Iterable[dict[str, Any]]) -> None:
+        """Seed the store with devices (as returned by `API.get_devices()`).
+
+        Args:
+        ----
+            devices: Device dicts.
+
+        """
+        for device in devices:
+            mac_address = device["macAddress"]
+            self._index(mac_address)
+            if (info := device.get("info")) is not None:
+                self._info[mac_address] = dict(info)
+            if (last_data := device.get("lastData")) is not None:
+                self.update({**last_data, "macAddress": mac_address})
+
+    async def seed_from_api(self, api: API) -> None:
+        """Seed the store from the REST API.
+
+        Args:
+        ----
+            api: The API object to fetch devices with.
+
+        """
+        self.seed(await api.get_devices())
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Get a copy of the latest data from every station.
+
+        Returns
+        -------
+            A dict of data dicts by MAC address.
+
+        """
+        return {
+            mac_address: dict(data) for mac_address, data in self._last_data.items()
+        }
+
+    def subscribe(
+        self, listener: Callable[[str, dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Subscribe to changes in the store.
+
+        Listeners are called (with a station's MAC address and its latest data)
+        whenever a station's data changes; since they are called from the websocket's
+        receive path, they should return quickly.
+
+        Args:
+        ----
+            listener: The function to call.
+
+        Returns:
+        -------
+            A function that unsubscribes the listener.
+
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            """Unsubscribe the listener."""
+            self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def update(self, data: dict[str, Any]) -> bool:
+        """Update the store with data from a station.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        Returns:
+        -------
+            Whether the store changed.
+
+        """
+        if not isinstance(mac_address := data.get("macAddress"), str):
+            return False
+
+        if (last_data := self._last_data.get(mac_address)) is None:
+            self._index(mac_address)
+        elif data.get("dateutc", 0) <= last_data.get("dateutc", 0):
+            return False
+
+        self._last_data[mac_address] = dict(data)
+
+        for listener in list(self._listeners):
+            try:
+                listener(mac_address, data)
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("Error while notifying a state store listener")
+
+        return True
@@ -1,6 +1,20 @@
 """Define package utilities."""
 
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
 from hashlib import md5
+from typing import NamedTuple
+
+PUBLIC_DEVICE_ID_CACHE_SIZE = 4096
+
+
+class PublicDeviceIdIndex(NamedTuple):
+    """Define a two-way mapping of MAC addresses and public device IDs."""
+
+    public_ids: dict[str, str]
+    mac_addresses: dict[str, str]
 
 
 def get_public_device_id(mac_address: str) -> str:
@@ -19,3 +33,46 @@ def get_public_device_id(mac_address: str) -> str:
     for _ in range(2):
         public_id = md5(public_id.encode("utf-8"), usedforsecurity=False).hexdigest()
     return public_id
+
+
+@lru_cache(maxsize=PUBLIC_DEVICE_ID_CACHE_SIZE)
+def get_public_device_id_cached(mac_address: str) -> str:
+    """Get the public device ID of a device, remembering recently used ones.
+
+    This is a drop-in replacement for `get_public_device_id` for callers that look up
+    the same devices over and over (e.g., for every incoming message); the most
+    recently used IDs are held in a bounded LRU cache.
+
+    Args:
+    ----
+        mac_address: The MAC address of the device.
+
+    Returns:
+    -------
+        The public-facing device ID.
+
+    """
+    return get_public_device_id(mac_address)
+
+
+def get_public_device_ids(mac_addresses: Iterable[str]) -> PublicDeviceIdIndex:
+    """Get the public device IDs of many devices (and a reverse index of them).
+
+    Args:
+    ----
+        mac_addresses: The MAC addresses of the devices.
+
+    Returns:
+    -------
+        A PublicDeviceIdIndex that maps each MAC address to its public ID and each
+        public ID back to its MAC address.
+
+    """
+    public_ids = {
+        mac_address: get_public_device_id_cached(mac_address)
+        for mac_address in mac_addresses
+    }
+    return PublicDeviceIdIndex(
+        public_ids,
+        {public_id: mac_address for mac_address, public_id in public_ids.items()},
+    )
@@ -2,12 +2,48 @@
 
 from __future__ import annotations
 
-from math import log, sqrt
-from typing import cast
+from collections.abc import Callable, Sequence
+from math import log, nan, sqrt
+from typing import Any, cast
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
 
 MAGNUS_A = 17.27
 MAGNUS_B = 237.7
 
+# A sequence of floats (with None for missing values) or a NumPy array:
+FloatArrayLikeT = Sequence[float | None] | Any
+# A list of floats (with NaN for missing values) or a NumPy array:
+FloatArrayT = list[float] | Any
+# A NumPy array (NumPy is optional, so its types aren't used):
+NDArrayT = Any
+
+
+def _apply_where(
+    func: Callable[[float], float], values: NDArrayT, mask: NDArrayT
+) -> NDArrayT:
+    """Apply a scalar function to the masked elements of a NumPy array.
+
+    Args:
+    ----
+        func: The function.
+        values: The NumPy array.
+        mask: A boolean NumPy array of the elements to apply the function to.
+
+    Returns:
+    -------
+        A NumPy array of the results, with NaN where the mask is False.
+
+    """
+    results = np.full(values.shape, np.nan)
+    results[mask] = [func(value) for value in values[mask].tolist()]
+    return results
+
 
 class ClimateUtils:
     """Climate utility functions."""
@@ -232,3 +268,144 @@ class ClimateUtils:
                 ),
             )
         )
+
+    @staticmethod
+    def dew_point_fahrenheit_batch(
+        temps_fahrenheit: FloatArrayLikeT,
+        humidities: FloatArrayLikeT,
+    ) -> FloatArrayT:
+        """Calculate the dew point in Fahrenheit for many readings at once.
+
+        Missing values (None or NaN) and humidities of zero or below yield NaN. If
+        NumPy is installed, the inputs may be sequences or NumPy arrays and a NumPy
+        array is returned; the results are identical to those of
+        `dew_point_fahrenheit()`. Otherwise, `dew_point_fahrenheit()` is applied to each
+        reading and a list is returned.
+
+        Args:
+        ----
+            temps_fahrenheit: Temperatures measured in Fahrenheit.
+            humidities: Relative humidities measured in percent.
+
+        Returns:
+        -------
+            Calculated dew points measured in Fahrenheit.
+
+        """
+        if not HAS_NUMPY:
+            return [
+                nan
+                if temp is None or humidity is None or humidity <= 0
+                else cast(float, ClimateUtils.dew_point_fahrenheit(temp, humidity))
+                for temp, humidity in zip(temps_fahrenheit, humidities, strict=True)
+            ]
+
+        temp = np.asarray(temps_fahrenheit, dtype=np.float64)
+        humidity = np.minimum(np.asarray(humidities, dtype=np.float64), 100)
+
+        # Mirror the scalar calculation step-by-step (taking the logarithm with
+        # `math`, since NumPy's vectorized one can differ in the last bit); a
+        # humidity of zero or below leaves the logarithm (and the dew point) NaN:
+        temp_celsius = (temp - 32.0) * 5.0 / 9.0
+        log_humidity = _apply_where(log, humidity / 100.0, humidity > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g = MAGNUS_A * temp_celsius / (MAGNUS_B + temp_celsius) + log_humidity
+            dew_point_celsius = MAGNUS_B * g / (MAGNUS_A - g)
+        return dew_point_celsius * 9.0 / 5.0 + 32.0
+
+    @staticmethod
+    def feels_like_fahrenheit_batch(
+        temps_fahrenheit: FloatArrayLikeT,
+        humidities: FloatArrayLikeT,
+        wind_speeds_mph: FloatArrayLikeT,
+    ) -> FloatArrayT:
+        """Calculate the feels like temperature in Fahrenheit for many readings.
+
+        Missing values (None or NaN) yield NaN. If NumPy is installed, the inputs may
+        be sequences or NumPy arrays and a NumPy array is returned; the wind chill
+        and heat index rules are applied with masks, and the results are identical to
+        those of `feels_like_fahrenheit()`. Otherwise, `feels_like_fahrenheit()` is
+        applied to each reading and a list is returned.
+
+        Args:
+        ----
+            temps_fahrenheit: Temperatures measured in Fahrenheit.
+            humidities: Relative humidities measured in percent.
+            wind_speeds_mph: Wind speeds measured in miles per hour.
+
+        Returns:
+        -------
+            Calculated feels like temperatures measured in Fahrenheit.
+
+        """
+        if not HAS_NUMPY:
+            return [
+                nan if feels_like is None else feels_like
+                for feels_like in (
+                    ClimateUtils.feels_like_fahrenheit(temp, humidity, wind_speed)
+                    for temp, humidity, wind_speed in zip(
+                        temps_fahrenheit, humidities, wind_speeds_mph, strict=True
+                    )
+                )
+            ]
+
+        temp = np.asarray(temps_fahrenheit, dtype=np.float64)
+        humidity = np.asarray(humidities, dtype=np.float64)
+        wind_speed = np.asarray(wind_speeds_mph, dtype=np.float64)
+
+        wind_chill_mask = (temp < 50) & (wind_speed > 3)
+        heat_index_mask = ~wind_chill_mask & (temp > 68)
+
+        # Raise the wind speeds to a power with Python floats, since NumPy's
+        # vectorized power function can differ in the last bit (and only where the
+        # wind chill applies, so other wind speeds can't raise warnings):
+        wind_speed_factor = _apply_where(
+            lambda speed: speed**0.16, wind_speed, wind_chill_mask
+        )
+        wind_chill = (
+            35.74
+            + 0.6215 * temp
+            - 35.75 * wind_speed_factor
+            + 0.4275 * temp * wind_speed_factor
+        )
+
+        heat_index = 0.5 * (temp + 61 + (temp - 68) * 1.2 + humidity * 0.094)
+        heat_index_base = (
+            -42.379
+            + 2.04901523 * temp
+            + 10.14333127 * humidity
+            + -0.22475541 * temp * humidity
+            + -0.00683783 * temp * temp
+            + -0.05481717 * humidity * humidity
+            + 0.00122874 * temp * temp * humidity
+            + 0.00085282 * temp * humidity * humidity
+            + -0.00000199 * temp * temp * humidity * humidity
+        )
+        with np.errstate(invalid="ignore"):
+            low_humidity_adjusted = heat_index_base - (13 - humidity) / 4 * np.sqrt(
+                (17 - (np.abs(temp - 95))) / 17
+            )
+        high_humidity_adjusted = heat_index_base + (humidity - 85) / 10 * (
+            (87 - temp) / 5
+        )
+        heat_index = np.where(
+            temp < 80,
+            heat_index,
+            np.select(
+                [
+                    (humidity < 13) & (temp <= 112),
+                    (humidity > 85) & (temp <= 87),
+                ],
+                [low_humidity_adjusted, high_humidity_adjusted],
+                heat_index_base,
+            ),
+        )
+
+        result = np.select(
+            [wind_chill_mask, heat_index_mask], [wind_chill, heat_index], temp
+        )
+
+        # Mirror the scalar methods, which return None if any input is missing:
+        return np.where(
+            np.isnan(temp) | np.isnan(humidity) | np.isnan(wind_speed), np.nan, result
+        )
@@ -2,14 +2,369 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 import math
+from typing import Any, NamedTuple
+
+from .climate_utils import FloatArrayLikeT, FloatArrayT
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
 
 EARTH_RADIUS = 3959.0
 
 
-class LocationUtils:  # pylint: disable=too-few-public-methods
+def _broadcast(*values: float | FloatArrayLikeT) -> list[Sequence[Any]]:
+    """Broadcast scalars and sequences to sequences of the same length.
+
+    Args:
+    ----
+        *values: Scalars or sequences (all sequences must have the same length).
+
+    Returns:
+    -------
+        A list of sequences.
+
+    Raises:
+    ------
+        ValueError: Raised when the sequences have different lengths.
+
+    """
+    lengths = {len(value) for value in values if not isinstance(value, int | float)}
+    if len(lengths) > 1:
+        msg = f"Sequences have different lengths: {sorted(lengths)}"
+        raise ValueError(msg)
+    length = lengths.pop() if lengths else 1
+    return [
+        [value] * length if isinstance(value, int | float) else value
+        for value in values
+    ]
+
+
+class BoundingBox(NamedTuple):
+    """Define a latitude/longitude bounding box (in degrees)."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def quadrants(self) -> tuple[BoundingBox, ...]:
+        """Split the box into four equal quadrants.
+
+        Returns
+        -------
+            A tuple of BoundingBoxes.
+
+        """
+        middle_latitude = (self.south + self.north) / 2
+        middle_longitude = (self.west + self.east) / 2
+        return (
+            BoundingBox(self.south, self.west, middle_latitude, middle_longitude),
+            BoundingBox(self.south, middle_longitude, middle_latitude, self.east),
+            BoundingBox(middle_latitude, self.west, self.north, middle_longitude),
+            BoundingBox(middle_latitude, middle_longitude, self.north, self.east),
+        )
+
+
+class LocationUtils:
     """Location utility functions."""
 
+    @staticmethod
+    def distance(
+        latitude1: float, longitude1: float, latitude2: float, longitude2: float
+    ) -> float:
+        """Calculate the great-circle (haversine) distance between two locations.
+
+        Args:
+        ----
+            latitude1: Latitude of the first location (in degrees).
+            longitude1: Longitude of the first location (in degrees).
+            latitude2: Latitude of the second location (in degrees).
+            longitude2: Longitude of the second location (in degrees).
+
+        Returns:
+        -------
+            The distance (in miles).
+
+        """
+        latitude1_rad = math.radians(latitude1)
+        latitude2_rad = math.radians(latitude2)
+        latitude_delta = latitude2_rad - latitude1_rad
+        longitude_delta = math.radians(longitude2 - longitude1)
+
+        haversine = (
+            math.sin(latitude_delta / 2) ** 2
+            + math.cos(latitude1_rad)
+            * math.cos(latitude2_rad)
+            * math.sin(longitude_delta / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(haversine)))
+
+    @staticmethod
+    def bearing(
+        latitude1: float, longitude1: float, latitude2: float, longitude2: float
+    ) -> float:
+        """Calculate the initial great-circle bearing from one location to another.
+
+        Args:
+        ----
+            latitude1: Latitude of the first location (in degrees).
+            longitude1: Longitude of the first location (in degrees).
+            latitude2: Latitude of the second location (in degrees).
+            longitude2: Longitude of the second location (in degrees).
+
+        Returns:
+        -------
+            The bearing (in degrees clockwise from north, from 0 to 360).
+
+        """
+        latitude1_rad = math.radians(latitude1)
+        latitude2_rad = math.radians(latitude2)
+        longitude_delta = math.radians(longitude2 - longitude1)
+
+        y = math.sin(longitude_delta) * math.cos(latitude2_rad)
+        x = math.cos(latitude1_rad) * math.sin(latitude2_rad) - math.sin(
+            latitude1_rad
+        ) * math.cos(latitude2_rad) * math.cos(longitude_delta)
+        return math.degrees(math.atan2(y, x)) % 360
+
+    @staticmethod
+    def bearing_batch(
+        latitudes1: float | FloatArrayLikeT,
+        longitudes1: float | FloatArrayLikeT,
+        latitudes2: float | FloatArrayLikeT,
+        longitudes2: float | FloatArrayLikeT,
+    ) -> FloatArrayT:
+        """Calculate initial great-circle bearings for many pairs of locations.
+
+        Each argument may be a scalar (e.g., a single customer site) or an array (e.g.,
+        thousands of stations). If NumPy is installed, the arguments are broadcast
+        against each other (so a matrix of every site against every station can be
+        computed with `latitudes1[:, None]`) and a NumPy array is returned; the results
+        agree with `bearing()` to within floating-point rounding. Otherwise, `bearing()`
+        is applied to each pair and a list is returned.
+
+        Args:
+        ----
+            latitudes1: Latitudes of the first locations (in degrees).
+            longitudes1: Longitudes of the first locations (in degrees).
+            latitudes2: Latitudes of the second locations (in degrees).
+            longitudes2: Longitudes of the second locations (in degrees).
+
+        Returns:
+        -------
+            Bearings (in degrees clockwise from north, from 0 to 360).
+
+        """
+        if not HAS_NUMPY:
+            return [
+                LocationUtils.bearing(*pair)
+                for pair in zip(
+                    *_broadcast(latitudes1, longitudes1, latitudes2, longitudes2),
+                    strict=True,
+                )
+            ]
+
+        latitude1_rad = np.radians(np.asarray(latitudes1, dtype=np.float64))
+        latitude2_rad = np.radians(np.asarray(latitudes2, dtype=np.float64))
+        longitude_delta = np.radians(
+            np.asarray(longitudes2, dtype=np.float64)
+            - np.asarray(longitudes1, dtype=np.float64)
+        )
+
+        y = np.sin(longitude_delta) * np.cos(latitude2_rad)
+        x = np.cos(latitude1_rad) * np.sin(latitude2_rad) - np.sin(
+            latitude1_rad
+        ) * np.cos(latitude2_rad) * np.cos(longitude_delta)
+        return np.degrees(np.arctan2(y, x)) % 360
+
+    @staticmethod
+    def distance_batch(
+        latitudes1: float | FloatArrayLikeT,
+        longitudes1: float | FloatArrayLikeT,
+        latitudes2: float | FloatArrayLikeT,
+        longitudes2: float | FloatArrayLikeT,
+    ) -> FloatArrayT:
+        """Calculate haversine distances for many pairs of locations.
+
+        Each argument may be a scalar or an array; see `bearing_batch()` for how they
+        are combined. The results agree with `distance()` to within floating-point
+        rounding (or exactly, without NumPy).
+
+        Args:
+        ----
+            latitudes1: Latitudes of the first locations (in degrees).
+            longitudes1: Longitudes of the first locations (in degrees).
+            latitudes2: Latitudes of the second locations (in degrees).
+            longitudes2: Longitudes of the second locations (in degrees).
+
+        Returns:
+        -------
+            Distances (in miles).
+
+        """
+        if not HAS_NUMPY:
+            return [
+                LocationUtils.distance(*pair)
+                for pair in zip(
+                    *_broadcast(latitudes1, longitudes1, latitudes2, longitudes2),
+                    strict=True,
+                )
+            ]
+
+        latitude1_rad = np.radians(np.asarray(latitudes1, dtype=np.float64))
+        latitude2_rad = np.radians(np.asarray(latitudes2, dtype=np.float64))
+        latitude_delta = latitude2_rad - latitude1_rad
+        longitude_delta = np.radians(
+            np.asarray(longitudes2, dtype=np.float64)
+            - np.asarray(longitudes1, dtype=np.float64)
+        )
+
+        haversine = (
+            np.sin(latitude_delta / 2) ** 2
+            + np.cos(latitude1_rad)
+            * np.cos(latitude2_rad)
+            * np.sin(longitude_delta / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS * np.arcsin(np.minimum(1.0, np.sqrt(haversine)))
+
+    @staticmethod
+    def distance_to_box(latitude: float, longitude: float, box: BoundingBox) -> float:
+        """Calculate the great-circle distance from a location to a bounding box.
+
+        The box's longitudes may run past the antimeridian (e.g., from 170 to 190) and
+        its latitudes past the poles (as with boxes from `get_bounding_box()`).
+
+        Args:
+        ----
+            latitude: Latitude of the location (in degrees).
+            longitude: Longitude of the location (in degrees).
+            box: The bounding box.
+
+        Returns:
+        -------
+            The distance (in miles) to the nearest point of the box (or 0 if the
+            location is within it).
+
+        """
+        south, north = max(box.south, -90.0), min(box.north, 90.0)
+        width = box.east - box.west
+
+        if (offset := (longitude - box.west) % 360) <= width:
+            # The nearest point is on the location's own meridian:
+            return LocationUtils.distance(
+                latitude, longitude, min(max(latitude, south), north), longitude
+            )
+
+        # Otherwise, it is on the nearer of the box's western and eastern edges (at
+        # whichever latitude along that edge is nearest):
+        longitude_delta = min(offset - width, 360 - offset)
+        nearest_latitude = math.degrees(
+            math.atan2(
+                math.sin(math.radians(latitude)),
+                math.cos(math.radians(latitude))
+                * math.cos(math.radians(longitude_delta)),
+            )
+        )
+        return min(
+            LocationUtils.distance(latitude, 0.0, edge_latitude, longitude_delta)
+            for edge_latitude in (
+                south,
+                north,
+                min(max(nearest_latitude, south), north),
+            )
+        )
+
+    @staticmethod
+    def get_bounding_box(
+        latitude: float, longitude: float, radius: float
+    ) -> BoundingBox:
+        """Calculate the bounding box of a circle.
+
+        Args:
+        ----
+            latitude: Latitude of center (in degrees).
+            longitude: Longitude of center (in degrees).
+            radius: Radius (in miles).
+
+        Returns:
+        -------
+            A BoundingBox.
+
+        """
+        south, west = LocationUtils.shift_location(
+            latitude, longitude, -radius, -radius
+        )
+        north, east = LocationUtils.shift_location(
+            latitude, longitude, +radius, +radius
+        )
+        return BoundingBox(south, west, north, east)
+
+    @staticmethod
+    def get_bounding_box_batch(
+        latitudes: float | FloatArrayLikeT,
+        longitudes: float | FloatArrayLikeT,
+        radii: float | FloatArrayLikeT,
+    ) -> tuple[FloatArrayT, FloatArrayT, FloatArrayT, FloatArrayT]:
+        """Calculate the bounding boxes of many circles.
+
+        Each argument may be a scalar or an array; see `bearing_batch()` for how they
+        are combined.
+
+        Args:
+        ----
+            latitudes: Latitudes of centers (in degrees).
+            longitudes: Longitudes of centers (in degrees).
+            radii: Radii (in miles).
+
+        Returns:
+        -------
+            A (souths, wests, norths, easts) tuple.
+
+        """
+        negative_radii: FloatArrayLikeT
+        if HAS_NUMPY:
+            radii = np.asarray(radii, dtype=np.float64)
+            negative_radii = -radii
+        else:
+            latitudes, longitudes, radius_list = _broadcast(
+                latitudes, longitudes, radii
+            )
+            radii = radius_list
+            negative_radii = [-radius for radius in radius_list]
+
+        souths, wests = LocationUtils.shift_location_batch(
+            latitudes, longitudes, negative_radii, negative_radii
+        )
+        norths, easts = LocationUtils.shift_location_batch(
+            latitudes, longitudes, radii, radii
+        )
+        return souths, wests, norths, easts
+
+    @staticmethod
+    def get_device_location(device: dict[str, Any]) -> tuple[float, float] | None:
+        """Get the (latitude, longitude) pair of a device from the open API.
+
+        Args:
+        ----
+            device: A device dict.
+
+        Returns:
+        -------
+            A (latitude, longitude) pair, or None if the device has no location.
+
+        """
+        try:
+            coords = device["info"]["coords"]["coords"]
+            return float(coords["lat"]), float(coords["lon"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
     @staticmethod
     def shift_location(
         latitude: float, longitude: float, latitude_delta: float, longitude_delta: float
@@ -53,3 +408,58 @@ class LocationUtils:  # pylint: disable=too-few-public-methods
         new_longitude = math.degrees(new_longitude_rad)
 
         return new_latitude, new_longitude
+
+    @staticmethod
+    def shift_location_batch(
+        latitudes: float | FloatArrayLikeT,
+        longitudes: float | FloatArrayLikeT,
+        latitude_deltas: float | FloatArrayLikeT,
+        longitude_deltas: float | FloatArrayLikeT,
+    ) -> tuple[FloatArrayT, FloatArrayT]:
+        """Shift many locations at once.
+
+        Each argument may be a scalar or an array; see `bearing_batch()` for how they
+        are combined. The results agree with `shift_location()` to within
+        floating-point rounding (or exactly, without NumPy).
+
+        Args:
+        ----
+            latitudes: Latitudes (in degrees).
+            longitudes: Longitudes (in degrees).
+            latitude_deltas: Latitude deltas (in miles).
+            longitude_deltas: Longitude deltas (in miles).
+
+        Returns:
+        -------
+            A (latitudes, longitudes) tuple.
+
+        """
+        if not HAS_NUMPY:
+            shifted = [
+                LocationUtils.shift_location(*location)
+                for location in zip(
+                    *_broadcast(
+                        latitudes, longitudes, latitude_deltas, longitude_deltas
+                    ),
+                    strict=True,
+                )
+            ]
+            return (
+                [latitude for latitude, _ in shifted],
+                [longitude for _, longitude in shifted],
+            )
+
+        latitude_rad = np.radians(np.asarray(latitudes, dtype=np.float64))
+        longitude_rad = np.radians(np.asarray(longitudes, dtype=np.float64))
+        angular_latitude_delta = (
+            np.asarray(latitude_deltas, dtype=np.float64) / EARTH_RADIUS
+        )
+        angular_longitude_delta = (
+            np.asarray(longitude_deltas, dtype=np.float64) / EARTH_RADIUS
+        )
+
+        new_latitude_rad = latitude_rad + angular_latitude_delta
+        new_longitude_rad = longitude_rad + angular_longitude_delta / np.cos(
+            latitude_rad
+        )
+        return np.degrees(new_latitude_rad), np.degrees(new_longitude_rad)
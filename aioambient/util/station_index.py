@@ -0,0 +1,413 @@
+"""Define an in-memory spatial index of weather stations."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import heapq
+import math
+from typing import Any, NamedTuple
+
+from .location_utils import EARTH_RADIUS, BoundingBox, LocationUtils
+
+DEFAULT_CELL_SIZE = 0.1
+
+
+class StationMatch(NamedTuple):
+    """Define a station that matched a query."""
+
+    distance: float
+    device: dict[str, Any]
+
+
+class StationIndex:
+    """Define a grid index of stations for local location queries.
+
+    Stations (device dicts from the open API, e.g., from `OpenAPI.scan_region`) are
+    bucketed into a grid of `cell_size`-degree cells, so that nearest-N, radius, and
+    bounding box queries only examine stations in nearby cells. The index can be
+    refreshed incrementally: `update` adds new stations and replaces (and, if
+    necessary, moves) existing ones, while `remove` drops them.
+
+    Longitudes don't wrap around the antimeridian.
+    """
+
+    def __init__(self, *, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        """Initialize.
+
+        Args:
+        ----
+            cell_size: The size of each grid cell (in degrees).
+
+        """
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[str, tuple[float, float]]] = {}
+        self._devices: dict[str, dict[str, Any]] = {}
+        # The (min row, max row, min column, max column) of every cell that has been
+        # occupied (it doesn't shrink when stations are removed):
+        self._extent: tuple[int, int, int, int] | None = None
+        self._locations: dict[str, tuple[float, float]] = {}
+
+    def __contains__(self, mac_address: object) -> bool:
+        """Return whether a station is in the index.
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        Returns:
+        -------
+            Whether the station is in the index.
+
+        """
+        return mac_address in self._devices
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Iterate over the indexed stations.
+
+        Returns
+        -------
+            An iterator of device dicts.
+
+        """
+        return iter(self._devices.values())
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations.
+
+        Returns
+        -------
+            The number of stations.
+
+        """
+        return len(self._devices)
+
+    @classmethod
+    def from_devices(
+        cls, devices: Iterable[dict[str, Any]], *, cell_size: float = DEFAULT_CELL_SIZE
+    ) -> StationIndex:
+        """Create an index of stations.
+
+        Args:
+        ----
+            devices: Device dicts.
+            cell_size: The size of each grid cell (in degrees).
+
+        Returns:
+        -------
+            A StationIndex.
+
+        """
+        index = cls(cell_size=cell_size)
+        index.update(devices)
+        return index
+
+    def _get_cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Get the grid cell that a location falls in.
+
+        Args:
+        ----
+            latitude: Latitude (in degrees).
+            longitude: Longitude (in degrees).
+
+        Returns:
+        -------
+            A (row, column) pair.
+
+        """
+        return (
+            math.floor(latitude / self._cell_size),
+            math.floor(longitude / self._cell_size),
+        )
+
+    def _iter_cells(self, box: BoundingBox) -> Iterator[dict[str, tuple[float, float]]]:
+        """Iterate over the occupied grid cells that overlap a bounding box.
+
+        Args:
+        ----
+            box: The bounding box.
+
+        Yields:
+        ------
+            Mappings of MAC addresses to locations.
+
+        """
+        south, west = self._get_cell(box.south, box.west)
+        north, east = self._get_cell(box.north, box.east)
+
+        # A large box may cover far more cells than are occupied:
+        if (north - south + 1) * (east - west + 1) > len(self._cells):
+            for (row, column), cell in self._cells.items():
+                if south <= row <= north and west <= column <= east:
+                    yield cell
+            return
+
+        for row in range(south, north + 1):
+            for column in range(west, east + 1):
+                if occupied := self._cells.get((row, column)):
+                    yield occupied
+
+    def get(self, mac_address: str) -> dict[str, Any] | None:
+        """Get an indexed station by MAC address.
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        Returns:
+        -------
+            A device dict (or None if the station isn't indexed).
+
+        """
+        return self._devices.get(mac_address)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        count: int = 1,
+        *,
+        max_distance: float | None = None,
+    ) -> list[StationMatch]:
+        """Get the stations nearest to a location.
+
+        Cells are searched in rings of increasing size around the location until no
+        unsearched cell can hold a station nearer than the ones found so far.
+
+        Args:
+        ----
+            latitude: Latitude (in degrees).
+            longitude: Longitude (in degrees).
+            count: The number of stations to return.
+            max_distance: An optional maximum distance (in miles).
+
+        Returns:
+        -------
+            Up to `count` StationMatches, nearest first.
+
+        """
+        if count <= 0 or not self._cells or self._extent is None:
+            return []
+
+        limit = math.inf if max_distance is None else max_distance
+        center_row, center_column = self._get_cell(latitude, longitude)
+        min_row, max_row, min_column, max_column = self._extent
+        max_ring = max(
+            center_row - min_row,
+            max_row - center_row,
+            center_column - min_column,
+            max_column - center_column,
+        )
+
+        # A max-heap (via negated distances) of the best matches so far:
+        best: list[tuple[float, str]] = []
+
+        for ring in range(max_ring + 1):
+            for mac_address, location in self._iter_ring(
+                center_row, center_column, ring
+            ):
+                distance = LocationUtils.distance(latitude, longitude, *location)
+                if distance > limit:
+                    continue
+                if len(best) < count:
+                    heapq.heappush(best, (-distance, mac_address))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, mac_address))
+
+            if len(best) == count:
+                limit = min(limit, -best[0][0])
+            if self._ring_distance(latitude, longitude, ring) > limit:
+                break
+
+        return [
+            StationMatch(-negated_distance, self._devices[mac_address])
+            for negated_distance, mac_address in sorted(best, reverse=True)
+        ]
+
+    def _iter_ring(
+        self, center_row: int, center_column: int, ring: int
+    ) -> Iterator[tuple[str, tuple[float, float]]]:
+        """Iterate over the stations in a square ring of cells around a cell.
+
+        Args:
+        ----
+            center_row: The row of the center cell.
+            center_column: The column of the center cell.
+            ring: The ring number (0 being the center cell itself).
+
+        Yields:
+        ------
+            (MAC address, location) pairs.
+
+        """
+        if self._extent is None:
+            return
+
+        # Only look at the parts of the ring that overlap occupied cells:
+        min_row, max_row, min_column, max_column = self._extent
+        top, bottom = center_row - ring, center_row + ring
+        left, right = center_column - ring, center_column + ring
+        columns = range(max(left, min_column), min(right, max_column) + 1)
+        rows = range(max(top + 1, min_row), min(bottom - 1, max_row) + 1)
+
+        keys: list[tuple[int, int]] = []
+        # The center cell (ring 0) is both the top and the bottom row of its ring:
+        for row in (top, bottom) if ring else (top,):
+            if min_row <= row <= max_row:
+                keys.extend((row, column) for column in columns)
+        for column in (left, right):
+            if min_column <= column <= max_column:
+                keys.extend((row, column) for row in rows)
+
+        for key in keys:
+            if cell := self._cells.get(key):
+                yield from cell.items()
+
+    def _ring_distance(self, latitude: float, longitude: float, ring: int) -> float:
+        """Get the minimum distance to any cell beyond a ring.
+
+        Args:
+        ----
+            latitude: Latitude (in degrees).
+            longitude: Longitude (in degrees).
+            ring: The ring number.
+
+        Returns:
+        -------
+            The distance (in miles).
+
+        """
+        row, column = self._get_cell(latitude, longitude)
+        cell_size = self._cell_size
+
+        latitude_gap = min(
+            latitude - (row - ring) * cell_size,
+            (row + ring + 1) * cell_size - latitude,
+        )
+        longitude_gap = min(
+            longitude - (column - ring) * cell_size,
+            (column + ring + 1) * cell_size - longitude,
+        )
+
+        # The distance from a point to a meridian is asin(sin(dλ) * cos(φ)):
+        meridian_distance = EARTH_RADIUS * math.asin(
+            math.sin(math.radians(min(longitude_gap, 90.0)))
+            * math.cos(math.radians(latitude))
+        )
+        return min(EARTH_RADIUS * math.radians(latitude_gap), meridian_distance)
+
+    def remove(self, mac_address: str) -> None:
+        """Remove a station from the index (if it is indexed).
+
+        Args:
+        ----
+            mac_address: The MAC address of the station.
+
+        """
+        if (location := self._locations.pop(mac_address, None)) is None:
+            return
+
+        del self._devices[mac_address]
+        key = self._get_cell(*location)
+        cell = self._cells[key]
+        del cell[mac_address]
+        if not cell:
+            del self._cells[key]
+
+    def update(self, devices: Iterable[dict[str, Any]]) -> int:
+        """Add stations to the index (replacing any that are already indexed).
+
+        Args:
+        ----
+            devices: Device dicts.
+
+        Returns:
+        -------
+            The number of stations that were indexed (devices without a location are
+            skipped).
+
+        """
+        indexed = 0
+
+        for device in devices:
+            if (location := LocationUtils.get_device_location(device)) is None:
+                continue
+
+            mac_address = device["macAddress"]
+            if self._locations.get(mac_address) != location:
+                self.remove(mac_address)
+                row, column = key = self._get_cell(*location)
+                self._cells.setdefault(key, {})[mac_address] = location
+                self._locations[mac_address] = location
+                if (extent := self._extent) is None:
+                    self._extent = (row, row, column, column)
+                else:
+                    self._extent = (
+                        min(extent[0], row),
+                        max(extent[1], row),
+                        min(extent[2], column),
+                        max(extent[3], column),
+                    )
+            self._devices[mac_address] = device
+            indexed += 1
+
+        return indexed
+
+    def within_box(self, box: BoundingBox) -> list[dict[str, Any]]:
+        """Get the stations within a bounding box.
+
+        Args:
+        ----
+            box: The bounding box.
+
+        Returns:
+        -------
+            A list of device dicts.
+
+        """
+        return [
+            self._devices[mac_address]
+            for cell in self._iter_cells(box)
+            for mac_address, (latitude, longitude) in cell.items()
+            if box.south <= latitude <= box.north and box.west <= longitude <= box.east
+        ]
+
+    def within_radius(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[StationMatch]:
+        """Get the stations within a radius.
+
+        Args:
+        ----
+            latitude: Latitude of center (in degrees).
+            longitude: Longitude of center (in degrees).
+            radius: Radius (in miles).
+
+        Returns:
+        -------
+            A list of StationMatches, nearest first.
+
+        """
+        angular_radius = radius / EARTH_RADIUS
+        south = latitude - math.degrees(angular_radius)
+        north = latitude + math.degrees(angular_radius)
+
+        # The circle's longitudinal extent is asin(sin(r) / cos(φ)), unless it
+        # covers a pole:
+        extent = math.sin(angular_radius) / math.cos(math.radians(latitude))
+        if south <= -90 or north >= 90 or extent >= 1:  # noqa: PLR2004
+            box = BoundingBox(south, -180.0, north, 180.0)
+        else:
+            longitude_delta = math.degrees(math.asin(extent))
+            box = BoundingBox(
+                south, longitude - longitude_delta, north, longitude + longitude_delta
+            )
+
+        matches = []
+        for cell in self._iter_cells(box):
+            for mac_address, location in cell.items():
+                distance = LocationUtils.distance(latitude, longitude, *location)
+                if distance <= radius:
+                    matches.append(StationMatch(distance, self._devices[mac_address]))
+
+        matches.sort(key=lambda match: match.distance)
+        return matches
@@ -3,31 +3,82 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from datetime import UTC, datetime
+from enum import StrEnum
 import logging
-from typing import Any
+from typing import Any, NamedTuple
 
 from aiohttp.client_exceptions import ClientConnectionError
 from socketio import AsyncClient
 from socketio.exceptions import SocketIOError
 
+from .api import API
+from .batcher import DEFAULT_BATCH_MAX_LATENCY, DEFAULT_BATCH_MAX_SIZE, DataBatcher
 from .const import DEFAULT_API_VERSION, LOGGER
-from .errors import WebsocketError
+from .dedupe import Deduplicator
+from .delta import DeltaTracker
+from .dispatch import DispatchQueue
+from .errors import RequestError, WebsocketError
+from .event_stream import DEFAULT_STREAM_BUFFER_SIZE, EventStreams
+from .reconnect import ReconnectPolicy
+from .state_store import StationStateStore
 
 DEFAULT_WATCHDOG_TIMEOUT = 900
 
 WEBSOCKET_API_BASE = "https://rt2.ambientweather.net"
 
 
+class ConnectionState(StrEnum):
+    """Define the state of the websocket connection."""
+
+    CONNECTED = "connected"
+    CONNECTING = "connecting"
+    DISCONNECTED = "disconnected"
+    # Reconnecting gave up after the reconnect policy's maximum number of attempts:
+    FAILED = "failed"
+    RECONNECTING = "reconnecting"
+
+
+class DataEvent(NamedTuple):
+    """Define an event for data received from the websocket."""
+
+    data: dict[str, Any]
+
+
+class DisconnectEvent(NamedTuple):
+    """Define an event for the websocket disconnecting."""
+
+    reason: str | None
+
+
+class SubscribedEvent(NamedTuple):
+    """Define an event for subscribing to the websocket."""
+
+    data: dict[str, Any]
+
+
+WebsocketEvent = DataEvent | DisconnectEvent | SubscribedEvent
+
+
 class WebsocketWatchdog:
-    """Define a watchdog to kick the websocket connection at intervals."""
+    """Define a watchdog to kick the websocket connection when it goes quiet.
+
+    Triggering the watchdog only records the time; a single timer checks the deadline
+    when it comes due (and pushes it back if anything has arrived since). Optionally,
+    the last time each device sent data is tracked, too, so that a single silent
+    device can be flagged without tearing down the whole connection.
+    """
 
     def __init__(
         self,
         logger: logging.Logger,
         action: Callable[..., Awaitable],
         *,
-        timeout_seconds: int = DEFAULT_WATCHDOG_TIMEOUT,
+        device_timeout_seconds: float | None = None,
+        on_stale_device: Callable[[str], Coroutine[Any, Any, None]] | None = None,
+        timeout_seconds: float = DEFAULT_WATCHDOG_TIMEOUT,
     ) -> None:
         """Initialize.
 
@@ -35,15 +86,90 @@ class WebsocketWatchdog:
         ----
             logger: The logger to use.
             action: The coroutine function to call when the watchdog expires.
+            device_timeout_seconds: The number of seconds before a device that hasn't
+                sent data is considered stale (or None to not track devices).
+            on_stale_device: An optional coroutine function to call (with the MAC
+                address) when a device becomes stale.
             timeout_seconds: The number of seconds before the watchdog times out.
 
         """
         self._action = action
+        self._device_last_seen: dict[str, float] = {}
+        self._device_timeout = device_timeout_seconds
+        self._last_seen = 0.0
         self._logger = logger
         self._loop = asyncio.get_event_loop()
+        self._on_stale_device = on_stale_device
+        self._stale_devices: set[str] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
         self._timeout = timeout_seconds
         self._timer_task: asyncio.TimerHandle | None = None
 
+    @property
+    def stale_devices(self) -> set[str]:
+        """Return the MAC addresses of devices that have stopped sending data.
+
+        Returns
+        -------
+            A set of MAC addresses.
+
+        """
+        return set(self._stale_devices)
+
+    def _check(self) -> None:
+        """Act on any deadlines that have passed, then wait for the next one."""
+        self._timer_task = None
+        now = self._loop.time()
+
+        if now - self._last_seen >= self._timeout:
+            self._create_task(self.on_expire())
+            return
+
+        next_check = self._last_seen + self._timeout
+
+        if self._device_timeout is not None:
+            # Check at least this often to catch devices that are new (or have
+            # resumed) since the last check:
+            next_check = min(next_check, now + self._device_timeout)
+            for mac_address, last_seen in self._device_last_seen.items():
+                if mac_address in self._stale_devices:
+                    continue
+                if (deadline := last_seen + self._device_timeout) > now:
+                    next_check = min(next_check, deadline)
+                    continue
+                self._logger.warning(
+                    "No data from %s in %s seconds", mac_address, self._device_timeout
+                )
+                self._stale_devices.add(mac_address)
+                if self._on_stale_device:
+                    self._create_task(self._on_stale_device(mac_address))
+
+        self._timer_task = self._loop.call_at(next_check, self._check)
+
+    def _create_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run a coroutine in the background (keeping a reference to it).
+
+        Args:
+        ----
+            coro: The coroutine.
+
+        """
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        """Log any error raised by a background task.
+
+        Args:
+        ----
+            task: The completed task.
+
+        """
+        self._tasks.discard(task)
+        if not task.cancelled() and (err := task.exception()):
+            self._logger.error("Error while acting on the watchdog: %s", err)
+
     def cancel(self) -> None:
         """Cancel the watchdog."""
         if self._timer_task:
@@ -55,19 +181,50 @@ class WebsocketWatchdog:
         self._logger.info("Watchdog expired - calling %s", self._action.__name__)
         await self._action()
 
-    async def trigger(self) -> None:
-        """Trigger the watchdog."""
-        self._logger.info("Watchdog triggered - sleeping for %s seconds", self._timeout)
+    async def trigger(self, mac_address: str | None = None) -> None:
+        """Trigger the watchdog.
 
-        if self._timer_task:
-            self._timer_task.cancel()
+        Args:
+        ----
+            mac_address: The MAC address of the device that sent data (if any).
 
-        self._timer_task = self._loop.call_later(
-            self._timeout, lambda: asyncio.create_task(self.on_expire())
-        )
+        """
+        self._last_seen = now = self._loop.time()
+
+        if self._timer_task is None:
+            # Give every device a fresh deadline whenever the watchdog (re)starts:
+            self._device_last_seen = dict.fromkeys(self._device_last_seen, now)
+            self._stale_devices.clear()
+            timeout = self._timeout
+            if self._device_timeout is not None:
+                timeout = min(timeout, self._device_timeout)
+            self._timer_task = self._loop.call_at(now + timeout, self._check)
+
+        if mac_address is None or self._device_timeout is None:
+            return
 
+        self._device_last_seen[mac_address] = now
+        if mac_address in self._stale_devices:
+            self._logger.info("Data from %s has resumed", mac_address)
+            self._stale_devices.discard(mac_address)
 
-class Websocket:
+    def watch(self, mac_address: str) -> None:
+        """Start the clock on a device (without counting it as having sent data).
+
+        Devices that are already being watched (including stale ones) are left as is.
+
+        Args:
+        ----
+            mac_address: The MAC address of the device.
+
+        """
+        if self._device_timeout is not None:
+            self._device_last_seen.setdefault(mac_address, self._loop.time())
+
+
+# Every event has a sync and an async handler registration method (both public API),
+# and each optional feature only holds a reference to its own helper object:
+class Websocket:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Define the websocket."""
 
     def __init__(
@@ -76,40 +233,416 @@ class Websocket:
         api_key: str | list[str],
         *,
         api_version: int = DEFAULT_API_VERSION,
+        dedupe: bool = False,
+        device_timeout: float | None = None,
+        dispatch_queue: DispatchQueue | None = None,
+        gap_fill_api: API | None = None,
         logger: logging.Logger = LOGGER,
+        reconnect_policy: ReconnectPolicy | None = None,
+        resubscribe_stale_devices: bool = False,
+        state_store: StationStateStore | None = None,
     ) -> None:
         """Initialize.
 
+        By default, data handlers are called from the websocket's receive path, so a
+        slow handler delays everything received after it. If a dispatch queue is
+        provided, data is put into it instead and handled by its worker tasks.
+
         Args:
         ----
             application_key: An Ambient Weather application key.
             api_key: An Ambient Weather API key.
             api_version: The version of the API to query.
+            dedupe: Whether to drop data that isn't newer than the last data from the
+                same device (e.g., observations replayed after resubscribing).
+            device_timeout: The number of seconds before a device that hasn't sent
+                data is considered stale (or None to not track devices).
+            dispatch_queue: An optional queue to decouple data handlers with.
+            gap_fill_api: An optional API object to fetch data that was missed while
+                disconnected with (which implies `dedupe`).
             logger: The logger to use.
+            reconnect_policy: How to back off between reconnect attempts.
+            resubscribe_stale_devices: Whether to subscribe to every API key again
+                when a device becomes stale (and no stale handler is defined).
+            state_store: An optional store to keep up to date with the latest data.
 
         """
         if isinstance(api_key, str):
             api_key = [api_key]
 
-        self._api_key = api_key
+        self._api_key = list(api_key)
         self._api_version = api_version
         self._app_key = application_key
         self._async_user_connect_handler: Callable[..., Awaitable[None]] | None = None
+        self._async_user_data_handler: (
+            Callable[[dict[str, Any]], Awaitable[None]] | None
+        ) = None
+        self._async_user_delta_handler: (
+            Callable[[dict[str, Any]], Awaitable[None]] | None
+        ) = None
+        self._async_user_device_stale_handler: (
+            Callable[[str], Awaitable[None]] | None
+        ) = None
+        self._async_user_disconnect_handler: Callable[..., Awaitable[None]] | None = (
+            None
+        )
+        self._async_user_state_handler: (
+            Callable[[ConnectionState], Awaitable[None]] | None
+        ) = None
+        self._async_user_subscribed_handler: (
+            Callable[[dict[str, Any]], Awaitable[None]] | None
+        ) = None
+        self._batcher: DataBatcher | None = None
+        self._deduplicator = Deduplicator() if dedupe or gap_fill_api else None
+        self._delta_tracker: DeltaTracker | None = None
+        self._dispatch_queue = dispatch_queue
+        self._event_streams: EventStreams[WebsocketEvent] = EventStreams()
+        self._gap_fill_api = gap_fill_api
+        self._gap_fill_task: asyncio.Task[None] | None = None
+        # Live data that arrives while filling gaps is held until they're filled:
+        self._held_data: deque[dict[str, Any]] | None = None
         self._logger = logger
-        self._sio = AsyncClient(logger=logger, engineio_logger=logger)
+        self._reconnect_lock = asyncio.Lock()
+        self._reconnect_policy = reconnect_policy or ReconnectPolicy()
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._resubscribe_stale_devices = resubscribe_stale_devices
+        # Reconnecting is driven by the reconnect policy rather than by Socket.IO:
+        self._sio = AsyncClient(
+            engineio_logger=logger, logger=logger, reconnection=False
+        )
+        self._state = ConnectionState.DISCONNECTED
+        self._state_store = state_store
         self._user_connect_handler: Callable[..., None] | None = None
-        self._watchdog = WebsocketWatchdog(logger, self.reconnect)
+        self._user_data_handler: Callable[[dict[str, Any]], None] | None = None
+        self._user_device_stale_handler: Callable[[str], None] | None = None
+        self._user_disconnect_handler: Callable[..., None] | None = None
+        self._user_state_handler: Callable[[ConnectionState], None] | None = None
+        self._user_subscribed_handler: Callable[[dict[str, Any]], None] | None = None
+        self._watchdog = WebsocketWatchdog(
+            logger,
+            self.reconnect,
+            device_timeout_seconds=device_timeout,
+            on_stale_device=self._on_device_stale,
+        )
+
+        self._sio.on("connect", self._init_connection)
+        self._sio.on("data", self._on_data)
+        self._sio.on("disconnect", self._on_disconnect)
+        self._sio.on("subscribed", self._on_subscribed)
+
+    @property
+    def stale_devices(self) -> set[str]:
+        """Return the MAC addresses of devices that have stopped sending data.
+
+        Returns
+        -------
+            A set of MAC addresses.
+
+        """
+        return self._watchdog.stale_devices
+
+    @property
+    def state(self) -> ConnectionState:
+        """Return the state of the connection.
+
+        Returns
+        -------
+            A ConnectionState.
+
+        """
+        return self._state
+
+    @property
+    def subscriptions(self) -> list[str]:
+        """Return the API keys that are subscribed to.
+
+        Returns
+        -------
+            A list of API keys.
+
+        """
+        return list(self._api_key)
+
+    @property
+    def suppressed(self) -> int:
+        """Return the number of messages dropped as duplicates.
+
+        Returns
+        -------
+            The number of messages.
+
+        """
+        return 0 if self._deduplicator is None else self._deduplicator.suppressed
+
+    async def _call_disconnect_handler(self, *args: str) -> None:
+        """Call the disconnect handler.
+
+        Args:
+        ----
+            *args: The arguments of the disconnect event.
+
+        Raises:
+        ------
+            TypeError: Raised when the handler can't be called.
+
+        """
+        # Like Socket.IO itself, support handlers that don't accept a reason:
+        if self._async_user_disconnect_handler:
+            try:
+                await self._async_user_disconnect_handler(*args)
+            except TypeError:
+                if not args:
+                    raise
+                await self._async_user_disconnect_handler(*args[:-1])
+        elif self._user_disconnect_handler:
+            try:
+                self._user_disconnect_handler(*args)
+            except TypeError:
+                if not args:
+                    raise
+                self._user_disconnect_handler(*args[:-1])
+
+    async def _connect(self) -> None:
+        """Connect to the socket.
+
+        Raises
+        ------
+            WebsocketError: Raised upon any issue with the websocket.
+
+        """
+        if self._dispatch_queue is not None:
+            self._dispatch_queue.start(self._handle_data)
+
+        try:
+            await self._sio.connect(
+                (
+                    f"{WEBSOCKET_API_BASE}/?api={self._api_version}"
+                    f"&applicationKey={self._app_key}"
+                ),
+                transports=["websocket"],
+            )
+        except (ClientConnectionError, SocketIOError) as err:
+            raise WebsocketError(err) from err
+
+    async def _accept_data(self, data: dict[str, Any]) -> None:
+        """Pass data that isn't a duplicate on to be handled.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        if self._deduplicator is not None and not self._deduplicator.accept(data):
+            self._logger.debug("Dropping duplicate data: %s", data)
+            return
+
+        # The store is updated as soon as data arrives (even if handlers are behind):
+        if self._state_store is not None:
+            self._state_store.update(data)
+
+        if self._dispatch_queue is None:
+            await self._handle_data(data)
+        else:
+            await self._dispatch_queue.put(data)
+
+    async def _fill_gaps(self, api: API, watermarks: dict[str, int]) -> None:
+        """Fetch (and handle) the data each device sent while disconnected.
+
+        Args:
+        ----
+            api: The API object to fetch data with.
+            watermarks: The latest `dateutc` seen from each device.
+
+        """
+        task = asyncio.current_task()
+        try:
+            for mac_address, watermark in watermarks.items():
+                try:
+                    records = [
+                        record
+                        async for record in api.iter_device_history(
+                            mac_address,
+                            datetime.fromtimestamp((watermark + 1) / 1000, UTC),
+                        )
+                    ]
+                except RequestError as err:
+                    self._logger.warning(
+                        "Unable to fill the gap in data from %s: %s", mac_address, err
+                    )
+                    continue
+
+                self._logger.debug(
+                    "Filling a gap of %s records from %s", len(records), mac_address
+                )
+                # History arrives newest first:
+                for record in reversed(records):
+                    # A data handler may have disconnected in the meantime:
+                    if self._gap_fill_task is not task:
+                        return
+                    await self._accept_data({**record, "macAddress": mac_address})
+        finally:
+            # Once the gaps are filled, catch up on the live data that arrived since
+            # (stopping holding data only once none is left, so order is kept); upon
+            # disconnecting, the held data is dropped instead:
+            while self._gap_fill_task is task and self._held_data:
+                await self._accept_data(self._held_data.popleft())
+            if self._gap_fill_task is task:
+                self._held_data = None
 
     async def _init_connection(self) -> None:
         """Perform automatic initialization upon connecting."""
+        if (
+            self._gap_fill_api is not None
+            and self._deduplicator is not None
+            and (watermarks := self._deduplicator.watermarks)
+            and self._held_data is None
+        ):
+            self._held_data = deque()
+            self._gap_fill_task = asyncio.create_task(
+                self._fill_gaps(self._gap_fill_api, watermarks)
+            )
+
+        # This restores every subscription after a reconnect:
         await self._sio.emit("subscribe", {"apiKeys": self._api_key})
         await self._watchdog.trigger()
+        await self._set_state(ConnectionState.CONNECTED)
 
         if self._async_user_connect_handler:
             await self._async_user_connect_handler()
         elif self._user_connect_handler:
             self._user_connect_handler()
 
+    async def _handle_data(self, data: dict[str, Any]) -> None:
+        """Pass data to the data handlers.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        if self._async_user_data_handler:
+            await self._async_user_data_handler(data)
+        elif self._user_data_handler:
+            self._user_data_handler(data)
+
+        if self._batcher is not None:
+            await self._batcher.add(data)
+
+        if (
+            self._delta_tracker is not None
+            and self._async_user_delta_handler
+            and (delta := self._delta_tracker.diff(data))
+        ):
+            await self._async_user_delta_handler(delta)
+
+        if self._event_streams:
+            await self._event_streams.put(DataEvent(data))
+
+    async def _on_data(self, data: dict[str, Any]) -> None:
+        """Act on data.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        await self._watchdog.trigger(data.get("macAddress"))
+
+        if self._held_data is not None:
+            self._held_data.append(data)
+            return
+
+        await self._accept_data(data)
+
+    async def _on_device_stale(self, mac_address: str) -> None:
+        """Act on a device that has stopped sending data.
+
+        Args:
+        ----
+            mac_address: The MAC address of the device.
+
+        """
+        if self._async_user_device_stale_handler:
+            await self._async_user_device_stale_handler(mac_address)
+        elif self._user_device_stale_handler:
+            self._user_device_stale_handler(mac_address)
+        elif self._resubscribe_stale_devices:
+            await self.resubscribe()
+
+    async def _on_disconnect(self, *args: str) -> None:
+        """Act on a disconnect.
+
+        Args:
+        ----
+            *args: The arguments of the event (newer Socket.IO versions include the
+                reason for the disconnect).
+
+        """
+        # If the connection dropped on its own (rather than by `disconnect()` or
+        # `reconnect()`, which set the state first), reconnect per the policy:
+        if dropped := self._state is ConnectionState.CONNECTED:
+            await self._set_state(ConnectionState.RECONNECTING)
+
+        if self._batcher is not None:
+            await self._batcher.flush()
+
+        if self._event_streams:
+            await self._event_streams.put(DisconnectEvent(args[0] if args else None))
+
+        await self._call_disconnect_handler(*args)
+
+        if dropped:
+            self._reconnect_task = asyncio.create_task(self._reconnect_after_drop())
+
+    async def _reconnect_after_drop(self) -> None:
+        """Reconnect after the connection has dropped."""
+        try:
+            await self.reconnect()
+        except WebsocketError:
+            self._logger.exception("Gave up reconnecting")
+
+    async def _on_subscribed(self, data: dict[str, Any]) -> None:
+        """Act on subscribe.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        await self._watchdog.trigger()
+        # Start the clock on every subscribed device (even those that never send);
+        # only real data marks a stale device as having resumed, though:
+        for device in data.get("devices", []):
+            if mac_address := device.get("macAddress"):
+                self._watchdog.watch(mac_address)
+
+        if self._event_streams:
+            await self._event_streams.put(SubscribedEvent(data))
+
+        if self._async_user_subscribed_handler:
+            await self._async_user_subscribed_handler(data)
+        elif self._user_subscribed_handler:
+            self._user_subscribed_handler(data)
+
+    async def _set_state(self, state: ConnectionState) -> None:
+        """Set the state of the connection (notifying the state handlers).
+
+        Args:
+        ----
+            state: The new state.
+
+        """
+        if state is self._state:
+            return
+
+        self._logger.debug("Websocket connection is %s", state)
+        self._state = state
+
+        if self._async_user_state_handler:
+            await self._async_user_state_handler(state)
+        elif self._user_state_handler:
+            self._user_state_handler(state)
+
     def async_on_connect(self, target: Callable[..., Awaitable[None]]) -> None:
         """Define a coroutine to be called when connecting.
 
@@ -141,42 +674,167 @@ class Websocket:
         ----
             target: The coroutine function to call when receiving websocket data.
 
+        """
+        self._async_user_data_handler = target
+        self._user_data_handler = None
+
+    def on_data(self, target: Callable[[dict[str, Any]], None]) -> None:
+        """Define a method to be called when data is received.
+
+        Args:
+        ----
+            target: The function to call when receiving websocket data.
+
+        """
+        self._async_user_data_handler = None
+        self._user_data_handler = target
+
+    def async_on_data_batch(
+        self,
+        target: Callable[[list[dict[str, Any]]], Awaitable[None]],
+        *,
+        max_latency: float = DEFAULT_BATCH_MAX_LATENCY,
+        max_size: int = DEFAULT_BATCH_MAX_SIZE,
+    ) -> None:
+        """Define a coroutine to be called with batches of data.
+
+        Data is collected into batches, each of which is delivered once it holds
+        `max_size` messages or once its first message has waited `max_latency`
+        seconds (whichever comes first); any partial batch is delivered upon
+        disconnecting. This can be used alongside a per-message data handler. If a
+        batch handler is already defined, it is replaced, and any data waiting in its
+        current batch is delivered to the new one instead.
+
+        Args:
+        ----
+            target: The coroutine function to call with each batch (a list of
+                websocket data).
+            max_latency: The maximum number of seconds a message waits in a batch.
+            max_size: The maximum number of messages in a batch.
+
+        """
+        batcher = DataBatcher(
+            target, logger=self._logger, max_latency=max_latency, max_size=max_size
+        )
+        if self._batcher is not None:
+            batcher.prepend(self._batcher.cancel())
+        self._batcher = batcher
+
+    def on_data_batch(
+        self,
+        target: Callable[[list[dict[str, Any]]], None],
+        *,
+        max_latency: float = DEFAULT_BATCH_MAX_LATENCY,
+        max_size: int = DEFAULT_BATCH_MAX_SIZE,
+    ) -> None:
+        """Define a method to be called with batches of data.
+
+        See `async_on_data_batch` for how data is batched.
+
+        Args:
+        ----
+            target: The function to call with each batch (a list of websocket data).
+            max_latency: The maximum number of seconds a message waits in a batch.
+            max_size: The maximum number of messages in a batch.
+
         """
 
-        async def _async_on_data(data: dict[str, Any]) -> None:
-            """Act on the data.
+        async def _async_on_data_batch(batch: list[dict[str, Any]]) -> None:
+            """Act on a batch of data.
 
             Args:
             ----
-                data: The websocket data received.
+                batch: The websocket data received.
 
             """
-            await self._watchdog.trigger()
-            await target(data)
+            target(batch)
 
-        self._sio.on("data", _async_on_data)
+        self.async_on_data_batch(
+            _async_on_data_batch, max_latency=max_latency, max_size=max_size
+        )
 
-    def on_data(self, target: Callable[[dict[str, Any]], None]) -> None:
-        """Define a method to be called when data is received.
+    def async_on_data_delta(
+        self,
+        target: Callable[[dict[str, Any]], Awaitable[None]],
+        *,
+        default_epsilon: float = 0.0,
+        epsilons: dict[str, float] | None = None,
+    ) -> None:
+        """Define a coroutine to be called with the fields of data that have changed.
+
+        The previous state of each device is kept, and only the fields that have
+        changed since they were last delivered (plus `macAddress` and `dateutc`) are
+        delivered; data in which nothing has changed isn't delivered at all. A numeric
+        field counts as changed once it has moved by more than its epsilon. The first
+        data from each device is delivered in full. This can be used alongside a
+        per-message data handler.
 
         Args:
         ----
-            target: The function to call when receiving websocket data.
+            target: The coroutine function to call with each delta.
+            default_epsilon: The epsilon for numeric fields without their own.
+            epsilons: An optional dict of epsilons by field name.
+
+        """
+        self._async_user_delta_handler = target
+        self._delta_tracker = DeltaTracker(
+            default_epsilon=default_epsilon, epsilons=epsilons
+        )
+
+    def on_data_delta(
+        self,
+        target: Callable[[dict[str, Any]], None],
+        *,
+        default_epsilon: float = 0.0,
+        epsilons: dict[str, float] | None = None,
+    ) -> None:
+        """Define a method to be called with the fields of data that have changed.
+
+        See `async_on_data_delta` for how changes are detected.
+
+        Args:
+        ----
+            target: The function to call with each delta.
+            default_epsilon: The epsilon for numeric fields without their own.
+            epsilons: An optional dict of epsilons by field name.
 
         """
 
-        async def _async_on_data(data: dict[str, Any]) -> None:
-            """Act on the data.
+        async def _async_on_data_delta(delta: dict[str, Any]) -> None:
+            """Act on a delta.
 
             Args:
             ----
-                data: The websocket data received.
+                delta: The changed fields.
 
             """
-            await self._watchdog.trigger()
-            target(data)
+            target(delta)
+
+        self.async_on_data_delta(
+            _async_on_data_delta, default_epsilon=default_epsilon, epsilons=epsilons
+        )
+
+    def async_on_device_stale(self, target: Callable[[str], Awaitable[None]]) -> None:
+        """Define a coroutine to be called when a device stops sending data.
+
+        Args:
+        ----
+            target: The coroutine function to call (with the device's MAC address).
+
+        """
+        self._async_user_device_stale_handler = target
+        self._user_device_stale_handler = None
 
-        self._sio.on("data", _async_on_data)
+    def on_device_stale(self, target: Callable[[str], None]) -> None:
+        """Define a method to be called when a device stops sending data.
+
+        Args:
+        ----
+            target: The function to call (with the device's MAC address).
+
+        """
+        self._async_user_device_stale_handler = None
+        self._user_device_stale_handler = target
 
     def async_on_disconnect(self, target: Callable[..., Awaitable[None]]) -> None:
         """Define a coroutine to be called when disconnecting.
@@ -186,7 +844,8 @@ class Websocket:
             target: The coroutine function to call upon websocket connect.
 
         """
-        self._sio.on("disconnect", target)
+        self._async_user_disconnect_handler = target
+        self._user_disconnect_handler = None
 
     def on_disconnect(self, target: Callable[..., None]) -> None:
         """Define a method to be called when disconnecting.
@@ -196,7 +855,8 @@ class Websocket:
             target: The function to call upon websocket connect.
 
         """
-        self._sio.on("disconnect", target)
+        self._async_user_disconnect_handler = None
+        self._user_disconnect_handler = target
 
     def async_on_subscribed(
         self, target: Callable[[dict[str, Any]], Awaitable[None]]
@@ -208,19 +868,8 @@ class Websocket:
             target: The coroutine function to call when receiving websocket data.
 
         """
-
-        async def _async_on_subscribed(data: dict[str, Any]) -> None:
-            """Act on subscribe.
-
-            Args:
-            ----
-                data: The websocket data received.
-
-            """
-            await self._watchdog.trigger()
-            await target(data)
-
-        self._sio.on("subscribed", _async_on_subscribed)
+        self._async_user_subscribed_handler = target
+        self._user_subscribed_handler = None
 
     def on_subscribed(self, target: Callable[[dict[str, Any]], None]) -> None:
         """Define a method to be called when subscribed.
@@ -230,19 +879,32 @@ class Websocket:
             target: The function to call when receiving websocket data.
 
         """
+        self._async_user_subscribed_handler = None
+        self._user_subscribed_handler = target
 
-        async def _async_on_subscribed(data: dict[str, Any]) -> None:
-            """Act on subscribe.
+    def async_on_state_change(
+        self, target: Callable[[ConnectionState], Awaitable[None]]
+    ) -> None:
+        """Define a coroutine to be called when the connection state changes.
 
-            Args:
-            ----
-                data: The websocket data received.
+        Args:
+        ----
+            target: The coroutine function to call (with the new state).
 
-            """
-            await self._watchdog.trigger()
-            target(data)
+        """
+        self._async_user_state_handler = target
+        self._user_state_handler = None
 
-        self._sio.on("subscribed", _async_on_subscribed)
+    def on_state_change(self, target: Callable[[ConnectionState], None]) -> None:
+        """Define a method to be called when the connection state changes.
+
+        Args:
+        ----
+            target: The function to call (with the new state).
+
+        """
+        self._async_user_state_handler = None
+        self._user_state_handler = target
 
     async def connect(self) -> None:
         """Connect to the socket.
@@ -252,25 +914,170 @@ class Websocket:
             WebsocketError: Raised upon any issue with the websocket.
 
         """
+        await self._set_state(ConnectionState.CONNECTING)
+
         try:
-            self._sio.on("connect", self._init_connection)
-            await self._sio.connect(
-                (
-                    f"{WEBSOCKET_API_BASE}/?api={self._api_version}"
-                    f"&applicationKey={self._app_key}"
-                ),
-                transports=["websocket"],
-            )
-        except (ClientConnectionError, SocketIOError) as err:
-            raise WebsocketError(err) from err
+            await self._connect()
+        except WebsocketError:
+            await self._set_state(ConnectionState.DISCONNECTED)
+            raise
 
-    async def disconnect(self) -> None:
-        """Disconnect from the socket."""
+        await self._set_state(ConnectionState.CONNECTED)
+
+    async def _disconnect(self) -> None:
+        """Disconnect from the socket (without ending any streams).
+
+        Any queued data is handled (and any partial batch delivered) first.
+        """
         await self._sio.disconnect()
         self._watchdog.cancel()
 
+        if (gap_fill_task := self._gap_fill_task) is not None:
+            # Stop filling gaps (and drop the live data held back meanwhile):
+            self._gap_fill_task = None
+            self._held_data = None
+            # A data handler may disconnect from within the gap-filling task itself:
+            if gap_fill_task is not asyncio.current_task():
+                gap_fill_task.cancel()
+                await asyncio.gather(gap_fill_task, return_exceptions=True)
+
+        if self._dispatch_queue is not None:
+            await self._dispatch_queue.stop()
+
+        if self._batcher is not None:
+            await self._batcher.flush()
+
+    async def disconnect(self) -> None:
+        """Disconnect from the socket.
+
+        Any queued data is handled (and any partial batch delivered) first, and any
+        streams end once their buffered events have been read.
+        """
+        await self._set_state(ConnectionState.DISCONNECTED)
+
+        if (
+            self._reconnect_task is not None
+            and self._reconnect_task is not asyncio.current_task()
+        ):
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+        self._reconnect_task = None
+
+        await self._disconnect()
+        self._event_streams.close()
+
     async def reconnect(self) -> None:
-        """Reconnect the websocket connection."""
-        await self.disconnect()
-        await asyncio.sleep(1)
-        await self.connect()
+        """Reconnect the websocket connection.
+
+        This also happens automatically whenever the connection drops (or the
+        watchdog fires). Attempts are spaced out according to the reconnect policy
+        (and the state becomes FAILED once it runs out of attempts); once connected,
+        every subscription is restored. If a reconnect is already underway, this waits
+        for it to finish instead of starting another.
+
+        Raises
+        ------
+            WebsocketError: Raised when the reconnect policy runs out of attempts.
+
+        """
+        if self._reconnect_lock.locked():
+            async with self._reconnect_lock:
+                return
+
+        async with self._reconnect_lock:
+            await self._set_state(ConnectionState.RECONNECTING)
+            await self._disconnect()
+
+            attempt = 0
+            while True:
+                await asyncio.sleep(self._reconnect_policy.get_delay(attempt))
+
+                # Stop if disconnect() was called in the meantime:
+                if self._state is not ConnectionState.RECONNECTING:
+                    return
+
+                try:
+                    await self._connect()
+                except WebsocketError as err:
+                    attempt += 1
+                    if not self._reconnect_policy.should_retry(attempt):
+                        await self._set_state(ConnectionState.FAILED)
+                        raise
+                    self._logger.warning(
+                        "Reconnect attempt %s failed: %s", attempt, err
+                    )
+                    continue
+
+                await self._set_state(ConnectionState.CONNECTED)
+                return
+
+    async def resubscribe(self) -> None:
+        """Subscribe to the API keys again (without reconnecting)."""
+        await self._sio.emit("subscribe", {"apiKeys": self._api_key})
+
+    async def subscribe(self, api_key: str | list[str]) -> None:
+        """Subscribe to one or more API keys.
+
+        Subscriptions are restored whenever the websocket (re)connects.
+
+        Args:
+        ----
+            api_key: One or more Ambient Weather API keys.
+
+        """
+        if isinstance(api_key, str):
+            api_key = [api_key]
+
+        new_api_keys = [
+            key for key in dict.fromkeys(api_key) if key not in self._api_key
+        ]
+        if not new_api_keys:
+            return
+
+        self._api_key.extend(new_api_keys)
+        if self._state is ConnectionState.CONNECTED:
+            await self._sio.emit("subscribe", {"apiKeys": new_api_keys})
+
+    async def unsubscribe(self, api_key: str | list[str]) -> None:
+        """Unsubscribe from one or more API keys.
+
+        Args:
+        ----
+            api_key: One or more Ambient Weather API keys.
+
+        """
+        if isinstance(api_key, str):
+            api_key = [api_key]
+
+        old_api_keys = [key for key in self._api_key if key in api_key]
+        if not old_api_keys:
+            return
+
+        self._api_key = [key for key in self._api_key if key not in old_api_keys]
+        if self._state is ConnectionState.CONNECTED:
+            await self._sio.emit("unsubscribe", {"apiKeys": old_api_keys})
+
+    def stream(
+        self, *, buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE
+    ) -> AsyncIterator[WebsocketEvent]:
+        """Stream websocket events.
+
+        Events (`DataEvent`, `SubscribedEvent`, and `DisconnectEvent`) are buffered
+        until they are read; once `buffer_size` events are waiting, the websocket
+        waits for the stream to catch up (so a slow reader slows down the connection
+        rather than losing events). Each stream has its own buffer.
+
+        Events are buffered from the time the stream is first iterated. Streams carry
+        on across reconnects (whether by `reconnect()` or the watchdog) and end once
+        `disconnect()` is called.
+
+        Args:
+        ----
+            buffer_size: The maximum number of events to buffer.
+
+        Returns:
+        -------
+            An async iterator of websocket events.
+
+        """
+        return self._event_streams.stream(buffer_size=buffer_size)
@@ -0,0 +1,70 @@
+"""Compare the memory use and attribute access speed of models and dicts."""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+import timeit
+import tracemalloc
+from typing import Any
+
+from aioambient.models import Observation
+
+_LOGGER = logging.getLogger()
+
+FIXTURE = Path(__file__).parent.parent / "tests/fixtures/device_details_response.json"
+RECORDS_PER_STATION = 288
+STATIONS = 100
+
+
+def measure_memory(build: Any) -> tuple[Any, int]:  # noqa: ANN401
+    """Measure the memory allocated by a builder function.
+
+    Args:
+    ----
+        build: A function that builds a collection of records.
+
+    Returns:
+    -------
+        The built collection and the number of bytes it occupies.
+
+    """
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    logging.basicConfig(level=logging.INFO)
+
+    template = json.loads(FIXTURE.read_text(encoding="utf-8"))[0]
+    payload = json.dumps(
+        [
+            {**template, "dateutc": template["dateutc"] - idx * 300000}
+            for idx in range(RECORDS_PER_STATION * STATIONS)
+        ]
+    )
+
+    dicts, dict_size = measure_memory(lambda: json.loads(payload))
+    observations, observation_size = measure_memory(
+        lambda: Observation.from_dicts(json.loads(payload))
+    )
+
+    _LOGGER.info("Records: %s", len(dicts))
+    _LOGGER.info("dict memory: %.1f MiB", dict_size / 2**20)
+    _LOGGER.info("Observation memory: %.1f MiB", observation_size / 2**20)
+
+    dict_time = timeit.timeit(lambda: [record["tempf"] for record in dicts], number=10)
+    observation_time = timeit.timeit(
+        lambda: [record.tempf for record in observations], number=10
+    )
+    _LOGGER.info("dict access: %.1f ms", dict_time * 100)
+    _LOGGER.info("Observation access: %.1f ms", observation_time * 100)
+
+
+if __name__ == "__main__":
+    main()
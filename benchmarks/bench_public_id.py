@@ -0,0 +1,47 @@
+"""Compare the speed of computing public device IDs with and without memoization."""
+
+from __future__ import annotations
+
+import logging
+import timeit
+
+from aioambient.util import (
+    get_public_device_id,
+    get_public_device_id_cached,
+    get_public_device_ids,
+)
+
+_LOGGER = logging.getLogger()
+
+MESSAGES = 100_000
+STATIONS = 500
+
+
+def main() -> None:
+    """Run the benchmark."""
+    logging.basicConfig(level=logging.INFO)
+
+    mac_addresses = [f"00:11:22:{idx:06X}" for idx in range(STATIONS)]
+    # Incoming messages cycle through the same set of stations:
+    messages = [mac_addresses[idx % STATIONS] for idx in range(MESSAGES)]
+
+    uncached_time = timeit.timeit(
+        lambda: [get_public_device_id(mac_address) for mac_address in messages],
+        number=1,
+    )
+    get_public_device_id_cached.cache_clear()
+    cached_time = timeit.timeit(
+        lambda: [get_public_device_id_cached(mac_address) for mac_address in messages],
+        number=1,
+    )
+    get_public_device_id_cached.cache_clear()
+    bulk_time = timeit.timeit(lambda: get_public_device_ids(mac_addresses), number=1)
+
+    _LOGGER.info("Messages: %s (from %s stations)", MESSAGES, STATIONS)
+    _LOGGER.info("Uncached: %.1f ms", uncached_time * 1000)
+    _LOGGER.info("Cached: %.1f ms", cached_time * 1000)
+    _LOGGER.info("Bulk index of %s stations: %.1f ms", STATIONS, bulk_time * 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 """Define tests for the REST API."""
 
+import asyncio
 import datetime
+import importlib.util
+import json
 import logging
+import sys
+from typing import Any
 from unittest.mock import Mock
 
 import aiohttp
+from aiohttp import web
 from aresponses import ResponsesMockServer
 import pytest
 
@@ -129,13 +135,398 @@ async def test_get_devices(aresponses: ResponsesMockServer) -> None:
 
 @pytest.mark.asyncio
 async def test_session_from_scratch(aresponses: ResponsesMockServer) -> None:
-    """Test that an aiohttp ClientSession is created on the fly if needed.
+    """Test that a pooled aiohttp ClientSession is created on the fly if needed.
 
     Args:
     ----
         aresponses: An aresponses server.
 
     """
+    for _ in range(2):
+        aresponses.add(
+            "rt.ambientweather.net",
+            "/v1/devices",
+            "get",
+            aresponses.Response(
+                text=load_fixture("devices_response.json"),
+                status=200,
+                headers={"Content-Type": "application/json; charset=utf-8"},
+            ),
+        )
+
+    async with API(TEST_API_KEY, TEST_APP_KEY) as api:
+        devices = await api.get_devices()
+        assert len(devices) == 2
+
+        session = api._session
+        assert session
+
+        devices = await api.get_devices()
+        assert len(devices) == 2
+        assert api._session is session
+
+    assert session.closed
+    assert api._session is None
+
+
+@pytest.mark.asyncio
+async def test_session_provided_is_not_closed(aresponses: ResponsesMockServer) -> None:
+    """Test that closing the API object leaves a provided session open.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text=load_fixture("devices_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TEST_API_KEY, TEST_APP_KEY, session=session)
+        await api.get_devices()
+        await api.close()
+
+        assert not session.closed
+        assert api._session is session
+
+
+@pytest.mark.asyncio
+async def test_get_all_device_details(aresponses: ResponsesMockServer) -> None:
+    """Test retrieving details for every device, with one failure.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text=load_fixture("devices_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices/84:F3:EB:21:90:C4",
+        "get",
+        aresponses.Response(
+            text=load_fixture("device_details_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "rt.ambientweather.net",
+        f"/v1/devices/{TEST_MAC}",
+        "get",
+        aresponses.Response(text="", status=500),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TEST_APP_KEY, TEST_API_KEY, rate_limit=100, session=session)
+
+        # The fixture lists the same device twice, so it should be queried once:
+        results = [result async for result in api.get_all_device_details()]
+        assert len(results) == 1
+        assert results[0].mac_address == "84:F3:EB:21:90:C4"
+        assert results[0].details
+        assert len(results[0].details) == 2
+        assert results[0].error is None
+
+        results = [result async for result in api.get_all_device_details([TEST_MAC])]
+        assert len(results) == 1
+        assert results[0].details is None
+        assert isinstance(results[0].error, RequestError)
+
+
+@pytest.mark.asyncio
+async def test_get_all_device_details_concurrency(
+    aresponses: ResponsesMockServer,
+) -> None:
+    """Test that bulk requests are capped at the given concurrency.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _handler(request: web.Request) -> web.Response:
+        """Return device details after tracking concurrency.
+
+        Args:
+        ----
+            request: The incoming request.
+
+        Returns:
+        -------
+            A response.
+
+        """
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return web.Response(
+            text=load_fixture("device_details_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+
+    mac_addresses = [f"00:00:00:00:00:0{index}" for index in range(6)]
+    for mac_address in mac_addresses:
+        aresponses.add(
+            "rt.ambientweather.net", f"/v1/devices/{mac_address}", "get", _handler
+        )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            "concurrency_api_key",
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        results = [
+            result
+            async for result in api.get_all_device_details(mac_addresses, concurrency=2)
+        ]
+        assert sorted(result.mac_address for result in results) == mac_addresses
+        assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_device_history(aresponses: ResponsesMockServer) -> None:
+    """Test paging backwards through a device's history.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    # Ten records, five minutes apart, newest first:
+    newest = 1547094300000
+    history = [
+        {"dateutc": newest - index * 300000, "tempf": 30 + index} for index in range(10)
+    ]
+
+    async def _handler(request: web.Request) -> web.Response:
+        """Return the page of history ending at the requested end date.
+
+        Args:
+        ----
+            request: The incoming request.
+
+        Returns:
+        -------
+            A response.
+
+        """
+        records = history
+        if end_date := request.query.get("endDate"):
+            end_ms = datetime.datetime.fromisoformat(end_date).timestamp() * 1000
+            # Ambient's end date is inclusive, so pages overlap by one record:
+            records = [record for record in history if record["dateutc"] <= end_ms]
+        return web.Response(
+            text=json.dumps(records[: int(request.query["limit"])]),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+
+    aresponses.add(
+        "rt.ambientweather.net",
+        f"/v1/devices/{TEST_MAC}",
+        "get",
+        _handler,
+        repeat=aresponses.INFINITY,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        # Walk the entire history, four records per page:
+        records = [
+            record
+            async for record in api.iter_device_history(
+                TEST_MAC, datetime.datetime(2019, 1, 1, tzinfo=datetime.UTC), limit=4
+            )
+        ]
+        assert records == history
+
+        # Stop at the start datetime:
+        start = datetime.datetime.fromtimestamp(
+            history[5]["dateutc"] / 1000, tz=datetime.UTC
+        )
+        records = [
+            record async for record in api.iter_device_history(TEST_MAC, start, limit=4)
+        ]
+        assert records == history[:6]
+
+        # Begin at the end datetime:
+        end = datetime.datetime.fromtimestamp(
+            history[2]["dateutc"] / 1000, tz=datetime.UTC
+        )
+        records = [
+            record
+            async for record in api.iter_device_history(TEST_MAC, start, end, limit=4)
+        ]
+        assert records == history[2:6]
+
+        # Resume after an interruption:
+        records = [
+            record
+            async for record in api.iter_device_history(
+                TEST_MAC, start, limit=4, resume_from=history[3]["dateutc"]
+            )
+        ]
+        assert records == history[4:6]
+
+        # Walk the entire history, one record per page:
+        records = [
+            record
+            async for record in api.iter_device_history(
+                TEST_MAC, datetime.datetime(2019, 1, 1, tzinfo=datetime.UTC), limit=1
+            )
+        ]
+        assert records == history
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_coalesced(aresponses: ResponsesMockServer) -> None:
+    """Test that concurrent identical requests share a single HTTP request.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        f"/v1/devices/{TEST_MAC}",
+        "get",
+        aresponses.Response(
+            text=load_fixture("device_details_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(text="", status=500),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        # The caller that starts the request modifies its result as soon as it
+        # arrives:
+        async def get_and_modify() -> list[dict[str, Any]]:
+            """Get the device details and modify them.
+
+            Returns
+            -------
+                The device details.
+
+            """
+            result = await api.get_device_details(TEST_MAC)
+            result.clear()
+            return result
+
+        first = asyncio.create_task(get_and_modify())
+        await asyncio.sleep(0)
+
+        # Another caller being cancelled shouldn't affect the others:
+        cancelled = asyncio.create_task(api.get_device_details(TEST_MAC))
+        callers = [
+            asyncio.create_task(api.get_device_details(TEST_MAC)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        # Every other caller receives its own (unmodified) copy:
+        results = await asyncio.gather(first, *callers)
+        assert not results[0]
+        assert all(len(result) == 2 for result in results[1:])
+        assert results[1] is not results[2]
+        assert not api._in_flight
+
+        # Every caller receives the shared error:
+        errors = await asyncio.gather(
+            *(api.get_devices() for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(error, RequestError) for error in errors)
+
+        # Every caller is cancelled along with the shared request:
+        callers = [asyncio.create_task(api.get_devices()) for _ in range(2)]
+        await asyncio.sleep(0)
+        for task in api._in_flight.values():
+            task.cancel()
+        cancellations = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(err, asyncio.CancelledError) for err in cancellations)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_custom_json_loads(aresponses: ResponsesMockServer) -> None:
+    """Test that response bodies are decoded with a custom decoder.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    for _ in range(2):
+        aresponses.add(
+            "rt.ambientweather.net",
+            "/v1/devices",
+            "get",
+            aresponses.Response(
+                text=load_fixture("devices_response.json"),
+                status=200,
+                headers={"Content-Type": "application/json; charset=utf-8"},
+            ),
+        )
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text="not json",
+            status=200,
+            headers={"Content-Type": "text/plain"},
+        ),
+    )
     aresponses.add(
         "rt.ambientweather.net",
         "/v1/devices",
@@ -147,7 +538,180 @@ async def test_session_from_scratch(aresponses: ResponsesMockServer) -> None:
         ),
     )
 
-    api = API(TEST_API_KEY, TEST_APP_KEY)
+    json_loads = Mock(wraps=json.loads)
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            json_loads=json_loads,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        devices = await api.get_devices()
+        assert len(devices) == 2
+        assert isinstance(json_loads.call_args.args[0], bytes)
+
+        # The default decoder should handle the same payload:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            session=session,
+        )
+        assert await api.get_devices() == devices
+
+        with pytest.raises(RequestError, match="Invalid JSON"):
+            await api.get_devices()
+
+        # Errors that aren't ValueErrors are converted, too:
+        class DecodeError(Exception):
+            """Define an error that a third-party decoder might raise."""
+
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            json_loads=Mock(side_effect=DecodeError("bad")),
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+        with pytest.raises(RequestError, match="Invalid JSON"):
+            await api.get_devices()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_default_json_loads_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the standard library's decoder is used if orjson isn't installed.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    # Load a separate copy of the module so that the real one is left untouched:
+    spec = importlib.util.find_spec("aioambient.api_request_handler")
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert module.DEFAULT_JSON_LOADS is json.loads
+
+
+@pytest.mark.asyncio
+async def test_debug_logging_skipped(
+    aresponses: ResponsesMockServer, caplog: Mock
+) -> None:
+    """Test that payloads aren't logged unless debug logging is enabled.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+        caplog: A mocked logging facility.
+
+    """
+    caplog.set_level(logging.INFO)
+
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text=load_fixture("devices_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TEST_APP_KEY, TEST_API_KEY, session=session)
+        await api.get_devices()
+
+    assert not any("Received data" in record.message for record in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_stream_device_details(aresponses: ResponsesMockServer) -> None:
+    """Test that device details are yielded before the response has finished.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    first_record_received = asyncio.Event()
+    records = json.loads(load_fixture("device_details_response.json"))
+
+    async def _handler(request: web.Request) -> web.StreamResponse:
+        """Send the first record and wait for it to be received before finishing.
+
+        Args:
+        ----
+            request: The request.
+
+        Returns:
+        -------
+            A streamed response.
+
+        """
+        response = web.StreamResponse(
+            headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+        await response.prepare(request)
+        await response.write(f"[{json.dumps(records[0])},".encode())
+        await first_record_received.wait()
+        await response.write(f"{json.dumps(records[1])}]".encode())
+        await response.write_eof()
+        return response
+
+    aresponses.add("rt.ambientweather.net", f"/v1/devices/{TEST_MAC}", "get", _handler)
+    aresponses.add(
+        "rt.ambientweather.net",
+        f"/v1/devices/{TEST_MAC}",
+        "get",
+        aresponses.Response(
+            text='[{"dateutc": 1}, {"dateutc"',
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "rt.ambientweather.net",
+        f"/v1/devices/{TEST_MAC}",
+        "get",
+        aresponses.Response(text="", status=500),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        streamed = []
+        async for record in api.stream_device_details(TEST_MAC):
+            streamed.append(record)
+            first_record_received.set()
+        assert streamed == records
+
+        streamed = []
+        with pytest.raises(RequestError, match="Invalid JSON"):
+            async for record in api.stream_device_details(TEST_MAC):
+                streamed.append(record)
+        assert streamed == [{"dateutc": 1}]
+
+        with pytest.raises(RequestError):
+            async for _ in api.stream_device_details(
+                TEST_MAC, end_date=datetime.date(2019, 1, 6)
+            ):
+                pass
 
-    devices = await api.get_devices()
-    assert len(devices) == 2
+    aresponses.assert_plan_strictly_followed()
@@ -0,0 +1,70 @@
+"""Define tests for the data batcher."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aioambient.batcher import DataBatcher
+
+
+@pytest.mark.asyncio
+async def test_cancel() -> None:
+    """Test that a cancelled batch is dropped (along with its timer)."""
+    target = AsyncMock()
+    batcher = DataBatcher(target, max_latency=0.01)
+
+    await batcher.add({"idx": 0})
+    await batcher.add({"idx": 1})
+    assert len(batcher) == 2
+
+    assert batcher.cancel() == [{"idx": 0}, {"idx": 1}]
+    assert len(batcher) == 0
+    await asyncio.sleep(0.05)
+    target.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_prepend() -> None:
+    """Test that another batcher's cancelled batch can be delivered instead."""
+    target = AsyncMock()
+    batcher = DataBatcher(target, max_latency=0.01)
+    other_target = AsyncMock()
+    other_batcher = DataBatcher(other_target, max_latency=0.01)
+
+    # An empty batch doesn't start the timer:
+    other_batcher.prepend(batcher.cancel())
+    assert other_batcher._timer is None
+
+    await batcher.add({"idx": 0})
+    await other_batcher.add({"idx": 1})
+    other_batcher.prepend(batcher.cancel())
+    assert len(other_batcher) == 2
+
+    await asyncio.sleep(0.05)
+    target.assert_not_awaited()
+    other_target.assert_awaited_once_with([{"idx": 0}, {"idx": 1}])
+
+
+@pytest.mark.asyncio
+async def test_timer_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that an error delivering a batch on a timer is logged.
+
+    Args:
+    ----
+        caplog: The pytest caplog fixture.
+
+    """
+    target = AsyncMock(side_effect=[Exception("boom"), None])
+    batcher = DataBatcher(target, max_latency=0.01)
+
+    await batcher.add({"idx": 0})
+    await asyncio.sleep(0.05)
+    assert "Error while handling a batch of data: boom" in caplog.text
+    assert not batcher._flush_tasks
+
+    # Later batches are still delivered:
+    await batcher.add({"idx": 1})
+    await asyncio.sleep(0.05)
+    target.assert_awaited_with([{"idx": 1}])
+    assert target.await_count == 2
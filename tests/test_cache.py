@@ -0,0 +1,262 @@
+"""Define tests for the response cache."""
+
+import asyncio
+
+import aiohttp
+from aresponses import ResponsesMockServer
+import pytest
+
+from aioambient import API
+from aioambient.cache import ResponseCache
+from aioambient.errors import RequestError
+
+from .common import TEST_APP_KEY, TEST_MAC, load_fixture
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted."""
+    cache = ResponseCache(max_size=2)
+    cache.set("a", "devices", 1)
+    cache.set("b", "devices", 2)
+
+    # Touch "a" so that "b" becomes the least recently used entry:
+    assert cache.get("a", "devices") == (1, False)
+    cache.set("c", "devices", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b", "devices") is None
+    assert cache.get("c", "devices") == (3, False)
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_expiration() -> None:
+    """Test that entries go stale and then expire."""
+    cache = ResponseCache(default_ttl=0.05, stale_ttl=0.05)
+    cache.set("a", "devices", 1)
+    assert cache.get("a", "devices") == (1, False)
+
+    await asyncio.sleep(0.06)
+    assert cache.get("a", "devices") == (1, True)
+    assert cache.stale_hits == 1
+
+    await asyncio.sleep(0.05)
+    assert cache.get("a", "devices") is None
+    assert len(cache) == 0
+
+
+def test_endpoint_ttls() -> None:
+    """Test per-endpoint TTLs."""
+    cache = ResponseCache(default_ttl=10, ttls={"devices": 0, "devices/*": 30})
+    assert cache.ttl_for("devices") == 0
+    assert cache.ttl_for(f"devices/{TEST_MAC}") == 30
+    assert cache.ttl_for("other") == 10
+
+    # A TTL of 0 disables caching (and lookups aren't counted as misses):
+    cache.set("a", "devices", 1)
+    assert cache.get("a", "devices") is None
+    assert cache.misses == 0
+    assert cache.get("a", "other") is None
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_api_cache(aresponses: ResponsesMockServer) -> None:
+    """Test that repeated requests are served from the cache.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text=load_fixture("devices_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+
+    cache = ResponseCache()
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TEST_APP_KEY, "cache_api_key", cache=cache, session=session)
+
+        devices = await api.get_devices()
+        assert await api.get_devices() is devices
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    # Credentials are only hashed into the cache key:
+    assert "cache_api_key" not in repr(list(cache._entries))
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_api_cache_shared_between_credentials(
+    aresponses: ResponsesMockServer,
+) -> None:
+    """Test that a shared cache doesn't serve one account's response to another.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    for mac_address in ("first", "second"):
+        aresponses.add(
+            "rt.ambientweather.net",
+            "/v1/devices",
+            "get",
+            aresponses.Response(
+                text=f'[{{"macAddress": "{mac_address}"}}]',
+                status=200,
+                headers={"Content-Type": "application/json; charset=utf-8"},
+            ),
+        )
+
+    cache = ResponseCache()
+
+    async with aiohttp.ClientSession() as session:
+        first_api = API(TEST_APP_KEY, "first_api_key", cache=cache, session=session)
+        second_api = API(TEST_APP_KEY, "second_api_key", cache=cache, session=session)
+
+        assert await first_api.get_devices() == [{"macAddress": "first"}]
+        assert await second_api.get_devices() == [{"macAddress": "second"}]
+        assert await first_api.get_devices() == [{"macAddress": "first"}]
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_api_cache_stale_while_revalidate(
+    aresponses: ResponsesMockServer,
+) -> None:
+    """Test that stale entries are served while being refreshed.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text='[{"macAddress": "old"}]',
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text='[{"macAddress": "new"}]',
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(text="", status=500),
+    )
+
+    cache = ResponseCache(default_ttl=0.01, stale_ttl=60)
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            "swr_api_key",
+            cache=cache,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        assert await api.get_devices() == [{"macAddress": "old"}]
+        await asyncio.sleep(0.02)
+
+        # The stale response is returned immediately and refreshed in the background:
+        assert await api.get_devices() == [{"macAddress": "old"}]
+        await asyncio.gather(*api._in_flight.values())
+        assert await api.get_devices() == [{"macAddress": "new"}]
+
+        # A failed revalidation leaves the stale response in place:
+        await asyncio.sleep(0.02)
+        assert await api.get_devices() == [{"macAddress": "new"}]
+        await asyncio.gather(*api._in_flight.values(), return_exceptions=True)
+        assert await api.get_devices() == [{"macAddress": "new"}]
+
+
+@pytest.mark.asyncio
+async def test_api_cache_errors_not_cached(aresponses: ResponsesMockServer) -> None:
+    """Test that errors aren't cached.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(text="", status=500),
+    )
+
+    cache = ResponseCache()
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TEST_APP_KEY, "cache_error_api_key", cache=cache, session=session)
+
+        with pytest.raises(RequestError):
+            await api.get_devices()
+        assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_api_cache_only_get(aresponses: ResponsesMockServer) -> None:
+    """Test that only GET requests are cached.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    for idx in range(2):
+        aresponses.add(
+            "rt.ambientweather.net",
+            "/v1/devices",
+            "post",
+            aresponses.Response(
+                text=f'{{"idx": {idx}}}',
+                status=200,
+                headers={"Content-Type": "application/json; charset=utf-8"},
+            ),
+        )
+
+    cache = ResponseCache()
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TEST_APP_KEY, "cache_post_api_key", cache=cache, session=session)
+
+        assert await api._request("post", "devices") == {"idx": 0}
+        assert await api._request("post", "devices") == {"idx": 1}
+        assert len(cache) == 0
+
+    aresponses.assert_plan_strictly_followed()
@@ -1,5 +1,11 @@
 """Test the climate utilities."""
 
+import math
+import warnings
+
+import pytest
+
+from aioambient.util import climate_utils
 from aioambient.util.climate_utils import ClimateUtils
 
 
@@ -23,3 +29,115 @@ def test_feels_like() -> None:
     assert ClimateUtils.feels_like_fahrenheit(80.0, 90.0, 10.0) == 86.34189169999989
     assert ClimateUtils.feels_like_celsius(None, None, None) is None
     assert ClimateUtils.feels_like_celsius(26.6667, 90.0, 16.0934) == 30.190028154626233
+
+
+# Readings that exercise every branch of the feels like calculation:
+TEMPS = [None, 30.0, 40.0, 50.0, 60.0, 70.0, 79.9, 80.0, 86.0, 90.0, 100.0, 115.0]
+HUMIDITIES = [None, 5.0, 10.0, 12.9, 13.0, 50.0, 70.0, 85.0, 90.0, 100.0, 105.0]
+WIND_SPEEDS = [None, 0.0, 3.0, 3.1, 10.0, 25.0]
+READINGS = [
+    (temp, humidity, wind_speed)
+    for temp in TEMPS
+    for humidity in HUMIDITIES
+    for wind_speed in WIND_SPEEDS
+]
+
+
+def test_batch_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the pure-Python batch calculations match the scalar ones exactly.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr(climate_utils, "HAS_NUMPY", False)
+    temps, humidities, wind_speeds = zip(*READINGS, strict=True)
+
+    # Missing values yield NaN (as they do with NumPy):
+    assert ClimateUtils.dew_point_fahrenheit_batch(temps, humidities) == pytest.approx(
+        [
+            math.nan if dew_point is None else dew_point
+            for dew_point in (
+                ClimateUtils.dew_point_fahrenheit(temp, humidity)
+                for temp, humidity, _ in READINGS
+            )
+        ],
+        abs=0,
+        nan_ok=True,
+        rel=0,
+    )
+    assert ClimateUtils.feels_like_fahrenheit_batch(
+        temps, humidities, wind_speeds
+    ) == pytest.approx(
+        [
+            math.nan if feels_like is None else feels_like
+            for feels_like in (
+                ClimateUtils.feels_like_fahrenheit(*reading) for reading in READINGS
+            )
+        ],
+        abs=0,
+        nan_ok=True,
+        rel=0,
+    )
+
+    dew_points = ClimateUtils.dew_point_fahrenheit_batch([50.0], [0.0])
+    assert math.isnan(dew_points[0])
+
+
+def test_batch_numpy() -> None:
+    """Test that the NumPy batch calculations match the scalar ones exactly."""
+    np = pytest.importorskip("numpy")
+    temps, humidities, wind_speeds = zip(*READINGS, strict=True)
+
+    np.testing.assert_array_equal(
+        ClimateUtils.dew_point_fahrenheit_batch(temps, humidities),
+        # NumPy converts None to NaN:
+        np.array(
+            [
+                ClimateUtils.dew_point_fahrenheit(temp, humidity)
+                for temp, humidity, _ in READINGS
+            ],
+            dtype=float,
+        ),
+    )
+    np.testing.assert_array_equal(
+        ClimateUtils.feels_like_fahrenheit_batch(
+            np.array(temps, dtype=float), humidities, wind_speeds
+        ),
+        np.array(
+            [ClimateUtils.feels_like_fahrenheit(*reading) for reading in READINGS],
+            dtype=float,
+        ),
+    )
+
+    # Random readings (where the vectorized logarithm and power functions would
+    # differ from the scalar ones in the last bit) match exactly, too:
+    rng = np.random.default_rng(0)
+    temps = rng.uniform(-40, 130, 10000)
+    humidities = rng.uniform(1, 100, 10000)
+    wind_speeds = rng.uniform(0, 60, 10000)
+    np.testing.assert_array_equal(
+        ClimateUtils.dew_point_fahrenheit_batch(temps, humidities),
+        [
+            ClimateUtils.dew_point_fahrenheit(temp, humidity)
+            for temp, humidity in zip(temps.tolist(), humidities.tolist(), strict=True)
+        ],
+    )
+    np.testing.assert_array_equal(
+        ClimateUtils.feels_like_fahrenheit_batch(temps, humidities, wind_speeds),
+        [
+            ClimateUtils.feels_like_fahrenheit(*reading)
+            for reading in zip(
+                temps.tolist(), humidities.tolist(), wind_speeds.tolist(), strict=True
+            )
+        ],
+    )
+
+    # A humidity of zero or a negative wind speed raises no warnings:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert np.isnan(ClimateUtils.dew_point_fahrenheit_batch([50.0], [0.0])).all()
+        np.testing.assert_array_equal(
+            ClimateUtils.feels_like_fahrenheit_batch([30.0], [50.0], [-2.0]), [30.0]
+        )
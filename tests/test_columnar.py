@@ -0,0 +1,122 @@
+"""Define tests for columnar batches."""
+
+from array import array
+import datetime
+import math
+from typing import Any
+
+import aiohttp
+from aresponses import ResponsesMockServer
+import pytest
+
+from aioambient import API
+from aioambient.columnar import ColumnarBatch
+
+from .common import TEST_API_KEY, TEST_APP_KEY, TEST_MAC, load_fixture
+
+RECORDS: list[dict[str, Any]] = [
+    {"dateutc": 3, "tempf": 70, "humidity": 40, "date": "c", "batt": True},
+    {"dateutc": 2, "humidity": 41.5},
+    {"dateutc": 1, "tempf": 72.5, "humidity": None, "uv": 1},
+]
+
+
+def test_from_records() -> None:
+    """Test building a batch in a single pass."""
+    batch = ColumnarBatch.from_records(RECORDS)
+
+    assert batch.num_rows == 3
+    assert batch.timestamps == array("q", [3, 2, 1])
+    assert sorted(batch) == ["humidity", "tempf", "uv"]
+    assert len(batch) == 3
+
+    assert batch["tempf"][0] == 70.0
+    assert math.isnan(batch["tempf"][1])
+    assert batch["tempf"][2] == 72.5
+    assert batch.valid("tempf") == bytearray([1, 0, 1])
+
+    assert batch.valid("humidity") == bytearray([1, 1, 0])
+    assert batch.valid("uv") == bytearray([0, 0, 1])
+
+    batch = ColumnarBatch.from_records(RECORDS, fields={"tempf"})
+    assert list(batch) == ["tempf"]
+
+
+def test_concat() -> None:
+    """Test concatenating batches."""
+    batch = ColumnarBatch.concat(
+        [
+            ColumnarBatch.from_records(RECORDS[:1]),
+            ColumnarBatch.from_records(RECORDS[1:]),
+        ]
+    )
+
+    assert batch.timestamps == array("q", [3, 2, 1])
+    assert batch.valid("tempf") == bytearray([1, 0, 1])
+    assert batch.valid("uv") == bytearray([0, 0, 1])
+    assert batch["humidity"][:2] == array("d", [40, 41.5])
+
+    assert ColumnarBatch.concat([]).num_rows == 0
+
+
+def test_numpy() -> None:
+    """Test NumPy-backed columns."""
+    np = pytest.importorskip("numpy")
+
+    batch = ColumnarBatch.from_records(RECORDS, use_numpy=True)
+    assert isinstance(batch["tempf"], np.ndarray)
+    assert batch.timestamps.tolist() == [3, 2, 1]
+    assert batch.valid("tempf").tolist() == [True, False, True]
+    assert np.nanmean(batch["tempf"]) == 71.25
+
+
+@pytest.mark.asyncio
+async def test_api_columnar(aresponses: ResponsesMockServer) -> None:
+    """Test retrieving device details and history as columnar batches.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        f"/v1/devices/{TEST_MAC}",
+        "get",
+        aresponses.Response(
+            text=load_fixture("device_details_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+        repeat=aresponses.INFINITY,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+
+        batch = await api.get_device_details_columnar(TEST_MAC, fields=["tempf"])
+        assert batch.timestamps == array("q", [1547094300000, 1547094000000])
+        assert batch["tempf"] == array("d", [34, 34])
+
+        batches = [
+            batch
+            async for batch in api.iter_device_history_batches(
+                TEST_MAC, datetime.datetime(2019, 1, 1, tzinfo=datetime.UTC), limit=1
+            )
+        ]
+        assert [batch.num_rows for batch in batches] == [1, 1]
+        assert ColumnarBatch.concat(batches)["humidity"] == array("d", [49, 50])
+
+        batches = [
+            batch
+            async for batch in api.iter_device_history_batches(
+                TEST_MAC, datetime.datetime(2019, 1, 1, tzinfo=datetime.UTC)
+            )
+        ]
+        assert [batch.num_rows for batch in batches] == [2]
@@ -0,0 +1,32 @@
+"""Define tests for the deduplicator."""
+
+from aioambient.dedupe import Deduplicator
+
+from .common import TEST_MAC
+
+
+def test_replays_are_suppressed() -> None:
+    """Test that data that isn't newer than the watermark is suppressed."""
+    deduplicator = Deduplicator()
+
+    assert deduplicator.accept({"macAddress": TEST_MAC, "dateutc": 2000})
+    # A replay and an out-of-order message:
+    assert not deduplicator.accept({"macAddress": TEST_MAC, "dateutc": 2000})
+    assert not deduplicator.accept({"macAddress": TEST_MAC, "dateutc": 1000})
+    assert deduplicator.accept({"macAddress": TEST_MAC, "dateutc": 3000})
+    # Other devices have their own watermarks:
+    assert deduplicator.accept({"macAddress": "00:00:00:00:00:01", "dateutc": 1000})
+
+    assert deduplicator.suppressed == 2
+    assert deduplicator.get_watermark(TEST_MAC) == 3000
+    assert deduplicator.get_watermark("00:00:00:00:00:02") is None
+
+
+def test_unidentified_data() -> None:
+    """Test that data without a MAC address or timestamp is always accepted."""
+    deduplicator = Deduplicator()
+
+    for _ in range(2):
+        assert deduplicator.accept({"macAddress": TEST_MAC})
+        assert deduplicator.accept({"dateutc": 1000})
+    assert deduplicator.suppressed == 0
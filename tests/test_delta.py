@@ -0,0 +1,64 @@
+"""Define tests for the delta tracker."""
+
+from aioambient.delta import DeltaTracker
+
+from .common import TEST_MAC
+
+
+def test_changed_fields() -> None:
+    """Test that only changed fields are reported."""
+    tracker = DeltaTracker()
+    data = {"macAddress": TEST_MAC, "dateutc": 1000, "tempf": 70.0, "battout": 1}
+
+    assert tracker.diff(data) == data
+    assert tracker.diff({**data, "dateutc": 2000}) == {}
+    assert tracker.diff({**data, "dateutc": 3000, "tempf": 70.5}) == {
+        "macAddress": TEST_MAC,
+        "dateutc": 3000,
+        "tempf": 70.5,
+    }
+    # Removed fields are reported as None (once):
+    assert tracker.diff({"macAddress": TEST_MAC, "dateutc": 4000, "tempf": 70.5}) == {
+        "macAddress": TEST_MAC,
+        "dateutc": 4000,
+        "battout": None,
+    }
+    assert tracker.diff({"macAddress": TEST_MAC, "dateutc": 5000, "tempf": 70.5}) == {}
+
+
+def test_epsilons() -> None:
+    """Test that numeric fields must move by more than their epsilon."""
+    tracker = DeltaTracker(default_epsilon=0.1, epsilons={"baromrelin": 0.01})
+    tracker.diff({"macAddress": TEST_MAC, "tempf": 70.0, "baromrelin": 29.90})
+
+    assert tracker.diff({"macAddress": TEST_MAC, "tempf": 70.05}) == {
+        "macAddress": TEST_MAC,
+        "baromrelin": None,
+    }
+    # Changes are measured from the last reported value, so slow drifts add up:
+    assert tracker.diff({"macAddress": TEST_MAC, "tempf": 70.08}) == {}
+    assert tracker.diff({"macAddress": TEST_MAC, "tempf": 70.15}) == {
+        "macAddress": TEST_MAC,
+        "tempf": 70.15,
+    }
+    assert tracker.diff({"macAddress": TEST_MAC, "tempf": 70.15, "baromrelin": 29.90})
+
+
+def test_booleans_and_reset() -> None:
+    """Test that booleans are compared exactly and that state can be forgotten."""
+    tracker = DeltaTracker(default_epsilon=5)
+    data = {"macAddress": TEST_MAC, "online": True}
+    tracker.diff(data)
+
+    assert tracker.diff({"macAddress": TEST_MAC, "online": False}) == {
+        "macAddress": TEST_MAC,
+        "online": False,
+    }
+
+    tracker.reset(TEST_MAC)
+    assert tracker.diff(data) == data
+    tracker.reset()
+    assert tracker.diff(data) == data
+
+    # Data that can't be attributed to a device is reported in full:
+    assert tracker.diff({"tempf": 70.0}) == {"tempf": 70.0}
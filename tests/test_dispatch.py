@@ -0,0 +1,187 @@
+"""Define tests for the dispatch queue."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aioambient.dispatch import DispatchQueue, OverflowPolicy
+
+from .common import TEST_MAC
+
+
+@pytest.mark.asyncio
+async def test_block() -> None:
+    """Test that putting into a full queue waits for room."""
+    queue = DispatchQueue(max_size=2)
+    handled = []
+
+    async def _handler(data: dict) -> None:
+        """Record the data.
+
+        Args:
+        ----
+            data: The data.
+
+        """
+        handled.append(data["idx"])
+
+    await queue.put({"idx": 0})
+    await queue.put({"idx": 1})
+    assert queue.depth == 2
+
+    put_task = asyncio.create_task(queue.put({"idx": 2}))
+    await asyncio.sleep(0)
+    assert not put_task.done()
+
+    queue.start(_handler)
+    await put_task
+    await queue.join()
+    assert handled == [0, 1, 2]
+    assert queue.dropped == 0
+
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest() -> None:
+    """Test that the oldest message is dropped to make room."""
+    queue = DispatchQueue(max_size=2, overflow=OverflowPolicy.DROP_OLDEST)
+    handler = AsyncMock()
+
+    for idx in range(5):
+        await queue.put({"idx": idx})
+    assert queue.depth == 2
+    assert queue.dropped == 3
+
+    queue.start(handler)
+    await queue.stop()
+    assert [call.args[0]["idx"] for call in handler.call_args_list] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_latest_per_mac() -> None:
+    """Test that only the latest message from each device is kept."""
+    queue = DispatchQueue(max_size=2, overflow=OverflowPolicy.LATEST_PER_MAC)
+    handler = AsyncMock()
+
+    await queue.put({"macAddress": TEST_MAC, "idx": 0})
+    await queue.put({"macAddress": "AA:AA:AA:AA:AA:AA", "idx": 1})
+    await queue.put({"macAddress": TEST_MAC, "idx": 2})
+    assert queue.depth == 2
+    assert queue.dropped == 1
+
+    # The queue is full of messages from distinct devices, so this waits:
+    put_task = asyncio.create_task(queue.put({"idx": 3}))
+    await asyncio.sleep(0)
+    assert not put_task.done()
+
+    queue.start(handler)
+    await put_task
+    await queue.stop()
+
+    # The replaced message keeps its place in line:
+    assert [call.args[0]["idx"] for call in handler.call_args_list] == [2, 1, 3]
+
+
+@pytest.mark.asyncio
+async def test_handler_errors_and_stop() -> None:
+    """Test that handler errors are logged and that stopping can drop messages."""
+    queue = DispatchQueue(workers=2)
+    handler = AsyncMock(side_effect=[ValueError("boom"), None])
+
+    queue.start(handler)
+    await queue.put({"idx": 0})
+    await queue.put({"idx": 1})
+    await queue.join()
+    assert handler.call_count == 2
+
+    await queue.stop()
+    await queue.put({"idx": 2})
+    await queue.stop(drain=False)
+    assert queue.depth == 0
+    assert queue.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_latest_per_mac_while_blocked() -> None:
+    """Test that a blocked put replaces a message from the same device."""
+    queue = DispatchQueue(max_size=2, overflow=OverflowPolicy.LATEST_PER_MAC)
+    handled = []
+
+    async def _handler(data: dict) -> None:
+        """Record the data.
+
+        Args:
+        ----
+            data: The data.
+
+        """
+        handled.append(data["idx"])
+
+    await queue.put({"macAddress": "00:00:00:00:00:01", "idx": 0})
+    await queue.put({"macAddress": "00:00:00:00:00:02", "idx": 1})
+
+    # Both wait for room; the second finds the first's message still waiting:
+    first_put = asyncio.create_task(queue.put({"macAddress": TEST_MAC, "idx": 2}))
+    second_put = asyncio.create_task(queue.put({"macAddress": TEST_MAC, "idx": 3}))
+    await asyncio.sleep(0)
+
+    queue.start(_handler)
+    await asyncio.gather(first_put, second_put)
+    await queue.join()
+    assert handled == [0, 1, 3]
+    assert queue.dropped == 1
+
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_start_twice() -> None:
+    """Test that starting a running queue only replaces its handler."""
+    queue = DispatchQueue()
+    first_handler = AsyncMock()
+    second_handler = AsyncMock()
+
+    queue.start(first_handler)
+    worker_tasks = list(queue._worker_tasks)
+    queue.start(second_handler)
+    assert queue._worker_tasks == worker_tasks
+
+    await queue.put({"idx": 0})
+    await queue.join()
+    first_handler.assert_not_awaited()
+    second_handler.assert_awaited_once_with({"idx": 0})
+
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_from_handler() -> None:
+    """Test that a handler can stop the queue without waiting for itself."""
+    queue = DispatchQueue(workers=2)
+    stopped = asyncio.Event()
+
+    async def _handler(data: dict) -> None:
+        """Stop the queue.
+
+        Args:
+        ----
+            data: The data.
+
+        """
+        await queue.stop()
+        stopped.set()
+
+    queue.start(_handler)
+    worker_tasks = list(queue._worker_tasks)
+    await queue.put({"idx": 0})
+    await queue.put({"idx": 1})
+
+    await asyncio.wait_for(stopped.wait(), 1)
+    await asyncio.sleep(0)
+
+    # Every worker (including the one that stopped the queue) has exited:
+    assert all(task.done() for task in worker_tasks)
+    assert queue.depth == 0
+    assert queue.dropped == 1
@@ -0,0 +1,58 @@
+"""Define tests for event streams."""
+
+import asyncio
+
+import pytest
+
+from aioambient.event_stream import EventStreams
+
+
+@pytest.mark.asyncio
+async def test_every_stream_receives_every_event() -> None:
+    """Test that each stream gets every event put after it is first iterated."""
+    event_streams: EventStreams[int] = EventStreams()
+    await event_streams.put(0)
+
+    async def read_stream() -> list[int]:
+        """Read every event from a stream.
+
+        Returns
+        -------
+            The events.
+
+        """
+        return [event async for event in event_streams.stream()]
+
+    tasks = [asyncio.create_task(read_stream()) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert len(event_streams) == 2
+
+    for event in (1, 2):
+        await event_streams.put(event)
+    event_streams.close()
+
+    assert await asyncio.wait_for(asyncio.gather(*tasks), 1) == [[1, 2], [1, 2]]
+    assert not event_streams
+
+
+@pytest.mark.asyncio
+async def test_full_buffer() -> None:
+    """Test that putting into a full stream waits for it to be read."""
+    event_streams: EventStreams[int] = EventStreams()
+    stream = event_streams.stream(buffer_size=1)
+    first_event = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    await event_streams.put(1)
+    await event_streams.put(2)
+    blocked = asyncio.create_task(event_streams.put(3))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    assert await first_event == 1
+    assert await anext(stream) == 2
+    await asyncio.wait_for(blocked, 1)
+
+    # A stream that is closed while full ends once it has been read:
+    event_streams.close()
+    assert [event async for event in stream] == [3]
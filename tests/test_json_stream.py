@@ -0,0 +1,101 @@
+"""Define tests for the streaming JSON parser."""
+
+import json
+
+import pytest
+
+from aioambient.json_stream import JsonArrayStreamParser
+
+
+def _parse_bytewise(parser: JsonArrayStreamParser, document: bytes) -> list:
+    """Feed a document to a parser one byte at a time.
+
+    Args:
+    ----
+        parser: The parser.
+        document: The document.
+
+    Returns:
+    -------
+        Every parsed item.
+
+    """
+    items = []
+    for idx in range(len(document)):
+        items.extend(parser.feed(document[idx : idx + 1]))
+    parser.close()
+    return items
+
+
+def test_top_level_array() -> None:
+    """Test parsing a top-level array in arbitrarily small chunks."""
+    records = [{"dateutc": 1, "tempf": 71.5, "name": "Café"}, 12345, 1.5e-3, "a", None]
+    document = json.dumps(records, ensure_ascii=False).encode()
+    assert _parse_bytewise(JsonArrayStreamParser(), document) == records
+
+
+def test_items_yielded_as_they_arrive() -> None:
+    """Test that items are returned as soon as they are complete."""
+    parser = JsonArrayStreamParser()
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    # A number at the end of a chunk may not be complete yet:
+    assert parser.feed(b": 2}, 3") == [{"b": 2}]
+    assert parser.feed(b"4, 5") == [34]
+    # ...including its fraction or exponent:
+    assert parser.feed(b".") == []
+    assert parser.feed(b"25e") == []
+    assert parser.feed(b"2]") == [5.25e2]
+    parser.close()
+
+
+def test_empty_array() -> None:
+    """Test parsing an empty array."""
+    parser = JsonArrayStreamParser()
+    assert parser.feed(b"[ ]") == []
+    parser.close()
+
+
+def test_keyed_array() -> None:
+    """Test parsing an array under a key of a top-level object."""
+    document = json.dumps(
+        {"meta": {"data": [0]}, "data": [{"a": 1}, {"b": 2}], "after": 1}
+    ).encode()
+    assert _parse_bytewise(JsonArrayStreamParser("data"), document) == [
+        {"a": 1},
+        {"b": 2},
+    ]
+
+    for document in (b'{"other": []}', b"{}"):
+        parser = JsonArrayStreamParser("data")
+        assert parser.feed(document) == []
+        parser.close()
+
+
+@pytest.mark.parametrize(
+    ("key", "document"),
+    [
+        (None, b'[{"a": 1},'),
+        (None, b'{"a": 1}'),
+        (None, b"[1 2]"),
+        ("data", b'{"data": {}}'),
+        ("data", b'{"data" []}'),
+        ("data", b'{,"data": []}'),
+        ("data", b'{"a": 1,, "data": []}'),
+        ("data", b'{"a": 1,}'),
+        ("data", b'{"a": 1 "data": []}'),
+        ("data", b'{1: 2, "data": []}'),
+    ],
+)
+def test_invalid_documents(key: str | None, document: bytes) -> None:
+    """Test that invalid or incomplete documents raise.
+
+    Args:
+    ----
+        key: The key that holds the array.
+        document: The document.
+
+    """
+    parser = JsonArrayStreamParser(key)
+    with pytest.raises(ValueError):  # noqa: PT011
+        parser.feed(document)
+        parser.close()
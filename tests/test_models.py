@@ -0,0 +1,73 @@
+"""Define tests for the typed models."""
+
+import copy
+from datetime import UTC, datetime
+import json
+
+import pytest
+
+from aioambient.models import _SCHEMAS, MAX_SCHEMAS, Device, Observation, get_schema
+
+from .common import load_fixture
+
+
+def test_device_round_trip() -> None:
+    """Test converting devices to and from dicts."""
+    data = json.loads(load_fixture("devices_response.json"))
+    devices = Device.from_dicts(data)
+
+    assert devices[0].mac_address == "84:F3:EB:21:90:C4"
+    assert devices[0].info == {"name": "Home", "location": "Home"}
+    assert devices[0].last_data
+    assert devices[0].last_data.tempinf == 68.9
+    assert repr(devices[0]) == "Device('84:F3:EB:21:90:C4')"
+    assert [device.as_dict() for device in devices] == data
+
+    device = Device.from_dict({"macAddress": "AA", "apiKey": "abc"})
+    assert device.last_data is None
+    assert device.as_dict() == {"macAddress": "AA", "apiKey": "abc"}
+
+    # An empty info dict survives the round trip:
+    data = [{"macAddress": "AA", "info": {}}]
+    assert [device.as_dict() for device in Device.from_dicts(data)] == data
+
+
+def test_observation_fields() -> None:
+    """Test reading observation fields."""
+    data = json.loads(load_fixture("device_details_response.json"))
+    observations = Observation.from_dicts(data)
+
+    observation = observations[0]
+    assert observation.dateutc == datetime(2019, 1, 10, 4, 25, tzinfo=UTC)
+    assert observation.get("dateutc") == 1547094300000
+    assert observation.date == "2019-01-10T04:25:00.000Z"
+
+    # Sensor values are converted to floats:
+    assert observation.tempf == 34.0
+    assert isinstance(observation.tempf, float)
+
+    # Missing optional sensors read as None; anything else raises:
+    assert observation.yearlyrainin is None
+    assert observation.get("yearlyrainin", 0) == 0
+    with pytest.raises(AttributeError):
+        _ = observation.not_a_field
+
+    assert [item.as_dict() for item in observations] == data
+    assert repr(observation).startswith("Observation({'dateutc': 1547094300000")
+
+    # Observations with the same fields share a schema:
+    assert observations[0]._schema is observations[1]._schema
+    assert observation.fields == tuple(data[0])
+
+    assert copy.copy(observation).as_dict() == data[0]
+
+    observation = Observation.from_dict({"tempf": None})
+    assert observation.dateutc is None
+    assert observation.tempf is None
+
+
+def test_schema_limit() -> None:
+    """Test that the schema registry doesn't grow without bound."""
+    for idx in range(1100):
+        get_schema((f"field_{idx}",))
+    assert len(_SCHEMAS) <= MAX_SCHEMAS
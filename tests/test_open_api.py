@@ -1,12 +1,18 @@
 """Define tests for the REST API."""
 
 import re
+from typing import Any
 
 import aiohttp
+from aiohttp import web
 from aresponses import ResponsesMockServer
 import pytest
 
 from aioambient import OpenAPI
+from aioambient.errors import RequestError
+from aioambient.open_api import _get_first_request_error
+from aioambient.rate_limiter import RateLimiter
+from aioambient.util.location_utils import LocationUtils
 
 from .common import TEST_MAC, load_fixture
 
@@ -70,3 +76,260 @@ async def test_get_devices_by_location(aresponses: ResponsesMockServer) -> None:
 
         assert "dewPoint" in devices[0]["lastData"]
         assert "feelsLike" in devices[0]["lastData"]
+
+
+@pytest.mark.asyncio
+async def test_stream_devices_by_location(
+    aresponses: ResponsesMockServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test streaming devices from the open REST API.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    aresponses.add(
+        "lightning.ambientweather.net",
+        re.compile(r"/devices.*"),
+        "get",
+        aresponses.Response(
+            text=load_fixture("devices_by_location_open_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+    aresponses.add(
+        "lightning.ambientweather.net",
+        re.compile(r"/devices.*"),
+        "get",
+        aresponses.Response(
+            text='{"meta": {},, "data": []}',
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = OpenAPI(session=session)
+        monkeypatch.setattr(api, "_rate_limiter", RateLimiter(rate=1000, burst=10))
+
+        devices = [
+            device async for device in api.stream_devices_by_location(32.5, -97.3, 1.5)
+        ]
+        assert len(devices) == 6
+
+        assert "dewPoint" in devices[0]["lastData"]
+        assert "feelsLike" in devices[0]["lastData"]
+
+        # A malformed object raises the same error as it would without streaming:
+        with pytest.raises(RequestError, match="Invalid JSON"):
+            async for _ in api.stream_devices_by_location(32.5, -97.3, 1.5):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_scan_region(
+    aresponses: ResponsesMockServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test scanning a region with more devices than a single request returns.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    latitude, longitude = 32.5, -97.3
+
+    # A dense cluster of 144 stations around the center (more than the 100 that a
+    # single request returns), plus one in the corner of the bounding box (which is
+    # outside of the radius):
+    locations = [
+        (latitude + row * 0.0005, longitude + column * 0.0005)
+        for row in range(-5, 7)
+        for column in range(-5, 7)
+    ]
+    corner = LocationUtils.get_bounding_box(latitude, longitude, 3.0)
+    locations.append((corner.north - 0.001, corner.east - 0.001))
+    stations = [
+        {
+            "macAddress": f"{idx:012X}",
+            "info": {"coords": {"coords": {"lat": lat, "lon": lon}}},
+            "lastData": {"tempf": 70.0, "humidity": 50},
+        }
+        for idx, (lat, lon) in enumerate(locations)
+    ]
+    requests = []
+
+    async def _handler(request: web.Request) -> web.Response:
+        """Return the stations within the requested box.
+
+        Args:
+        ----
+            request: The request.
+
+        Returns:
+        -------
+            A response.
+
+        """
+        query = request.query
+        west, south = float(query["$publicBox[0][0]"]), float(query["$publicBox[0][1]"])
+        east, north = float(query["$publicBox[1][0]"]), float(query["$publicBox[1][1]"])
+        requests.append((south, west, north, east))
+        in_box = [
+            station
+            for station, (lat, lon) in zip(stations, locations, strict=True)
+            if south <= lat <= north and west <= lon <= east
+        ]
+        return web.json_response({"data": in_box[: int(query["$limit"])]})
+
+    aresponses.add(
+        "lightning.ambientweather.net",
+        "/devices",
+        "get",
+        _handler,
+        repeat=aresponses.INFINITY,
+        match_querystring=False,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = OpenAPI(session=session)
+        monkeypatch.setattr(api, "_rate_limiter", RateLimiter(rate=1000, burst=10))
+
+        devices = await api.scan_region(latitude, longitude, 3.0)
+
+    # The whole region was full, so it was split into quadrants:
+    assert len(requests) == 5
+
+    # Stations on the boundary between quadrants are only returned once, and the
+    # one outside of the radius isn't returned at all:
+    assert len(devices) == 144
+    assert len({device["macAddress"] for device in devices}) == 144
+    assert stations[-1] not in devices
+
+    # Devices are ordered by distance (starting with the one at the center):
+    assert LocationUtils.get_device_location(devices[0]) == (latitude, longitude)
+    assert "dewPoint" in devices[0]["lastData"]
+
+
+@pytest.mark.asyncio
+async def test_scan_region_full_tiny_tile(
+    aresponses: ResponsesMockServer,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a full tile that is too small to subdivide is logged.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+        caplog: The pytest caplog fixture.
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    latitude, longitude = 32.5, -97.3
+
+    # More stations than a single request returns, all at the same spot (plus one
+    # without a location, which can't be placed within the radius):
+    stations: list[dict[str, Any]] = [
+        {
+            "macAddress": f"{idx:012X}",
+            "info": {"coords": {"coords": {"lat": latitude, "lon": longitude}}},
+        }
+        for idx in range(99)
+    ]
+    stations.append({"macAddress": "NO_LOCATION", "info": {}})
+
+    aresponses.add(
+        "lightning.ambientweather.net",
+        "/devices",
+        "get",
+        web.json_response({"data": stations}),
+        match_querystring=False,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = OpenAPI(session=session)
+        monkeypatch.setattr(api, "_rate_limiter", RateLimiter(rate=1000, burst=10))
+
+        devices = await api.scan_region(latitude, longitude, 0.05)
+
+    assert len(devices) == 99
+    assert "too small to subdivide" in caplog.text
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_scan_region_errors(
+    aresponses: ResponsesMockServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that errors from nested tiles are raised as a single RequestError.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    latitude, longitude = 32.5, -97.3
+    stations = [
+        {
+            "macAddress": f"{idx:012X}",
+            "info": {"coords": {"coords": {"lat": latitude, "lon": longitude}}},
+        }
+        for idx in range(100)
+    ]
+
+    # A response without any data is treated as an empty tile (and a sparse region
+    # takes a single request, however large it is):
+    aresponses.add(
+        "lightning.ambientweather.net",
+        "/devices",
+        "get",
+        web.json_response({}),
+        match_querystring=False,
+    )
+    # A full tile is subdivided, and every quadrant fails:
+    aresponses.add(
+        "lightning.ambientweather.net",
+        "/devices",
+        "get",
+        web.json_response({"data": stations}),
+        match_querystring=False,
+    )
+    aresponses.add(
+        "lightning.ambientweather.net",
+        "/devices",
+        "get",
+        aresponses.Response(text="", status=500),
+        match_querystring=False,
+        repeat=4,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = OpenAPI(session=session)
+        monkeypatch.setattr(api, "_rate_limiter", RateLimiter(rate=1000, burst=10))
+
+        assert await api.scan_region(latitude, longitude, 100.0) == []
+
+        with pytest.raises(RequestError):
+            await api.scan_region(latitude, longitude, 3.0)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_get_first_request_error() -> None:
+    """Test getting the first request error from a nested exception group."""
+    error = RequestError("first")
+    group = ExceptionGroup(
+        "outer", [ValueError(), ExceptionGroup("inner", [error, RequestError()])]
+    )
+    assert _get_first_request_error(group) is error
+
+    # Groups without any request errors are returned as-is:
+    group = ExceptionGroup("outer", [ValueError()])
+    assert _get_first_request_error(group) is group
@@ -0,0 +1,134 @@
+"""Define tests for the rate limiter."""
+
+import asyncio
+import gc
+import time
+
+import pytest
+
+from aioambient import API, OpenAPI
+from aioambient.rate_limiter import RateLimiter, get_rate_limiter
+
+from .common import TEST_API_KEY, TEST_APP_KEY
+
+
+@pytest.mark.asyncio
+async def test_burst_is_immediate() -> None:
+    """Test that requests within the burst size aren't delayed."""
+    limiter = RateLimiter(rate=1, burst=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_are_fair() -> None:
+    """Test that concurrent waiters are paced and released in FIFO order."""
+    limiter = RateLimiter(rate=50, burst=1)
+    order: list[int] = []
+
+    async def _acquire(index: int) -> None:
+        """Acquire a token and record the order.
+
+        Args:
+        ----
+            index: The index of the waiter.
+
+        """
+        await limiter.acquire()
+        order.append(index)
+
+    start = time.monotonic()
+    await asyncio.gather(*(_acquire(index) for index in range(5)))
+
+    assert order == [0, 1, 2, 3, 4]
+    # The first request is immediate; the next four wait 20ms apiece:
+    assert time.monotonic() - start >= 0.075
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_token() -> None:
+    """Test that a cancelled waiter hands its reserved token back."""
+    limiter = RateLimiter(rate=1, burst=1)
+    await limiter.acquire()
+
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert limiter._tokens > -1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_keeps_later_reservations() -> None:
+    """Test that cancelling a waiter doesn't let two later requests go out at once."""
+    limiter = RateLimiter(rate=20, burst=1)
+    await limiter.acquire()
+
+    cancelled = asyncio.create_task(limiter.acquire())
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    # The next caller must be scheduled after the waiter (rather than alongside it):
+    start = time.monotonic()
+    await waiter
+    waiter_done = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - waiter_done >= 0.04
+    assert waiter_done - start >= 0.04
+
+
+def test_invalid_parameters() -> None:
+    """Test that invalid rates and bursts are rejected."""
+    with pytest.raises(ValueError, match="Rate"):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError, match="Burst"):
+        RateLimiter(burst=0)
+
+
+def test_shared_by_key() -> None:
+    """Test that API objects with the same key share a rate limiter."""
+    api_1 = API(TEST_APP_KEY, TEST_API_KEY)
+    api_2 = API(TEST_APP_KEY, TEST_API_KEY, rate_limit=10, rate_limit_burst=5)
+    api_3 = API(TEST_APP_KEY, "some_other_api_key", rate_limit=2, rate_limit_burst=3)
+
+    assert api_1._rate_limiter is api_2._rate_limiter
+    assert api_1._rate_limiter is not api_3._rate_limiter
+    assert api_3._rate_limiter
+    assert api_3._rate_limiter.rate == 2
+    assert api_3._rate_limiter.burst == 3
+
+    assert OpenAPI()._rate_limiter is OpenAPI()._rate_limiter
+
+
+def test_conflicting_parameters(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that asking for a different rate for the same key logs a warning.
+
+    Args:
+    ----
+        caplog: A mocked logging utility.
+
+    """
+    limiter = get_rate_limiter("conflicting_key")
+    assert get_rate_limiter("conflicting_key") is limiter
+    assert "A rate limiter already exists" not in caplog.text
+
+    assert get_rate_limiter("conflicting_key", rate=5) is limiter
+    assert limiter.rate == 1
+    assert "A rate limiter already exists" in caplog.text
+
+
+def test_unused_limiters_are_dropped() -> None:
+    """Test that a key's limiter is dropped once nothing uses it."""
+    limiter = get_rate_limiter("dropped_key", rate=5)
+    del limiter
+    gc.collect()
+
+    assert get_rate_limiter("dropped_key", rate=2).rate == 2
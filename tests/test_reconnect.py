@@ -0,0 +1,49 @@
+"""Define tests for the reconnect policy."""
+
+import pytest
+
+from aioambient.reconnect import ReconnectPolicy
+
+
+def test_backoff() -> None:
+    """Test that delays grow exponentially up to the cap."""
+    policy = ReconnectPolicy(initial_delay=1, jitter=False, max_delay=10)
+    assert [policy.get_delay(attempt) for attempt in range(6)] == [1, 2, 4, 8, 10, 10]
+    assert policy.get_delay(10_000) == 10
+
+
+def test_jitter() -> None:
+    """Test that jittered delays stay within the backoff."""
+    policy = ReconnectPolicy(initial_delay=1, max_delay=10)
+    for attempt in range(10):
+        assert 0 <= policy.get_delay(attempt) <= min(10, 2**attempt)
+
+
+def test_max_attempts() -> None:
+    """Test limiting the number of attempts."""
+    assert ReconnectPolicy().should_retry(1_000_000)
+
+    policy = ReconnectPolicy(max_attempts=3)
+    assert policy.should_retry(2)
+    assert not policy.should_retry(3)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"initial_delay": -1},
+        {"initial_delay": 10, "max_delay": 5},
+        {"max_attempts": 0},
+        {"multiplier": 0.5},
+    ],
+)
+def test_invalid_policy(kwargs: dict) -> None:
+    """Test that invalid policies are rejected.
+
+    Args:
+    ----
+        kwargs: The keyword arguments to create the policy with.
+
+    """
+    with pytest.raises(ValueError):  # noqa: PT011
+        ReconnectPolicy(**kwargs)
@@ -0,0 +1,284 @@
+"""Define tests for the sharded websocket."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from socketio.exceptions import SocketIOError
+
+from aioambient.errors import WebsocketError
+from aioambient.reconnect import ReconnectPolicy
+from aioambient.sharding import ShardedWebsocket
+from aioambient.websocket import ConnectionState, DataEvent, SubscribedEvent
+
+from .common import TEST_APP_KEY, TEST_MAC
+
+API_KEYS = [f"api_key_{idx}" for idx in range(5)]
+
+
+def _make_sharded_websocket(**kwargs: ReconnectPolicy | int) -> ShardedWebsocket:
+    """Make a sharded websocket with mocked Socket.IO connections.
+
+    Args:
+    ----
+        **kwargs: Keyword arguments to create the sharded websocket with.
+
+    Returns:
+    -------
+        A ShardedWebsocket.
+
+    """
+    websocket = ShardedWebsocket(TEST_APP_KEY, API_KEYS, **kwargs)  # type: ignore[arg-type]
+    for shard in websocket._shards:
+        shard._sio.connect = AsyncMock()
+        shard._sio.disconnect = AsyncMock()
+        shard._sio.emit = AsyncMock()
+        shard._sio.namespaces = {"/": 1}
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_data_is_merged() -> None:
+    """Test that keys are spread across shards and data from each is merged."""
+    websocket = _make_sharded_websocket(shard_count=2)
+    assert [shard.subscriptions for shard in websocket._shards] == [
+        ["api_key_0", "api_key_2", "api_key_4"],
+        ["api_key_1", "api_key_3"],
+    ]
+
+    on_data = AsyncMock()
+    websocket.async_on_data(on_data)
+    await websocket.connect()
+
+    await websocket._shards[1]._sio._trigger_event(
+        "data", "/", {"macAddress": TEST_MAC}
+    )
+    on_data.assert_awaited_once_with({"macAddress": TEST_MAC})
+
+    health = websocket.health
+    assert [shard.messages for shard in health] == [0, 1]
+    assert health[0].seconds_since_data is None
+    assert health[1].seconds_since_data is not None
+    assert all(shard.alive for shard in health)
+    assert all(shard.state is ConnectionState.CONNECTED for shard in health)
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_rebalance_on_connect_failure() -> None:
+    """Test that a shard that can't connect hands its keys to the others."""
+    websocket = _make_sharded_websocket(shard_count=3)
+    websocket._shards[0]._sio.connect = AsyncMock(side_effect=SocketIOError())
+
+    await websocket.connect()
+
+    health = websocket.health
+    assert not health[0].alive
+    assert health[0].api_keys == []
+    assert sorted(websocket.subscriptions) == API_KEYS
+    assert sorted(len(shard.api_keys) for shard in health[1:]) == [2, 3]
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_rebalance_on_reconnect_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a shard that gives up reconnecting hands its keys to the others.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", AsyncMock())
+    websocket = _make_sharded_websocket(
+        reconnect_policy=ReconnectPolicy(max_attempts=1), shard_count=2
+    )
+    await websocket.connect()
+
+    websocket._shards[0]._sio.connect = AsyncMock(side_effect=SocketIOError())
+    with pytest.raises(WebsocketError):
+        await websocket._shards[0].reconnect()
+
+    assert websocket._shards[1].subscriptions == [
+        "api_key_1",
+        "api_key_3",
+        "api_key_0",
+        "api_key_2",
+        "api_key_4",
+    ]
+    websocket._shards[1]._sio.emit.assert_awaited_with(
+        "subscribe", {"apiKeys": ["api_key_4"]}
+    )
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_rebalance_after_drop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a shard whose connection drops for good hands its keys to the others.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", AsyncMock())
+    websocket = _make_sharded_websocket(
+        reconnect_policy=ReconnectPolicy(max_attempts=2), shard_count=2
+    )
+    await websocket.connect()
+
+    shard = websocket._shards[0]
+    shard._sio.connect = AsyncMock(side_effect=SocketIOError())
+    shard._sio.connected = True
+    await shard._sio._handle_eio_disconnect("transport close")
+    assert shard._reconnect_task is not None
+    await shard._reconnect_task
+
+    assert shard._sio.connect.await_count == 2
+    health = websocket.health
+    assert not health[0].alive
+    assert health[0].state is ConnectionState.FAILED
+    assert sorted(health[1].api_keys) == API_KEYS
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_all_shards_fail() -> None:
+    """Test that connecting fails if no shard can connect."""
+    websocket = _make_sharded_websocket(shard_count=2)
+    for shard in websocket._shards:
+        shard._sio.connect = AsyncMock(side_effect=SocketIOError())
+
+    with pytest.raises(WebsocketError):
+        await websocket.connect()
+
+
+@pytest.mark.asyncio
+async def test_stream() -> None:
+    """Test streaming events from every shard."""
+    websocket = _make_sharded_websocket(shard_count=2)
+    await websocket.connect()
+
+    events = []
+
+    async def read_stream() -> None:
+        """Read every event from the stream."""
+        async for event in websocket.stream():
+            events.append(event)  # noqa: PERF401
+
+    task = asyncio.create_task(read_stream())
+    await asyncio.sleep(0)
+
+    await websocket._shards[0]._sio._trigger_event("subscribed", "/", {"devices": []})
+    await websocket._shards[1]._sio._trigger_event("data", "/", {"idx": 0})
+    await websocket.disconnect()
+    await asyncio.wait_for(task, 1)
+
+    assert events == [SubscribedEvent({"devices": []}), DataEvent({"idx": 0})]
+
+
+def test_invalid_shard_count() -> None:
+    """Test that an invalid number of shards is rejected."""
+    with pytest.raises(ValueError, match="Invalid number of shards"):
+        ShardedWebsocket(TEST_APP_KEY, API_KEYS, shard_count=0)
+
+
+@pytest.mark.asyncio
+async def test_handlers() -> None:
+    """Test the sync and async data and subscribed handlers."""
+    websocket = _make_sharded_websocket(shard_count=2)
+    await websocket.connect()
+
+    on_data = Mock()
+    websocket.async_on_data(AsyncMock())
+    websocket.on_data(on_data)
+    await websocket._shards[0]._sio._trigger_event("data", "/", {"idx": 0})
+    on_data.assert_called_once_with({"idx": 0})
+
+    async_on_subscribed = AsyncMock()
+    websocket.async_on_subscribed(async_on_subscribed)
+    await websocket._shards[0]._sio._trigger_event("subscribed", "/", {"devices": []})
+    async_on_subscribed.assert_awaited_once_with({"devices": []})
+
+    on_subscribed = Mock()
+    websocket.on_subscribed(on_subscribed)
+    await websocket._shards[1]._sio._trigger_event("subscribed", "/", {"devices": []})
+    on_subscribed.assert_called_once_with({"devices": []})
+    async_on_subscribed.assert_awaited_once()
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_no_live_shards(
+    caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test what happens when every shard has died.
+
+    Args:
+    ----
+        caplog: The pytest caplog fixture.
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", AsyncMock())
+    websocket = _make_sharded_websocket(
+        reconnect_policy=ReconnectPolicy(max_attempts=1), shard_count=2
+    )
+    await websocket.connect()
+
+    for shard in (*websocket._shards, websocket._shards[0]):
+        shard._sio.connect = AsyncMock(side_effect=SocketIOError())
+        with pytest.raises(WebsocketError):
+            await shard.reconnect()
+
+    assert "No live shards left to take over 5 API keys" in caplog.text
+    assert websocket.subscriptions == []
+    assert not any(shard.alive for shard in websocket.health)
+
+    with pytest.raises(WebsocketError):
+        await websocket.subscribe("api_key_0")
+
+
+@pytest.mark.asyncio
+async def test_subscribe_unsubscribe() -> None:
+    """Test subscribing to and unsubscribing from API keys."""
+    websocket = _make_sharded_websocket(shard_count=2)
+    await websocket.connect()
+
+    await websocket.subscribe("api_key_5")
+    await websocket.subscribe(["api_key_0", "api_key_6", "api_key_6"])
+    assert [shard.subscriptions for shard in websocket._shards] == [
+        ["api_key_0", "api_key_2", "api_key_4", "api_key_6"],
+        ["api_key_1", "api_key_3", "api_key_5"],
+    ]
+
+    await websocket.unsubscribe(["api_key_0", "api_key_1"])
+    assert sorted(websocket.subscriptions) == [
+        "api_key_2",
+        "api_key_3",
+        "api_key_4",
+        "api_key_5",
+        "api_key_6",
+    ]
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_early() -> None:
+    """Test that closing a stream drops whatever it had buffered."""
+    websocket = _make_sharded_websocket(shard_count=2)
+    await websocket.connect()
+
+    stream = websocket.stream()
+    assert isinstance(stream, AsyncGenerator)
+    first_event = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    await websocket._shards[0]._sio._trigger_event("data", "/", {"idx": 0})
+    await websocket._shards[1]._sio._trigger_event("data", "/", {"idx": 1})
+    assert await first_event == DataEvent({"idx": 0})
+
+    await stream.aclose()
+    assert not websocket._event_streams
+    await websocket.disconnect()
@@ -0,0 +1,128 @@
+"""Define tests for the station state store."""
+
+from unittest.mock import MagicMock
+
+import aiohttp
+from aresponses import ResponsesMockServer
+import pytest
+
+from aioambient import API
+from aioambient.state_store import StationStateStore
+from aioambient.util import get_public_device_id
+
+from .common import TEST_API_KEY, TEST_APP_KEY, TEST_MAC, load_fixture
+
+
+@pytest.mark.asyncio
+async def test_seed_from_api(aresponses: ResponsesMockServer) -> None:
+    """Test seeding the store from the REST API.
+
+    Args:
+    ----
+        aresponses: An aresponses server.
+
+    """
+    aresponses.add(
+        "rt.ambientweather.net",
+        "/v1/devices",
+        "get",
+        aresponses.Response(
+            text=load_fixture("devices_response.json"),
+            status=200,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = API(
+            TEST_APP_KEY,
+            TEST_API_KEY,
+            rate_limit=1000,
+            rate_limit_burst=10,
+            session=session,
+        )
+        store = StationStateStore()
+        await store.seed_from_api(api)
+
+    assert list(store) == ["84:F3:EB:21:90:C4"]
+    assert "84:F3:EB:21:90:C4" in store
+    data = store.get("84:F3:EB:21:90:C4")
+    assert data is not None
+    assert data["tempinf"] == 68.9
+    assert data["macAddress"] == "84:F3:EB:21:90:C4"
+    assert store.get_info("84:F3:EB:21:90:C4") == {"name": "Home", "location": "Home"}
+
+
+def test_seed_without_data() -> None:
+    """Test that a seeded station can be found by public ID before it sends data."""
+    store = StationStateStore()
+    store.seed([{"macAddress": TEST_MAC, "info": {"name": "Home"}}])
+    public_id = get_public_device_id(TEST_MAC)
+
+    assert TEST_MAC not in store
+    assert store.get_by_public_id(public_id) is None
+    assert store.get_info_by_public_id(public_id) == {"name": "Home"}
+    assert store.get_info_by_public_id("unknown") is None
+
+    store.update({"macAddress": TEST_MAC, "dateutc": 1000, "tempf": 70.0})
+    assert store.get_by_public_id(public_id) == {
+        "macAddress": TEST_MAC,
+        "dateutc": 1000,
+        "tempf": 70.0,
+    }
+
+
+def test_lookups_and_updates() -> None:
+    """Test updating the store and looking up stations."""
+    store = StationStateStore()
+    listener = MagicMock()
+    unsubscribe = store.subscribe(listener)
+
+    data = {"macAddress": TEST_MAC, "dateutc": 2000, "tempf": 70.0}
+    assert store.update(data)
+    # Older data (and replays of the latest) is ignored:
+    assert not store.update({"macAddress": TEST_MAC, "dateutc": 1000, "tempf": 60.0})
+    assert not store.update({"macAddress": TEST_MAC, "dateutc": 2000, "tempf": 60.0})
+    assert not store.update({"tempf": 60.0})
+
+    assert store.get_by_public_id(get_public_device_id(TEST_MAC)) == {
+        "macAddress": TEST_MAC,
+        "dateutc": 2000,
+        "tempf": 70.0,
+    }
+    assert store.get_by_public_id("unknown") is None
+    assert store.get("unknown") is None
+    assert store.get_info(TEST_MAC) is None
+    listener.assert_called_once_with(
+        TEST_MAC, {"macAddress": TEST_MAC, "dateutc": 2000, "tempf": 70.0}
+    )
+
+    # The store's data can't be changed from the outside:
+    data["tempf"] = 0.0
+    stored = store.get(TEST_MAC)
+    assert stored is not None
+    stored["tempf"] = 0.0
+    assert store.snapshot()[TEST_MAC]["tempf"] == 70.0
+
+    snapshot = store.snapshot()
+    unsubscribe()
+    assert store.update({"macAddress": TEST_MAC, "dateutc": 3000, "tempf": 71.0})
+    assert listener.call_count == 1
+    assert snapshot[TEST_MAC]["tempf"] == 70.0
+    assert len(store) == 1
+
+
+def test_listener_errors_are_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a failing listener doesn't stop the store from updating.
+
+    Args:
+    ----
+        caplog: A mocked logging utility.
+
+    """
+    store = StationStateStore()
+    store.subscribe(MagicMock(side_effect=Exception("Listener failed")))
+
+    assert store.update({"macAddress": TEST_MAC, "dateutc": 1000})
+    assert store.get(TEST_MAC) is not None
+    assert "Error while notifying a state store listener" in caplog.text
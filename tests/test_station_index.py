@@ -0,0 +1,189 @@
+"""Define tests for the station index."""
+
+import random
+
+import pytest
+
+from aioambient.util.location_utils import BoundingBox, LocationUtils
+from aioambient.util.station_index import StationIndex
+
+
+def _make_device(mac_address: str, latitude: float, longitude: float) -> dict:
+    """Make a device dict like those returned by the open API.
+
+    Args:
+    ----
+        mac_address: The MAC address.
+        latitude: The latitude.
+        longitude: The longitude.
+
+    Returns:
+    -------
+        A device dict.
+
+    """
+    return {
+        "macAddress": mac_address,
+        "info": {"coords": {"coords": {"lat": latitude, "lon": longitude}}},
+    }
+
+
+def _get_location(device: dict) -> tuple[float, float]:
+    """Get the location of a device made by `_make_device()`.
+
+    Args:
+    ----
+        device: A device dict.
+
+    Returns:
+    -------
+        A (latitude, longitude) pair.
+
+    """
+    coords = device["info"]["coords"]["coords"]
+    return coords["lat"], coords["lon"]
+
+
+@pytest.fixture(name="devices")
+def devices_fixture() -> list[dict]:
+    """Return a random (but reproducible) set of devices around Texas.
+
+    Returns
+    -------
+        A list of device dicts.
+
+    """
+    rand = random.Random(42)  # noqa: S311
+    return [
+        _make_device(f"{idx:012X}", rand.uniform(26, 36), rand.uniform(-106, -94))
+        for idx in range(2000)
+    ]
+
+
+def _brute_force(devices: list[dict], latitude: float, longitude: float) -> list:
+    """Get every device and its distance from a location, nearest first.
+
+    Args:
+    ----
+        devices: Device dicts.
+        latitude: The latitude.
+        longitude: The longitude.
+
+    Returns:
+    -------
+        A list of (distance, MAC address) pairs.
+
+    """
+    return sorted(
+        (
+            LocationUtils.distance(latitude, longitude, *_get_location(device)),
+            device["macAddress"],
+        )
+        for device in devices
+    )
+
+
+def test_nearest(devices: list[dict]) -> None:
+    """Test nearest-N queries against a brute-force search.
+
+    Args:
+    ----
+        devices: Device dicts.
+
+    """
+    index = StationIndex.from_devices(devices, cell_size=0.25)
+    assert len(index) == 2000
+
+    # Include locations far outside of the indexed area:
+    for latitude, longitude in ((31.0, -100.0), (26.0, -106.0), (45.0, -80.0)):
+        expected = _brute_force(devices, latitude, longitude)[:10]
+        matches = index.nearest(latitude, longitude, 10)
+        assert [match.device["macAddress"] for match in matches] == [
+            mac_address for _, mac_address in expected
+        ]
+        assert [match.distance for match in matches] == pytest.approx(
+            [distance for distance, _ in expected]
+        )
+
+    assert not index.nearest(31.0, -100.0, 5, max_distance=0.01)
+    assert not StationIndex().nearest(31.0, -100.0)
+    assert not list(StationIndex()._iter_ring(0, 0, 0))
+
+
+def test_within_radius_and_box(devices: list[dict]) -> None:
+    """Test radius and bounding box queries against a brute-force search.
+
+    Args:
+    ----
+        devices: Device dicts.
+
+    """
+    index = StationIndex.from_devices(devices)
+
+    expected = [
+        mac_address
+        for distance, mac_address in _brute_force(devices, 31.0, -100.0)
+        if distance <= 50
+    ]
+    assert expected
+    matches = index.within_radius(31.0, -100.0, 50)
+    assert [match.device["macAddress"] for match in matches] == expected
+
+    box = BoundingBox(30.0, -101.0, 31.5, -99.5)
+    assert sorted(device["macAddress"] for device in index.within_box(box)) == sorted(
+        device["macAddress"]
+        for device in devices
+        if box.south <= _get_location(device)[0] <= box.north
+        and box.west <= _get_location(device)[1] <= box.east
+    )
+
+    # A box that covers far more cells than are occupied:
+    assert len(index.within_box(BoundingBox(-90, -180, 90, 180))) == 2000
+
+
+def test_within_radius_of_pole() -> None:
+    """Test a radius query whose circle covers a pole (and thus every longitude)."""
+    index = StationIndex.from_devices(
+        [
+            _make_device("AA:AA:AA:AA:AA:AA", 89.9, 10.0),
+            _make_device("BB:BB:BB:BB:BB:BB", 89.9, -170.0),
+            _make_device("CC:CC:CC:CC:CC:CC", 80.0, 10.0),
+        ]
+    )
+
+    matches = index.within_radius(89.95, 10.0, 50)
+    assert [match.device["macAddress"] for match in matches] == [
+        "AA:AA:AA:AA:AA:AA",
+        "BB:BB:BB:BB:BB:BB",
+    ]
+
+
+def test_incremental_update() -> None:
+    """Test adding, moving, and removing stations."""
+    index = StationIndex()
+    assert (
+        index.update(
+            [
+                _make_device("AA:AA:AA:AA:AA:AA", 32.0, -97.0),
+                _make_device("BB:BB:BB:BB:BB:BB", 33.0, -97.0),
+                # Devices without a location are skipped:
+                {"macAddress": "CC:CC:CC:CC:CC:CC", "info": {}},
+            ]
+        )
+        == 2
+    )
+    assert "AA:AA:AA:AA:AA:AA" in index
+    assert "CC:CC:CC:CC:CC:CC" not in index
+
+    # Move a station:
+    moved = _make_device("AA:AA:AA:AA:AA:AA", 40.0, -80.0)
+    index.update([moved])
+    assert len(index) == 2
+    assert index.get("AA:AA:AA:AA:AA:AA") is moved
+    assert index.nearest(40.0, -80.0)[0].device is moved
+    assert not index.within_radius(32.0, -97.0, 10)
+
+    index.remove("AA:AA:AA:AA:AA:AA")
+    index.remove("AA:AA:AA:AA:AA:AA")
+    assert [device["macAddress"] for device in index] == ["BB:BB:BB:BB:BB:BB"]
+    assert index.nearest(40.0, -80.0)[0].device["macAddress"] == "BB:BB:BB:BB:BB:BB"
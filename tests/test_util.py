@@ -2,8 +2,13 @@
 
 import pytest
 
-from aioambient.util import get_public_device_id
-from aioambient.util.location_utils import LocationUtils
+from aioambient.util import (
+    get_public_device_id,
+    get_public_device_id_cached,
+    get_public_device_ids,
+    location_utils,
+)
+from aioambient.util.location_utils import BoundingBox, LocationUtils
 
 
 @pytest.mark.asyncio
@@ -13,6 +18,31 @@ async def test_get_public_id() -> None:
     assert public_id == "04629a94fef5bfb62b525a6784cb8b37"
 
 
+def test_get_public_id_cached() -> None:
+    """Test getting public IDs with memoization and in bulk."""
+    get_public_device_id_cached.cache_clear()
+    for _ in range(3):
+        assert (
+            get_public_device_id_cached("AB:CD:EF:12:34:56")
+            == "04629a94fef5bfb62b525a6784cb8b37"
+        )
+    cache_info = get_public_device_id_cached.cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.misses == 1
+
+    mac_addresses = ["AB:CD:EF:12:34:56", "00:11:22:33:44:55", "AB:CD:EF:12:34:56"]
+    index = get_public_device_ids(mac_addresses)
+    assert index.public_ids == {
+        mac_address: get_public_device_id(mac_address) for mac_address in mac_addresses
+    }
+    assert index.mac_addresses == {
+        public_id: mac_address for mac_address, public_id in index.public_ids.items()
+    }
+    assert index.mac_addresses["04629a94fef5bfb62b525a6784cb8b37"] == (
+        "AB:CD:EF:12:34:56"
+    )
+
+
 @pytest.mark.asyncio
 async def test_shift_location() -> None:
     """Test for shift_location utility function."""
@@ -27,3 +57,175 @@ async def test_shift_location() -> None:
     lat, long = LocationUtils.shift_location(80, 20, -5, -5)
     assert lat == 79.927638570961
     assert long == 19.5832871383321
+
+
+def test_distance() -> None:
+    """Test the haversine distance utility function."""
+    assert LocationUtils.distance(32.5, -97.3, 32.5, -97.3) == 0.0
+    # One degree of latitude:
+    assert LocationUtils.distance(0, 0, 1, 0) == pytest.approx(69.0975, abs=1e-4)
+    # Dallas to Houston:
+    assert LocationUtils.distance(32.7767, -96.797, 29.7604, -95.3698) == (
+        pytest.approx(224.9, abs=0.1)
+    )
+
+
+def test_bounding_box() -> None:
+    """Test computing and splitting bounding boxes."""
+    box = LocationUtils.get_bounding_box(40, 30, 1)
+    assert box.south == pytest.approx(39.985527714)
+    assert box.north == pytest.approx(40.014472286)
+    assert box.west == pytest.approx(29.981107773)
+    assert box.east == pytest.approx(30.018892227)
+
+    quadrants = box.quadrants()
+    assert quadrants[0].north == quadrants[3].south == pytest.approx(40)
+    assert quadrants[0].east == quadrants[3].west == pytest.approx(30)
+
+
+def test_distance_to_box() -> None:
+    """Test the distance from a location to a bounding box."""
+    box = BoundingBox(south=30.0, west=-100.0, north=35.0, east=-95.0)
+    assert LocationUtils.distance_to_box(32.5, -97.3, box) == 0.0
+    # Straight south of the box:
+    assert LocationUtils.distance_to_box(29.0, -97.3, box) == pytest.approx(
+        LocationUtils.distance(29.0, -97.3, 30.0, -97.3)
+    )
+    # Beside the box, the nearest point of its edge is poleward of the location
+    # (rather than at the same latitude):
+    assert LocationUtils.distance_to_box(32.5, -90.0, box) < LocationUtils.distance(
+        32.5, -90.0, 32.5, -95.0
+    )
+
+    # Near a pole, a box across every longitude it spans can be close even though
+    # it is far away in degrees of longitude:
+    polar_box = BoundingBox(south=80.0, west=0.0, north=90.0, east=10.0)
+    assert LocationUtils.distance_to_box(85.0, 180.0, polar_box) == pytest.approx(
+        LocationUtils.distance(85.0, 180.0, 90.0, 0.0)
+    )
+
+    # Across the antimeridian:
+    dateline_box = BoundingBox(south=-10.0, west=170.0, north=10.0, east=190.0)
+    assert LocationUtils.distance_to_box(0.0, -175.0, dateline_box) == 0.0
+    assert LocationUtils.distance_to_box(0.0, -169.0, dateline_box) == pytest.approx(
+        LocationUtils.distance(0.0, -169.0, 0.0, -170.0)
+    )
+
+
+def test_get_device_location() -> None:
+    """Test getting the location of a device from the open API."""
+    device = {"info": {"coords": {"coords": {"lat": 32.0, "lon": -97.0}}}}
+    assert LocationUtils.get_device_location(device) == (32.0, -97.0)
+    assert LocationUtils.get_device_location({"info": {}}) is None
+
+
+# Pairs of (latitude, longitude) locations, including antipodal and identical ones:
+LOCATION_PAIRS = [
+    ((32.7767, -96.797), (29.7604, -95.3698)),
+    ((40.0, 30.0), (40.0, 30.0)),
+    ((0.0, 0.0), (0.0, 180.0)),
+    ((-33.8688, 151.2093), (51.5074, -0.1278)),
+    ((89.9, 10.0), (-89.9, -170.0)),
+    ((45.0, -120.0), (45.0, -119.0)),
+]
+
+
+def test_bearing() -> None:
+    """Test the bearing utility function."""
+    assert LocationUtils.bearing(0, 0, 1, 0) == 0.0
+    assert LocationUtils.bearing(0, 0, 0, 1) == pytest.approx(90.0)
+    assert LocationUtils.bearing(0, 0, -1, 0) == 180.0
+    assert LocationUtils.bearing(0, 0, 0, -1) == pytest.approx(270.0)
+
+
+def test_geodesic_batch_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the pure-Python batch calculations match the scalar ones exactly.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr(location_utils, "HAS_NUMPY", False)
+    (latitudes1, longitudes1), (latitudes2, longitudes2) = (
+        zip(*locations, strict=True) for locations in zip(*LOCATION_PAIRS, strict=True)
+    )
+
+    assert LocationUtils.distance_batch(
+        latitudes1, longitudes1, latitudes2, longitudes2
+    ) == [LocationUtils.distance(*first, *second) for first, second in LOCATION_PAIRS]
+    assert LocationUtils.bearing_batch(
+        latitudes1, longitudes1, latitudes2, longitudes2
+    ) == [LocationUtils.bearing(*first, *second) for first, second in LOCATION_PAIRS]
+
+    # Scalars are broadcast against sequences:
+    assert LocationUtils.distance_batch(32.0, -97.0, latitudes2, longitudes2) == [
+        LocationUtils.distance(32.0, -97.0, *second) for _, second in LOCATION_PAIRS
+    ]
+    assert LocationUtils.shift_location_batch(latitudes1, longitudes1, 1, -2) == (
+        [LocationUtils.shift_location(*first, 1, -2)[0] for first, _ in LOCATION_PAIRS],
+        [LocationUtils.shift_location(*first, 1, -2)[1] for first, _ in LOCATION_PAIRS],
+    )
+    assert LocationUtils.get_bounding_box_batch([40, 32.5], [30, -97.3], 1) == (
+        tuple(
+            list(values)
+            for values in zip(
+                LocationUtils.get_bounding_box(40, 30, 1),
+                LocationUtils.get_bounding_box(32.5, -97.3, 1),
+                strict=True,
+            )
+        )
+    )
+
+    with pytest.raises(ValueError, match="different lengths"):
+        LocationUtils.distance_batch([1, 2], [1, 2], [1], 0)
+
+
+def test_geodesic_batch_numpy() -> None:
+    """Test that the NumPy batch calculations match the scalar ones."""
+    np = pytest.importorskip("numpy")
+    (latitudes1, longitudes1), (latitudes2, longitudes2) = (
+        np.array(locations).T for locations in zip(*LOCATION_PAIRS, strict=True)
+    )
+
+    np.testing.assert_allclose(
+        LocationUtils.distance_batch(latitudes1, longitudes1, latitudes2, longitudes2),
+        [LocationUtils.distance(*first, *second) for first, second in LOCATION_PAIRS],
+        rtol=1e-12,
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(
+        LocationUtils.bearing_batch(latitudes1, longitudes1, latitudes2, longitudes2),
+        [LocationUtils.bearing(*first, *second) for first, second in LOCATION_PAIRS],
+        rtol=1e-12,
+        atol=1e-9,
+    )
+
+    shifted = LocationUtils.shift_location_batch(latitudes1, longitudes1, 1, -2)
+    np.testing.assert_allclose(
+        np.array(shifted).T,
+        [LocationUtils.shift_location(*first, 1, -2) for first, _ in LOCATION_PAIRS],
+        rtol=1e-12,
+    )
+
+    boxes = LocationUtils.get_bounding_box_batch(latitudes1, longitudes1, [1, 2] * 3)
+    np.testing.assert_allclose(
+        np.array(boxes).T,
+        [
+            LocationUtils.get_bounding_box(*first, radius)
+            for (first, _), radius in zip(LOCATION_PAIRS, [1, 2] * 3, strict=True)
+        ],
+        rtol=1e-12,
+    )
+
+    # Arrays are broadcast against each other (e.g., every site against every
+    # station):
+    matrix = np.asarray(
+        LocationUtils.distance_batch(
+            latitudes1[:, None], longitudes1[:, None], latitudes2, longitudes2
+        )
+    )
+    assert matrix.shape == (len(LOCATION_PAIRS), len(LOCATION_PAIRS))
+    assert matrix[0, 0] == pytest.approx(
+        LocationUtils.distance(*LOCATION_PAIRS[0][0], *LOCATION_PAIRS[0][1])
+    )
@@ -1,15 +1,29 @@
 """Define tests for the Websocket API."""
 
 # pylint: disable=protected-access
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from datetime import UTC, datetime
 import logging
+from typing import TypedDict, Unpack
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from socketio.exceptions import SocketIOError
 
-from aioambient import Websocket
-from aioambient.errors import WebsocketError
-from aioambient.websocket import WebsocketWatchdog
+from aioambient import API, Websocket
+from aioambient.dispatch import DispatchQueue
+from aioambient.errors import RequestError, WebsocketError
+from aioambient.reconnect import ReconnectPolicy
+from aioambient.state_store import StationStateStore
+from aioambient.websocket import (
+    ConnectionState,
+    DataEvent,
+    DisconnectEvent,
+    SubscribedEvent,
+    WebsocketEvent,
+    WebsocketWatchdog,
+)
 from tests.common import TEST_API_KEY, TEST_APP_KEY
 
 
@@ -176,3 +190,921 @@ async def test_watchdog_firing() -> None:
 
     await watchdog.on_expire()
     mock_coro.assert_called_once()
+
+
+class WebsocketKwargsT(TypedDict, total=False):
+    """Define the keyword arguments a test websocket can be created with."""
+
+    dedupe: bool
+    device_timeout: float
+    dispatch_queue: DispatchQueue
+    gap_fill_api: API
+    reconnect_policy: ReconnectPolicy
+    resubscribe_stale_devices: bool
+    state_store: StationStateStore
+
+
+def _make_websocket(**kwargs: Unpack[WebsocketKwargsT]) -> Websocket:
+    """Make a websocket with a mocked Socket.IO connection.
+
+    Args:
+    ----
+        **kwargs: Keyword arguments to create the websocket with.
+
+    Returns:
+    -------
+        A Websocket.
+
+    """
+    websocket = Websocket(TEST_API_KEY, TEST_APP_KEY, **kwargs)
+    websocket._sio.connect = AsyncMock()
+    websocket._sio.disconnect = AsyncMock()
+    websocket._sio.emit = AsyncMock()
+    websocket._sio.eio._trigger_event = AsyncMock()
+    websocket._sio.namespaces = {"/": 1}
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_data_batch_async() -> None:
+    """Test that data is delivered in batches capped by size and latency."""
+    websocket = _make_websocket()
+
+    async_on_data = AsyncMock()
+    async_on_data_batch = AsyncMock()
+    websocket.async_on_data(async_on_data)
+    websocket.async_on_data_batch(async_on_data_batch, max_latency=0.05, max_size=3)
+
+    await websocket.connect()
+    await websocket._sio._trigger_event("connect", "/")
+
+    for idx in range(4):
+        await websocket._sio._trigger_event("data", "/", {"idx": idx})
+
+    # Per-message handlers still receive every message:
+    assert async_on_data.call_count == 4
+
+    # A full batch is delivered immediately...
+    async_on_data_batch.assert_called_once_with([{"idx": 0}, {"idx": 1}, {"idx": 2}])
+
+    # ...and a partial one once it has waited long enough:
+    await asyncio.sleep(0.1)
+    assert async_on_data_batch.call_count == 2
+    async_on_data_batch.assert_called_with([{"idx": 3}])
+
+    # Any partial batch is delivered upon disconnecting:
+    await websocket._sio._trigger_event("data", "/", {"idx": 4})
+    await websocket._sio._trigger_event("disconnect", "/")
+    assert async_on_data_batch.call_count == 3
+    async_on_data_batch.assert_called_with([{"idx": 4}])
+
+    await websocket.disconnect()
+    assert async_on_data_batch.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_data_batch_sync() -> None:
+    """Test that data is delivered in batches to a sync handler."""
+    websocket = _make_websocket()
+    replaced_on_data_batch = MagicMock()
+    websocket.on_data_batch(replaced_on_data_batch, max_size=2)
+
+    await websocket.connect()
+    await websocket._sio._trigger_event("connect", "/")
+    await websocket._sio._trigger_event("data", "/", {"idx": 0})
+
+    # Defining another batch handler replaces the first, and the data waiting in
+    # its batch is delivered to the new one:
+    on_data_batch = MagicMock()
+    websocket.on_data_batch(on_data_batch, max_size=2)
+    for idx in range(1, 3):
+        await websocket._sio._trigger_event("data", "/", {"idx": idx})
+    replaced_on_data_batch.assert_not_called()
+    on_data_batch.assert_called_once_with([{"idx": 0}, {"idx": 1}])
+
+    await websocket.disconnect()
+    on_data_batch.assert_called_with([{"idx": 2}])
+
+
+@pytest.mark.asyncio
+async def test_disconnect_handler_without_reason() -> None:
+    """Test that disconnect handlers needn't accept the disconnect reason."""
+    websocket = _make_websocket()
+    calls = []
+
+    def on_disconnect() -> None:
+        """Record the disconnect."""
+        calls.append(True)
+
+    websocket.on_disconnect(on_disconnect)
+    await websocket._sio._trigger_event("disconnect", "/", "transport close")
+    assert calls == [True]
+
+    async def async_on_disconnect() -> None:
+        """Record the disconnect."""
+        calls.append(False)
+
+    websocket.async_on_disconnect(async_on_disconnect)
+    await websocket._sio._trigger_event("disconnect", "/", "transport close")
+    assert calls == [True, False]
+
+    # A TypeError from a handler that was called without a reason is raised:
+    websocket.async_on_disconnect(AsyncMock(side_effect=TypeError))
+    with pytest.raises(TypeError):
+        await websocket._on_disconnect()
+    websocket.on_disconnect(MagicMock(side_effect=TypeError))
+    with pytest.raises(TypeError):
+        await websocket._on_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_queue() -> None:
+    """Test that a slow data handler doesn't stall the receive path."""
+    dispatch_queue = DispatchQueue(max_size=10, workers=1)
+    websocket = _make_websocket(dispatch_queue=dispatch_queue)
+
+    handled = []
+    release = asyncio.Event()
+
+    async def async_on_data(data: dict) -> None:
+        """Wait to be released, then record the data.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        await release.wait()
+        handled.append(data)
+
+    websocket.async_on_data(async_on_data)
+    await websocket.connect()
+
+    for idx in range(3):
+        await asyncio.wait_for(
+            websocket._sio._trigger_event("data", "/", {"idx": idx}), 0.1
+        )
+    assert not handled
+
+    release.set()
+    await websocket.disconnect()
+    assert handled == [{"idx": 0}, {"idx": 1}, {"idx": 2}]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_queue_handler_disconnects() -> None:
+    """Test that a queued data handler can disconnect the websocket."""
+    dispatch_queue = DispatchQueue(max_size=10, workers=1)
+    websocket = _make_websocket(dispatch_queue=dispatch_queue)
+
+    disconnected = asyncio.Event()
+
+    async def async_on_data(data: dict) -> None:
+        """Disconnect upon the first data.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        await websocket.disconnect()
+        disconnected.set()
+
+    websocket.async_on_data(async_on_data)
+    await websocket.connect()
+
+    await websocket._sio._trigger_event("data", "/", {"idx": 0})
+    await asyncio.wait_for(disconnected.wait(), 1)
+    assert websocket.state is ConnectionState.DISCONNECTED
+    websocket._sio.disconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test streaming events across a reconnect until disconnecting.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    websocket = _make_websocket()
+    await websocket.connect()
+
+    events: list[WebsocketEvent] = []
+
+    async def read_stream() -> None:
+        """Read every event from the stream."""
+        async for event in websocket.stream():
+            events.append(event)  # noqa: PERF401
+
+    task = asyncio.create_task(read_stream())
+    await asyncio.sleep(0)
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", AsyncMock())
+
+    await websocket._sio._trigger_event("subscribed", "/", {"devices": []})
+    await websocket._sio._trigger_event("data", "/", {"idx": 0})
+    await websocket._sio._trigger_event("disconnect", "/", "transport close")
+    await websocket.reconnect()
+    await websocket._sio._trigger_event("data", "/", {"idx": 1})
+    await websocket.disconnect()
+    await asyncio.wait_for(task, 1)
+
+    assert events == [
+        SubscribedEvent({"devices": []}),
+        DataEvent({"idx": 0}),
+        DisconnectEvent("transport close"),
+        DataEvent({"idx": 1}),
+    ]
+    assert not websocket._event_streams
+
+
+@pytest.mark.asyncio
+async def test_stream_backpressure() -> None:
+    """Test that a full stream buffer waits for the stream to catch up."""
+    websocket = _make_websocket()
+    await websocket.connect()
+
+    stream = websocket.stream(buffer_size=1)
+    assert isinstance(stream, AsyncGenerator)
+    first_event = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    await websocket._sio._trigger_event("data", "/", {"idx": 0})
+    await websocket._sio._trigger_event("data", "/", {"idx": 1})
+    blocked = asyncio.create_task(
+        websocket._sio._trigger_event("data", "/", {"idx": 2})
+    )
+    await asyncio.sleep(0.1)
+    assert not blocked.done()
+
+    assert await first_event == DataEvent({"idx": 0})
+    assert await anext(stream) == DataEvent({"idx": 1})
+    await asyncio.wait_for(blocked, 1)
+    assert await anext(stream) == DataEvent({"idx": 2})
+
+    # Closing the stream unblocks anything waiting for room in its buffer:
+    await websocket._sio._trigger_event("data", "/", {"idx": 3})
+    blocked = asyncio.create_task(
+        websocket._sio._trigger_event("data", "/", {"idx": 4})
+    )
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await stream.aclose()
+    await asyncio.wait_for(blocked, 1)
+    assert not websocket._event_streams
+
+
+@pytest.mark.asyncio
+async def test_watchdog_deadline() -> None:
+    """Test that triggering the watchdog pushes back a single deadline."""
+    mock_coro = AsyncMock()
+    mock_coro.__name__ = "mock_coro"
+
+    watchdog = WebsocketWatchdog(logging.getLogger(), mock_coro, timeout_seconds=0.2)
+
+    await watchdog.trigger()
+    timer = watchdog._timer_task
+    for _ in range(100):
+        await watchdog.trigger()
+    assert watchdog._timer_task is timer
+
+    for _ in range(3):
+        await asyncio.sleep(0.1)
+        await watchdog.trigger()
+    mock_coro.assert_not_called()
+
+    await asyncio.sleep(0.4)
+    mock_coro.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_stale_device() -> None:
+    """Test that a silent device is flagged without expiring the watchdog."""
+    mock_coro = AsyncMock()
+    mock_coro.__name__ = "mock_coro"
+    on_stale_device = AsyncMock()
+
+    watchdog = WebsocketWatchdog(
+        logging.getLogger(),
+        mock_coro,
+        device_timeout_seconds=0.15,
+        on_stale_device=on_stale_device,
+        timeout_seconds=10,
+    )
+
+    await watchdog.trigger("00:00:00:00:00:01")
+    await watchdog.trigger("00:00:00:00:00:02")
+    for _ in range(4):
+        await asyncio.sleep(0.1)
+        await watchdog.trigger("00:00:00:00:00:01")
+
+    on_stale_device.assert_awaited_once_with("00:00:00:00:00:02")
+    assert watchdog.stale_devices == {"00:00:00:00:00:02"}
+    mock_coro.assert_not_called()
+
+    await watchdog.trigger("00:00:00:00:00:02")
+    assert not watchdog.stale_devices
+    watchdog.cancel()
+
+
+@pytest.mark.asyncio
+async def test_stale_device_resubscribes(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the websocket can resubscribe when a device stops sending data.
+
+    Args:
+    ----
+        caplog: The pytest caplog fixture.
+
+    """
+    caplog.set_level(logging.INFO)
+    websocket = _make_websocket(device_timeout=0.1, resubscribe_stale_devices=True)
+
+    await websocket.connect()
+    subscribed = {"devices": [{"macAddress": "00:00:00:00:00:01"}]}
+    await websocket._sio._trigger_event("subscribed", "/", subscribed)
+    await asyncio.sleep(0.2)
+
+    assert websocket.stale_devices == {"00:00:00:00:00:01"}
+    websocket._sio.emit.assert_awaited_once_with(
+        "subscribe", {"apiKeys": [TEST_APP_KEY]}
+    )
+
+    # Being subscribed again doesn't mean that the device has resumed...
+    await websocket._sio._trigger_event("subscribed", "/", subscribed)
+    assert websocket.stale_devices == {"00:00:00:00:00:01"}
+    assert "has resumed" not in caplog.text
+
+    # ...but data does:
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01"}
+    )
+    assert not websocket.stale_devices
+    assert "Data from 00:00:00:00:00:01 has resumed" in caplog.text
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stale_device_handlers() -> None:
+    """Test that stale devices are only passed to handlers by default."""
+    websocket = _make_websocket(device_timeout=0.1)
+
+    await websocket.connect()
+    await websocket._sio._trigger_event(
+        "subscribed",
+        "/",
+        {
+            "devices": [
+                {"macAddress": "00:00:00:00:00:01"},
+                {"macAddress": "00:00:00:00:00:02"},
+            ]
+        },
+    )
+
+    # Without a handler, a stale device is only logged:
+    await asyncio.sleep(0.15)
+    assert websocket.stale_devices == {"00:00:00:00:00:01", "00:00:00:00:00:02"}
+    websocket._sio.emit.assert_not_awaited()
+
+    on_device_stale = MagicMock()
+    websocket.on_device_stale(on_device_stale)
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01"}
+    )
+    await asyncio.sleep(0.25)
+    on_device_stale.assert_called_once_with("00:00:00:00:00:01")
+
+    async_on_device_stale = AsyncMock()
+    websocket.async_on_device_stale(async_on_device_stale)
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:02"}
+    )
+    await asyncio.sleep(0.25)
+    async_on_device_stale.assert_awaited_once_with("00:00:00:00:00:02")
+    on_device_stale.assert_called_once()
+
+    websocket._sio.emit.assert_not_awaited()
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that reconnecting backs off between failed attempts.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", mock_sleep)
+
+    websocket = _make_websocket(
+        reconnect_policy=ReconnectPolicy(jitter=False, max_delay=3)
+    )
+    websocket._sio.connect = AsyncMock(
+        side_effect=[SocketIOError(), SocketIOError(), SocketIOError(), None]
+    )
+
+    states: list[ConnectionState] = []
+    websocket.on_state_change(states.append)
+
+    await websocket.reconnect()
+
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [1, 2, 3, 3]
+    assert states == [ConnectionState.RECONNECTING, ConnectionState.CONNECTED]
+    assert websocket.state is ConnectionState.CONNECTED
+
+
+@pytest.mark.asyncio
+async def test_reconnect_gives_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that reconnecting gives up after the maximum number of attempts.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", AsyncMock())
+
+    websocket = _make_websocket(reconnect_policy=ReconnectPolicy(max_attempts=2))
+    websocket._sio.connect = AsyncMock(side_effect=SocketIOError())
+
+    async_on_state_change = AsyncMock()
+    websocket.async_on_state_change(async_on_state_change)
+
+    with pytest.raises(WebsocketError):
+        await websocket.reconnect()
+
+    assert websocket._sio.connect.await_count == 2
+    assert websocket.state is ConnectionState.FAILED
+    async_on_state_change.assert_awaited_with(ConnectionState.FAILED)
+
+
+@pytest.mark.asyncio
+async def test_reconnect_after_drop(
+    caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the reconnect policy applies when the connection drops.
+
+    Args:
+    ----
+        caplog: The pytest caplog fixture.
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", mock_sleep)
+
+    websocket = _make_websocket(
+        reconnect_policy=ReconnectPolicy(jitter=False, max_attempts=2)
+    )
+    states: list[ConnectionState] = []
+    websocket.on_state_change(states.append)
+    await websocket.connect()
+
+    # The Engine.IO transport drops (and Socket.IO doesn't reconnect on its own):
+    websocket._sio.connected = True
+    websocket._sio.connect = AsyncMock(side_effect=[SocketIOError(), None])
+    await websocket._sio._handle_eio_disconnect("transport close")
+    assert websocket._sio._reconnect_task is None
+    assert websocket._reconnect_task is not None
+    await websocket._reconnect_task
+
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [1, 2]
+    assert states == [
+        ConnectionState.CONNECTING,
+        ConnectionState.CONNECTED,
+        ConnectionState.RECONNECTING,
+        ConnectionState.CONNECTED,
+    ]
+
+    # Once the policy runs out of attempts, the connection has failed:
+    websocket._sio.connected = True
+    websocket._sio.namespaces = {"/": 1}
+    websocket._sio.connect = AsyncMock(side_effect=SocketIOError())
+    await websocket._sio._handle_eio_disconnect("transport close")
+    assert websocket._reconnect_task is not None
+    await websocket._reconnect_task
+
+    assert websocket._sio.connect.await_count == 2
+    assert states[-2:] == [ConnectionState.RECONNECTING, ConnectionState.FAILED]
+    assert "Gave up reconnecting" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_disconnect_after_drop() -> None:
+    """Test that disconnecting stops reconnecting after the connection drops."""
+    websocket = _make_websocket(reconnect_policy=ReconnectPolicy(initial_delay=60))
+    states: list[ConnectionState] = []
+    websocket.on_state_change(states.append)
+    await websocket.connect()
+
+    websocket._sio.connected = True
+    await websocket._sio._handle_eio_disconnect("transport close")
+    assert states[-1] is ConnectionState.RECONNECTING
+    reconnect_task = websocket._reconnect_task
+    assert reconnect_task is not None
+
+    await websocket.disconnect()
+    assert reconnect_task.cancelled()
+    assert websocket._reconnect_task is None
+    assert websocket.state is ConnectionState.DISCONNECTED
+    websocket._sio.connect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a reconnect that is already underway isn't started again.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    release = asyncio.Event()
+
+    async def _sleep(delay: float) -> None:
+        """Wait to be released.
+
+        Args:
+        ----
+            delay: The (ignored) delay.
+
+        """
+        await release.wait()
+
+    # Keep a reference to the real sleep (which is patched module-wide):
+    sleep = asyncio.sleep
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", _sleep)
+    websocket = _make_websocket()
+
+    first = asyncio.create_task(websocket.reconnect())
+    await sleep(0)
+    second = asyncio.create_task(websocket.reconnect())
+    await sleep(0)
+    assert not second.done()
+
+    release.set()
+    await asyncio.wait_for(asyncio.gather(first, second), 1)
+    websocket._sio.connect.assert_awaited_once()
+    assert websocket.state is ConnectionState.CONNECTED
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_while_reconnecting(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that disconnecting during a backoff stops the reconnect.
+
+    Args:
+    ----
+        monkeypatch: The pytest monkeypatch fixture.
+
+    """
+    release = asyncio.Event()
+
+    async def _sleep(delay: float) -> None:
+        """Wait to be released.
+
+        Args:
+        ----
+            delay: The (ignored) delay.
+
+        """
+        await release.wait()
+
+    # Keep a reference to the real sleep (which is patched module-wide):
+    sleep = asyncio.sleep
+    monkeypatch.setattr("aioambient.websocket.asyncio.sleep", _sleep)
+    websocket = _make_websocket()
+
+    reconnect = asyncio.create_task(websocket.reconnect())
+    await sleep(0)
+    assert websocket._reconnect_lock.locked()
+
+    await websocket.disconnect()
+    release.set()
+    await asyncio.wait_for(reconnect, 1)
+    websocket._sio.connect.assert_not_awaited()
+    assert websocket.state is ConnectionState.DISCONNECTED
+
+
+@pytest.mark.asyncio
+async def test_watchdog_action_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that an error from the watchdog's action is logged.
+
+    Args:
+    ----
+        caplog: The pytest caplog fixture.
+
+    """
+    action = AsyncMock(side_effect=WebsocketError("boom"))
+    action.__name__ = "action"
+    watchdog = WebsocketWatchdog(logging.getLogger(), action, timeout_seconds=0.01)
+
+    await watchdog.trigger()
+    await asyncio.sleep(0.1)
+    assert "Error while acting on the watchdog: boom" in caplog.text
+    assert not watchdog._tasks
+
+
+@pytest.mark.asyncio
+async def test_subscriptions() -> None:
+    """Test that subscriptions are tracked and restored upon connecting."""
+    websocket = _make_websocket()
+    await websocket.connect()
+
+    await websocket.subscribe(["12345", TEST_APP_KEY])
+    websocket._sio.emit.assert_awaited_once_with("subscribe", {"apiKeys": ["12345"]})
+
+    await websocket.unsubscribe(TEST_APP_KEY)
+    websocket._sio.emit.assert_awaited_with("unsubscribe", {"apiKeys": [TEST_APP_KEY]})
+    assert websocket.subscriptions == ["12345"]
+
+    await websocket._sio._trigger_event("connect", "/")
+    websocket._sio.emit.assert_awaited_with("subscribe", {"apiKeys": ["12345"]})
+
+    # Keys that are already (un)subscribed are ignored:
+    emit_count = websocket._sio.emit.await_count
+    await websocket.subscribe("12345")
+    await websocket.unsubscribe(TEST_APP_KEY)
+    assert websocket._sio.emit.await_count == emit_count
+
+    # While disconnected, subscriptions are only tracked (until reconnecting):
+    await websocket.disconnect()
+    await websocket.subscribe(TEST_APP_KEY)
+    await websocket.unsubscribe("12345")
+    assert websocket._sio.emit.await_count == emit_count
+    assert websocket.subscriptions == [TEST_APP_KEY]
+
+
+@pytest.mark.asyncio
+async def test_dedupe() -> None:
+    """Test that replayed data doesn't reach the data handlers."""
+    websocket = _make_websocket(dedupe=True)
+
+    on_data = MagicMock()
+    websocket.on_data(on_data)
+    await websocket.connect()
+
+    for date_utc in (1000, 2000, 1000, 2000, 3000):
+        await websocket._sio._trigger_event(
+            "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": date_utc}
+        )
+
+    assert [call.args[0]["dateutc"] for call in on_data.call_args_list] == [
+        1000,
+        2000,
+        3000,
+    ]
+    assert websocket.suppressed == 2
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_gap_fill() -> None:
+    """Test that data missed while disconnected is fetched and handled in order."""
+    release = asyncio.Event()
+    history_starts = []
+
+    async def iter_device_history(
+        mac_address: str, start: datetime
+    ) -> AsyncIterator[dict]:
+        """Yield a device's history (newest first) once released.
+
+        Args:
+        ----
+            mac_address: The MAC address of the device.
+            start: The oldest datetime to retrieve data for.
+
+        Yields:
+        ------
+            Device data dicts.
+
+        """
+        history_starts.append((mac_address, start))
+        await release.wait()
+        for date_utc in (4000, 3000, 2000):
+            yield {"dateutc": date_utc}
+
+    api = MagicMock()
+    api.iter_device_history = iter_device_history
+
+    websocket = _make_websocket(gap_fill_api=api)
+
+    handled: list[dict] = []
+    websocket.on_data(handled.append)
+    await websocket.connect()
+
+    await websocket._sio._trigger_event("connect", "/")
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 1000}
+    )
+    # Nothing is held back (since there's no gap to fill yet):
+    assert websocket._held_data is None
+
+    # Reconnect (while live data, including a replay, keeps arriving):
+    await websocket._sio._trigger_event("connect", "/")
+    for date_utc in (1000, 4000, 5000):
+        await websocket._sio._trigger_event(
+            "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": date_utc}
+        )
+    assert len(handled) == 1
+
+    release.set()
+    assert websocket._gap_fill_task is not None
+    await websocket._gap_fill_task
+
+    assert history_starts == [("00:00:00:00:00:01", datetime.fromtimestamp(1.001, UTC))]
+    assert [data["dateutc"] for data in handled] == [1000, 2000, 3000, 4000, 5000]
+    assert all(data["macAddress"] == "00:00:00:00:00:01" for data in handled)
+    assert websocket.suppressed == 2
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_gap_fill_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that live data is still handled when a gap can't be filled.
+
+    Args:
+    ----
+        caplog: The pytest caplog fixture.
+
+    """
+    api = MagicMock()
+    api.iter_device_history = MagicMock(side_effect=RequestError("boom"))
+
+    websocket = _make_websocket(gap_fill_api=api)
+
+    handled: list[dict] = []
+    websocket.on_data(handled.append)
+    await websocket.connect()
+
+    await websocket._sio._trigger_event("connect", "/")
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 1000}
+    )
+    await websocket._sio._trigger_event("connect", "/")
+    assert websocket._gap_fill_task is not None
+    await websocket._gap_fill_task
+
+    assert "Unable to fill the gap in data from 00:00:00:00:00:01: boom" in caplog.text
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 2000}
+    )
+    assert [data["dateutc"] for data in handled] == [1000, 2000]
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_gap_fill_handler_disconnects() -> None:
+    """Test that a data handler can disconnect while a gap is being filled."""
+
+    async def iter_device_history(
+        mac_address: str, start: datetime
+    ) -> AsyncIterator[dict]:
+        """Yield a device's history (newest first).
+
+        Args:
+        ----
+            mac_address: The MAC address of the device.
+            start: The oldest datetime to retrieve data for.
+
+        Yields:
+        ------
+            Device data dicts.
+
+        """
+        for date_utc in (3000, 2000):
+            yield {"dateutc": date_utc}
+
+    api = MagicMock()
+    api.iter_device_history = iter_device_history
+
+    websocket = _make_websocket(gap_fill_api=api)
+
+    handled: list[dict] = []
+
+    async def on_data(data: dict) -> None:
+        """Disconnect upon receiving data from the gap.
+
+        Args:
+        ----
+            data: The websocket data received.
+
+        """
+        handled.append(data)
+        if data["dateutc"] == 2000:
+            await websocket.disconnect()
+
+    websocket.async_on_data(on_data)
+    await websocket.connect()
+
+    await websocket._sio._trigger_event("connect", "/")
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 1000}
+    )
+    await websocket._sio._trigger_event("connect", "/")
+    # Live data arrives while the gap is being filled:
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 4000}
+    )
+    gap_fill_task = websocket._gap_fill_task
+    assert gap_fill_task is not None
+    await asyncio.wait_for(gap_fill_task, 1)
+
+    # Neither the rest of the gap nor the live data is handled after disconnecting:
+    assert not gap_fill_task.cancelled()
+    assert websocket._gap_fill_task is None
+    assert websocket._held_data is None
+    assert websocket.state is ConnectionState.DISCONNECTED
+    assert [data["dateutc"] for data in handled] == [1000, 2000]
+
+
+@pytest.mark.asyncio
+async def test_gap_fill_disconnect() -> None:
+    """Test that disconnecting while a gap is being filled drops the held data."""
+    release = asyncio.Event()
+
+    async def iter_device_history(
+        mac_address: str, start: datetime
+    ) -> AsyncIterator[dict]:
+        """Yield a device's history (newest first) once released.
+
+        Args:
+        ----
+            mac_address: The MAC address of the device.
+            start: The oldest datetime to retrieve data for.
+
+        Yields:
+        ------
+            Device data dicts.
+
+        """
+        await release.wait()
+        yield {"dateutc": 2000}
+
+    api = MagicMock()
+    api.iter_device_history = iter_device_history
+
+    websocket = _make_websocket(gap_fill_api=api)
+
+    handled: list[dict] = []
+    websocket.on_data(handled.append)
+    await websocket.connect()
+
+    await websocket._sio._trigger_event("connect", "/")
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 1000}
+    )
+    await websocket._sio._trigger_event("connect", "/")
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 3000}
+    )
+    gap_fill_task = websocket._gap_fill_task
+    assert gap_fill_task is not None
+
+    await websocket.disconnect()
+    assert gap_fill_task.cancelled()
+    assert websocket._held_data is None
+    assert [data["dateutc"] for data in handled] == [1000]
+
+
+@pytest.mark.asyncio
+async def test_data_delta() -> None:
+    """Test that delta handlers only receive the fields that changed."""
+    websocket = _make_websocket()
+    on_data_delta = MagicMock()
+    websocket.on_data_delta(on_data_delta, epsilons={"tempf": 0.5})
+    await websocket.connect()
+
+    for date_utc, tempf in ((1000, 70.0), (2000, 70.2), (3000, 71.0)):
+        await websocket._sio._trigger_event(
+            "data",
+            "/",
+            {"macAddress": "00:00:00:00:00:01", "dateutc": date_utc, "tempf": tempf},
+        )
+
+    assert [call.args[0] for call in on_data_delta.call_args_list] == [
+        {"macAddress": "00:00:00:00:00:01", "dateutc": 1000, "tempf": 70.0},
+        {"macAddress": "00:00:00:00:00:01", "dateutc": 3000, "tempf": 71.0},
+    ]
+    await websocket.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_state_store() -> None:
+    """Test that the websocket keeps a state store up to date."""
+    store = StationStateStore()
+    websocket = _make_websocket(state_store=store)
+    await websocket.connect()
+
+    await websocket._sio._trigger_event(
+        "data", "/", {"macAddress": "00:00:00:00:00:01", "dateutc": 1000}
+    )
+    assert store.get("00:00:00:00:00:01") == {
+        "macAddress": "00:00:00:00:00:01",
+        "dateutc": 1000,
+    }
+    await websocket.disconnect()